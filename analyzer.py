@@ -1,86 +1,34 @@
 """
 Module d'analyse des compétences demandées dans les offres d'emploi
 """
-import re
 from collections import Counter
 import config
 from utils import save_json, print_success, print_info
+from skill_matcher import get_skill_matcher
 
 class SkillsAnalyzer:
     def __init__(self):
         self.skills_counter = Counter()
         self.jobs_analyzed = 0
+        self.matrix = None
         
     def analyze_jobs(self, jobs):
         """Analyse les compétences demandées dans une liste d'offres"""
         print_info(f"Analyse de {len(jobs)} offres d'emploi...")
         
-        self.skills_counter = Counter()
+        # Matrice offres × compétences, réutilisable via self.matrix
+        self.matrix = get_skill_matcher().build_matrix(jobs)
+        self.skills_counter = self.matrix.counts()
         self.jobs_analyzed = len(jobs)
         
-        for job in jobs:
-            self._extract_skills_from_job(job)
-        
         print_success(f"Analyse terminée : {len(self.skills_counter)} compétences identifiées")
         return dict(self.skills_counter)
     
     def _extract_skills_from_job(self, job):
         """Extrait les compétences d'une offre d'emploi"""
-        # Combiner titre, description et critères
-        text = " ".join([
-            job.get('title', ''),
-            job.get('description', ''),
-            job.get('full_description', ''),
-            " ".join(job.get('criteria', []))
-        ]).lower()
-        
-        # Rechercher les compétences techniques
-        for skill in config.TECHNICAL_SKILLS:
-            # Recherche insensible à la casse avec variations
-            patterns = [
-                rf'\b{re.escape(skill.lower())}\b',
-                rf'\b{re.escape(skill.lower().replace(" ", "-"))}\b',
-                rf'\b{re.escape(skill.lower().replace(" ", "_"))}\b'
-            ]
-            
-            for pattern in patterns:
-                if re.search(pattern, text, re.IGNORECASE):
-                    self.skills_counter[skill] += 1
-                    break
-        
-        # Rechercher des compétences additionnelles communes
-        additional_skills = {
-            'statistics': ['statistique', 'statistiques', 'statistical'],
-            'data visualization': ['visualisation', 'visualization', 'dashboard'],
-            'etl': ['etl', 'extract transform load'],
-            'nlp': ['nlp', 'natural language processing', 'traitement du langage'],
-            'computer vision': ['computer vision', 'vision par ordinateur', 'opencv'],
-            'time series': ['time series', 'séries temporelles', 'forecasting'],
-            'a/b testing': ['a/b testing', 'ab testing', 'test ab'],
-            'agile': ['agile', 'scrum', 'kanban'],
-            'jupyter': ['jupyter', 'notebook'],
-            'matplotlib': ['matplotlib', 'seaborn', 'plotly'],
-            'excel': ['excel', 'vba', 'pivot table'],
-            'nosql': ['nosql', 'mongodb', 'cassandra', 'redis'],
-            'postgresql': ['postgresql', 'postgres'],
-            'mysql': ['mysql', 'mariadb'],
-            'elasticsearch': ['elasticsearch', 'elastic search'],
-            'airflow': ['airflow', 'apache airflow'],
-            'dbt': ['dbt', 'data build tool'],
-            'snowflake': ['snowflake'],
-            'databricks': ['databricks'],
-            'mlflow': ['mlflow', 'ml flow'],
-            'kubernetes': ['kubernetes', 'k8s'],
-            'terraform': ['terraform'],
-            'jenkins': ['jenkins', 'ci/cd'],
-            'github': ['github', 'gitlab', 'bitbucket']
-        }
-        
-        for skill_name, keywords in additional_skills.items():
-            for keyword in keywords:
-                if keyword.lower() in text:
-                    self.skills_counter[skill_name.title()] += 1
-                    break
+        skills = get_skill_matcher().match_job(job)
+        self.skills_counter.update(skills)
+        return skills
     
     def get_top_skills(self, n=20):
         """Retourne les N compétences les plus demandées"""
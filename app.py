@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
 from utils import load_json, print_info
+from job_store import load_current_jobs
 import config
 
 # Configuration de la page
@@ -53,15 +54,12 @@ st.markdown("""
 
 def load_jobs_data():
     """Charge les données des offres d'emploi"""
-    jobs_file = config.JOBS_FILE
-    if os.path.exists(jobs_file):
-        jobs = load_json(jobs_file)
-        # S'assurer que toutes les offres ont un champ 'source'
-        for job in jobs:
-            if 'source' not in job:
-                job['source'] = 'LinkedIn'
-        return jobs
-    return []
+    jobs = load_current_jobs()
+    # S'assurer que toutes les offres ont un champ 'source'
+    for job in jobs:
+        if 'source' not in job:
+            job['source'] = 'LinkedIn'
+    return jobs
 
 def load_skills_data():
     """Charge les données d'analyse des compétences"""
@@ -10,8 +10,12 @@ from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
 from utils import load_json, print_info
+from job_store import load_current_jobs
+from near_duplicates import group_near_duplicates
 from application_manager import ApplicationManager
 from cover_letter_generator import CoverLetterGenerator
+from cv_profile import get_cv_profile
+from letter_stream import letter_stream
 import config
 
 # Configuration de la page
@@ -48,14 +52,14 @@ st.markdown("""
 
 def load_jobs_data():
     """Charge les données des offres d'emploi"""
-    jobs_file = config.JOBS_FILE
-    if os.path.exists(jobs_file):
-        jobs = load_json(jobs_file)
-        for job in jobs:
-            if 'source' not in job:
-                job['source'] = 'LinkedIn'
-        return jobs
-    return []
+    jobs = load_current_jobs()
+    for job in jobs:
+        if 'source' not in job:
+            job['source'] = 'LinkedIn'
+    if config.DEDUP_CONFIG["enabled"]:
+        # Une seule entrée par poste publié sur plusieurs sites
+        jobs = group_near_duplicates(jobs)
+    return jobs
 
 def load_personal_info():
     """Charge les informations personnelles"""
@@ -234,6 +238,9 @@ def main():
             
             st.info(f"📊 {len(filtered_jobs)} offre(s) trouvée(s) sur {len(jobs)} total (triées par date)")
             
+            # Profil du CV (PDF lu une seule fois) pour signaler les compétences demandées
+            cv_profile = get_cv_profile(personal_info.get('cv_path'))
+            
             # Afficher les offres
             for idx, job in enumerate(filtered_jobs[:50]):  # Limiter à 50 pour les performances
                 title = job.get('title', 'N/A')
@@ -261,6 +268,13 @@ def main():
                         st.markdown(f"**Entreprise:** {company}")
                         st.markdown(f"**Localisation:** {location}")
                         st.markdown(f"**Date de publication:** {date_display}")
+                        if job.get('also_on'):
+                            also_on = ", ".join(f"[{o['source'] or 'lien'}]({o['url']})" for o in job['also_on'])
+                            st.markdown(f"**Aussi publiée sur:** {also_on}")
+                        if cv_profile:
+                            cv_skills = cv_profile.matching_skills(job)
+                            if cv_skills:
+                                st.markdown(f"**Compétences de votre CV demandées:** {', '.join(cv_skills)}")
                         
                         if job.get('description'):
                             st.markdown("**📝 Description:**")
@@ -273,7 +287,7 @@ def main():
                         if not has_applied:
                             if st.button("📝 Préparer candidature", key=f"quick_apply_{idx}"):
                                 with st.spinner("Génération de la lettre de motivation..."):
-                                    application = manager.prepare_application(job, personal_info)
+                                    application = manager.prepare_application(job, personal_info, on_chunk=letter_stream(st.empty()))
                                     if application:
                                         st.success("✅ Candidature préparée !")
                                         st.rerun()
@@ -358,13 +372,21 @@ def main():
                         unique_key = f"apply_{idx}_{hash(job.get('url', str(idx)))}"
                         if st.button("📝 Préparer candidature", key=unique_key):
                             with st.spinner("Génération de la lettre de motivation avec LLM..."):
-                                application = manager.prepare_application(job, personal_info)
+                                application = manager.prepare_application(job, personal_info, on_chunk=letter_stream(st.empty()))
                                 if application:
                                     st.success("✅ Candidature préparée !")
                                     st.rerun()
                     else:
                         if job.get('url'):
                             st.link_button("🔗 Voir l'offre", job.get('url'))
+                        regenerate_key = f"regenerate_{idx}_{hash(job.get('url', str(idx)))}"
+                        if st.button("🔄 Régénérer la lettre", key=regenerate_key):
+                            with st.spinner("Nouvelle lettre de motivation avec LLM..."):
+                                if manager.prepare_application(
+                                    job, personal_info, regenerate=True, on_chunk=letter_stream(st.empty())
+                                ):
+                                    st.success("✅ Nouvelle lettre générée !")
+                                    st.rerun()
                 
                 st.divider()
     
@@ -602,6 +624,12 @@ def main():
             intro = st.text_area("Introduction personnelle", value=personal_info.get('intro', ''), height=100)
             experience = st.text_area("Expérience pertinente", value=personal_info.get('experience', ''), height=100)
             cv_path = st.text_input("Chemin vers votre CV (PDF)", value=personal_info.get('cv_path', ''))
+            profile = get_cv_profile(cv_path)
+            if profile:
+                st.caption(
+                    f"CV analysé : {len(profile.skills)} compétence(s) détectée(s) "
+                    f"({', '.join(profile.skills[:10])}), sections : {', '.join(profile.sections)}"
+                )
             
             if st.form_submit_button("💾 Sauvegarder"):
                 personal_info = {
@@ -626,17 +654,13 @@ def main():
         st.subheader("🔧 Paramètres")
         
         # Vérifier Ollama
-        try:
-            import requests
-            response = requests.get("http://localhost:11434/api/tags", timeout=1)
-            if response.status_code == 200:
-                st.success("✅ Ollama est actif et prêt")
-                models = response.json().get('models', [])
-                if models:
-                    st.info(f"Modèles disponibles: {', '.join([m.get('name', 'N/A') for m in models])}")
-            else:
-                st.warning("⚠️ Ollama ne répond pas")
-        except:
+        from llm_clients import ollama_models
+        models = ollama_models()
+        if models is not None:
+            st.success("✅ Ollama est actif et prêt")
+            if models:
+                st.info(f"Modèles disponibles: {', '.join(models)}")
+        else:
             st.info("💡 Ollama n'est pas lancé. Les lettres utiliseront les templates.")
             st.info("Pour utiliser Ollama: `brew services start ollama`")
 
@@ -4,8 +4,10 @@ Gestionnaire de candidatures automatiques
 import json
 import os
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from cover_letter_generator import CoverLetterGenerator
 from utils import load_json, save_json, print_success, print_info, print_warning, print_error
+from job_store import get_store, use_sqlite
 import config
 
 class ApplicationManager:
@@ -16,6 +18,8 @@ class ApplicationManager:
         
     def _load_applications(self):
         """Charge les candidatures déjà envoyées"""
+        if use_sqlite():
+            return get_store().get_applications()
         if os.path.exists(self.applications_file):
             return load_json(self.applications_file)
         return []
@@ -24,47 +28,138 @@ class ApplicationManager:
         """Sauvegarde les candidatures"""
         save_json(self.applications, self.applications_file)
     
-    def prepare_application(self, job, personal_info, cv_path=None):
-        """Prépare une candidature (génère la lettre)"""
+    def _save_application(self, application, is_new=False):
+        """Enregistre une candidature (en SQLite, seule la ligne concernée est écrite)"""
+        if not use_sqlite():
+            self._save_applications()
+        elif is_new:
+            get_store().add_application(application)
+        else:
+            get_store().update_application(application)
+    
+    def _find_application(self, job_url):
+        """Candidature existante pour une offre (None si aucune)"""
+        if not job_url:
+            return None
+        return next((app for app in self.applications if app.get('job_url') == job_url), None)
+    
+    def _record_application(self, job, cover_letter, cv_path=None):
+        """Sauvegarde la lettre et enregistre la candidature (ou met à jour la candidature existante)"""
+        letter_path = self.generator.save_cover_letter(cover_letter, job)
+        
+        existing = self._find_application(job.get('url', ''))
+        if existing:
+            existing['cover_letter_path'] = letter_path
+            existing['prepared_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self._save_application(existing)
+            print_success(f"Lettre régénérée pour: {job.get('title', 'N/A')}")
+            return existing
+        
+        application = {
+            'job_title': job.get('title'),
+            'company': job.get('company'),
+            'location': job.get('location'),
+            'job_url': job.get('url', ''),
+            'source': job.get('source', 'LinkedIn'),
+            'cover_letter_path': letter_path,
+            'cv_path': cv_path,
+            'status': 'prepared',  # prepared, sent, rejected, accepted
+            'prepared_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'sent_at': None,
+            'notes': ''
+        }
+        
+        self.applications.append(application)
+        self._save_application(application, is_new=True)
+        
+        print_success(f"Candidature préparée pour: {job.get('title', 'N/A')}")
+        return application
+    
+    def prepare_application(self, job, personal_info, cv_path=None, regenerate=False, on_chunk=None):
+        """
+        Prépare une candidature (génère la lettre)
+        
+        Avec regenerate=True, une candidature existante reçoit une nouvelle lettre
+        (la lettre en cache est ignorée). on_chunk reçoit le texte de la lettre au fil
+        de la génération.
+        """
         try:
             # Vérifier si déjà candidaté
-            job_url = job.get('url', '')
-            if self.has_applied(job_url):
+            if self._find_application(job.get('url', '')) and not regenerate:
                 print_warning(f"Déjà candidaté pour: {job.get('title', 'N/A')}")
                 return None
             
             # Générer la lettre de motivation
             print_info(f"Génération de la lettre pour: {job.get('title', 'N/A')}")
-            cover_letter = self.generator.generate_cover_letter(job, personal_info, cv_path)
-            
-            # Sauvegarder la lettre
-            letter_path = self.generator.save_cover_letter(cover_letter, job)
-            
-            # Enregistrer la candidature
-            application = {
-                'job_title': job.get('title'),
-                'company': job.get('company'),
-                'location': job.get('location'),
-                'job_url': job_url,
-                'source': job.get('source', 'LinkedIn'),
-                'cover_letter_path': letter_path,
-                'cv_path': cv_path,
-                'status': 'prepared',  # prepared, sent, rejected, accepted
-                'prepared_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'sent_at': None,
-                'notes': ''
-            }
+            cover_letter = self.generator.generate_cover_letter(
+                job, personal_info, cv_path, regenerate=regenerate, on_chunk=on_chunk
+            )
             
-            self.applications.append(application)
-            self._save_applications()
-            
-            print_success(f"Candidature préparée pour: {job.get('title', 'N/A')}")
-            return application
+            return self._record_application(job, cover_letter, cv_path)
             
         except Exception as e:
             print_error(f"Erreur lors de la préparation: {str(e)}")
             return None
     
+    def prepare_applications(self, jobs, personal_info, cv_path=None, workers=None, progress=None, regenerate=False):
+        """
+        Prépare les candidatures d'une liste d'offres, plusieurs lettres étant générées en même temps
+        
+        Chaque candidature est enregistrée dès que sa lettre est prête : une erreur ou une
+        interruption en cours de route conserve les lettres déjà générées.
+        
+        Args:
+            jobs: Offres (celles déjà candidatées sont ignorées, sauf avec regenerate=True)
+            workers: Lettres générées en même temps (par défaut : limite du fournisseur, config.LLM_CONCURRENCY)
+            progress: Fonction appelée après chaque offre : progress(terminées, total, offre, candidature ou None)
+        
+        Returns:
+            Liste des candidatures préparées
+        """
+        pending = []
+        urls = set()
+        for job in jobs:
+            job_url = job.get('url', '')
+            # Sans URL, une offre ne peut pas être reconnue : elle n'est jamais ignorée
+            if job_url and (job_url in urls or (self._find_application(job_url) and not regenerate)):
+                continue
+            if job_url:
+                urls.add(job_url)
+            pending.append(job)
+        if not pending:
+            print_info("Aucune nouvelle candidature à préparer")
+            return []
+        
+        workers = max(1, workers or self.generator.concurrency())
+        print_info(f"Génération de {len(pending)} lettre(s), {workers} à la fois")
+        
+        prepared = []
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {
+            executor.submit(self.generator.generate_cover_letter, job, personal_info, cv_path, regenerate): job
+            for job in pending
+        }
+        try:
+            # Les lettres sont enregistrées depuis ce thread, dans l'ordre où elles se terminent
+            for done, future in enumerate(as_completed(futures), 1):
+                job = futures[future]
+                application = None
+                try:
+                    application = self._record_application(job, future.result(), cv_path)
+                    prepared.append(application)
+                except Exception as e:
+                    print_error(f"Erreur lors de la préparation de {job.get('title', 'N/A')}: {str(e)}")
+                if progress:
+                    progress(done, len(pending), job, application)
+        finally:
+            # Interruption : les lettres pas encore commencées sont annulées, celles en cours
+            # sont attendues pour que leurs créneaux de génération soient libérés (elles
+            # restent dans le cache des lettres)
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        print_success(f"{len(prepared)}/{len(pending)} candidature(s) préparée(s)")
+        return prepared
+    
     def has_applied(self, job_url):
         """Vérifie si on a déjà candidaté pour cette offre"""
         if not job_url:
@@ -77,7 +172,7 @@ class ApplicationManager:
             if app.get('job_url') == job_url:
                 app['status'] = 'sent'
                 app['sent_at'] = sent_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                self._save_applications()
+                self._save_application(app)
                 return True
         return False
     
@@ -90,7 +185,7 @@ class ApplicationManager:
                     app['sent_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 if notes is not None:
                     app['notes'] = notes
-                self._save_applications()
+                self._save_application(app)
                 return True
         return False
     
@@ -99,19 +194,21 @@ class ApplicationManager:
         for app in self.applications:
             if app.get('job_url') == job_url:
                 app['notes'] = notes
-                self._save_applications()
+                self._save_application(app)
                 return True
         return False
     
     def delete_application(self, job_url):
         """Supprime une candidature"""
-        initial_count = len(self.applications)
-        self.applications = [app for app in self.applications if app.get('job_url') != job_url]
-        
-        if len(self.applications) < initial_count:
+        application = self._find_application(job_url)
+        if application is None:
+            return False
+        self.applications.remove(application)
+        if use_sqlite():
+            get_store().delete_application(application.get('id'))
+        else:
             self._save_applications()
-            return True
-        return False
+        return True
     
     def get_applications_by_status(self, status=None):
         """Récupère les candidatures par statut"""
@@ -7,7 +7,10 @@ import os
 from datetime import datetime
 from application_manager import ApplicationManager
 from cover_letter_generator import CoverLetterGenerator
+from cv_profile import get_cv_profile
+from letter_stream import letter_stream
 from utils import load_json
+from job_store import load_current_jobs
 import config
 
 st.set_page_config(
@@ -56,7 +59,7 @@ def main():
         st.header("📋 Préparer des candidatures")
         
         # Charger les offres
-        jobs = load_json(config.JOBS_FILE) if os.path.exists(config.JOBS_FILE) else []
+        jobs = load_current_jobs()
         
         if not jobs:
             st.warning("⚠️ Aucune offre disponible. Lancez d'abord une recherche.")
@@ -81,6 +84,18 @@ def main():
             
             st.info(f"📊 {len(filtered_jobs)} offre(s) trouvée(s)")
             
+            # Préparation par lots des offres affichées (plusieurs lettres générées en même temps)
+            to_prepare = [j for j in filtered_jobs[:20] if not manager.has_applied(j.get('url', ''))]
+            if to_prepare and st.button(f"📝 Préparer les {len(to_prepare)} candidature(s) affichée(s)"):
+                progress_bar = st.progress(0.0)
+                
+                def on_progress(done, total, job, application):
+                    progress_bar.progress(done / total, text=f"{done}/{total} - {job.get('title', 'N/A')[:50]}")
+                
+                prepared = manager.prepare_applications(to_prepare, personal_info, progress=on_progress)
+                st.success(f"✅ {len(prepared)} candidature(s) préparée(s)")
+                st.rerun()
+            
             # Afficher les offres avec bouton de candidature
             for idx, job in enumerate(filtered_jobs[:20]):  # Limiter à 20 pour l'affichage
                 title = job.get('title', 'N/A')
@@ -124,7 +139,7 @@ def main():
                         unique_key = f"apply_{idx}_{hash(job.get('url', str(idx)))}"
                         if st.button("📝 Préparer candidature", key=unique_key):
                             with st.spinner("Génération de la lettre de motivation..."):
-                                application = manager.prepare_application(job, personal_info)
+                                application = manager.prepare_application(job, personal_info, on_chunk=letter_stream(st.empty()))
                                 if application:
                                     st.success("✅ Candidature préparée !")
                                     st.rerun()
@@ -210,7 +225,7 @@ def main():
                 if os.path.exists("personal_info.json"):
                     personal_info = json.load(open("personal_info.json"))
                 
-                jobs = load_json(config.JOBS_FILE) if os.path.exists(config.JOBS_FILE) else []
+                jobs = load_current_jobs()
                 prepared_apps = manager.get_applications_by_status('prepared')
                 prepared_urls = {app.get('job_url') for app in prepared_apps}
                 jobs_to_apply = [j for j in jobs if j.get('url') in prepared_urls]
@@ -375,6 +390,12 @@ def main():
             intro = st.text_area("Introduction personnelle", value=personal_info.get('intro', ''), height=100)
             experience = st.text_area("Expérience pertinente", value=personal_info.get('experience', ''), height=100)
             cv_path = st.text_input("Chemin vers votre CV (PDF)", value=personal_info.get('cv_path', ''))
+            profile = get_cv_profile(cv_path)
+            if profile:
+                st.caption(
+                    f"CV analysé : {len(profile.skills)} compétence(s) détectée(s) "
+                    f"({', '.join(profile.skills[:10])}), sections : {', '.join(profile.sections)}"
+                )
             
             if st.form_submit_button("💾 Sauvegarder"):
                 personal_info = {
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark hors ligne de l'extraction des offres
+Rejoue le corpus de pages enregistrées (page_corpus.py) dans le chemin d'extraction de chaque
+scraper et mesure le débit (cartes/s), le taux de remplissage des champs et les régressions
+par rapport à une référence enregistrée.
+
+Capture du corpus :  CAPTURE_CORPUS=true python main_unified.py --search "Data"
+Référence :          python benchmark_extraction.py --save-baseline
+Comparaison :        python benchmark_extraction.py
+"""
+import os
+import sys
+import json
+import argparse
+import importlib
+from time import perf_counter
+from http_fetcher import parse_html
+from page_corpus import list_versions, load_corpus
+from utils import print_info, print_success, print_warning, print_error
+import config
+
+SCRAPERS = {
+    'linkedin': ('scraper', 'LinkedInJobScraper'),
+    'indeed': ('scraper_indeed', 'IndeedScraper'),
+    'wttj': ('scraper_wttj', 'WelcomeToTheJungleScraper'),
+    'apec': ('scraper_apec', 'ApecScraper'),
+    'helloworks': ('scraper_helloworks', 'HelloworksScraper'),
+    'freework': ('scraper_freework', 'FreeWorkScraper'),
+    'bonnealternance': ('scraper_bonne_alternance', 'BonneAlternanceScraper')
+}
+
+FIELDS = ['title', 'company', 'location', 'date', 'url', 'offer_id']
+BASELINE_FILE = "baseline.json"
+
+# Seuils de régression
+FILL_RATE_TOLERANCE = 0.02  # baisse tolérée du taux de remplissage d'un champ
+THROUGHPUT_TOLERANCE = 0.5  # baisse tolérée du débit (les mesures de temps sont bruitées)
+
+
+def _new_scraper(site):
+    """Scraper neuf (identifiants d'offres vides) sans navigateur"""
+    module, class_name = SCRAPERS[site]
+    return getattr(importlib.import_module(module), class_name)()
+
+
+def _filled(value):
+    return bool(value) and value != "N/A"
+
+
+def benchmark_site(site, pages, repeat=1):
+    """Extrait toutes les pages d'un site et retourne les mesures"""
+    parse_seconds = extract_seconds = 0.0
+    cards_count = 0
+    jobs = []
+    for _ in range(repeat):
+        scraper = _new_scraper(site)
+        jobs = []
+        cards_count = 0
+        for html in pages:
+            start = perf_counter()
+            soup = parse_html(html)
+            parsed = perf_counter()
+            cards = scraper.plan.select_cards(soup)
+            for card in cards:
+                job = scraper.plan.extract(card, scraper.offer_ids)
+                if job:
+                    jobs.append(job)
+            parse_seconds += parsed - start
+            extract_seconds += perf_counter() - parsed
+            cards_count += len(cards)
+
+    fill_rate = {
+        field: round(sum(1 for job in jobs if _filled(job.get(field))) / len(jobs), 3) if jobs else 0.0
+        for field in FIELDS
+    }
+    total_seconds = (parse_seconds + extract_seconds) / repeat
+    return {
+        'pages': len(pages),
+        'cards': cards_count,
+        'jobs': len(jobs),
+        'parse_seconds': round(parse_seconds / repeat, 4),
+        'extract_seconds': round(extract_seconds / repeat, 4),
+        'cards_per_second': round(cards_count / total_seconds, 1) if total_seconds else 0.0,
+        'fill_rate': fill_rate,
+        'company_na_ratio': round(1 - fill_rate['company'], 3) if jobs else 0.0
+    }
+
+
+def find_regressions(results, baseline):
+    """Écarts défavorables par rapport à la référence : {site: [messages]}"""
+    regressions = {}
+    for site, result in results.items():
+        reference = baseline.get(site)
+        if not reference:
+            continue
+        problems = []
+        if result['jobs'] < reference['jobs']:
+            problems.append(f"offres extraites {reference['jobs']} -> {result['jobs']}")
+        for field in FIELDS:
+            before = reference['fill_rate'].get(field, 0.0)
+            after = result['fill_rate'].get(field, 0.0)
+            if after < before - FILL_RATE_TOLERANCE:
+                problems.append(f"{field} rempli {before:.0%} -> {after:.0%}")
+        if result['cards_per_second'] < reference['cards_per_second'] * (1 - THROUGHPUT_TOLERANCE):
+            problems.append(f"débit {reference['cards_per_second']} -> {result['cards_per_second']} cartes/s")
+        if problems:
+            regressions[site] = problems
+    return regressions
+
+
+def print_results(results):
+    """Tableau récapitulatif par site"""
+    print_info(f"{'Site':<16}{'Pages':>6}{'Cartes':>8}{'Offres':>8}{'Cartes/s':>10}  Remplissage")
+    for site, r in results.items():
+        fill = " ".join(f"{field}={rate:.0%}" for field, rate in r['fill_rate'].items())
+        print_info(f"{site:<16}{r['pages']:>6}{r['cards']:>8}{r['jobs']:>8}{r['cards_per_second']:>10}  {fill}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors ligne de l'extraction des offres")
+    parser.add_argument('--corpus-dir', default=config.CORPUS_CONFIG["directory"], help='Dossier du corpus')
+    parser.add_argument('--version', help='Version du corpus (par défaut: la plus récente)')
+    parser.add_argument('--sites', nargs='+', choices=list(SCRAPERS), help='Sites à mesurer (par défaut: tous)')
+    parser.add_argument('--repeat', type=int, default=3, help='Nombre de passes (temps moyen)')
+    parser.add_argument('--save-baseline', action='store_true', help='Enregistrer les résultats comme référence')
+    parser.add_argument('--output', help='Rapport JSON')
+    args = parser.parse_args()
+
+    # Le rejeu ne doit pas réenregistrer les pages qu'il lit
+    config.CORPUS_CONFIG["capture"] = False
+
+    versions = list_versions(args.corpus_dir)
+    version = args.version or (versions[-1] if versions else None)
+    if version is None:
+        print_error(f"Aucun corpus dans {args.corpus_dir} (lancez un scraping avec CAPTURE_CORPUS=true)")
+        return 1
+    corpus = load_corpus(version, args.corpus_dir)
+    sites = [site for site in (args.sites or SCRAPERS) if corpus.get(site)]
+    print_info(f"Corpus {version}: {sum(len(corpus[s]) for s in sites)} page(s) sur {len(sites)} site(s)")
+
+    results = {site: benchmark_site(site, corpus[site], args.repeat) for site in sites}
+    print_results(results)
+
+    baseline_file = os.path.join(args.corpus_dir, version, BASELINE_FILE)
+    regressions = {}
+    if args.save_baseline:
+        with open(baseline_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print_success(f"Référence enregistrée: {baseline_file}")
+    elif os.path.exists(baseline_file):
+        with open(baseline_file, 'r', encoding='utf-8') as f:
+            regressions = find_regressions(results, json.load(f))
+        for site, problems in regressions.items():
+            print_warning(f"Régression {site}: {'; '.join(problems)}")
+        if not regressions:
+            print_success("Aucune régression par rapport à la référence")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'version': version, 'results': results, 'regressions': regressions}, f, indent=2)
+        print_info(f"Rapport: {args.output}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
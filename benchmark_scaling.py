@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Benchmark de montée en charge sur des offres synthétiques
+Mesure le temps et le pic mémoire (tracemalloc) du chargement, de la sauvegarde, de la comparaison,
+de l'analyse des compétences, du filtrage, des candidatures et du stockage SQLite pour
+1k / 10k / 100k offres (1M avec --sizes 1000000).
+
+Tout s'exécute dans un dossier temporaire : les données réelles ne sont pas touchées.
+Le rapport JSON (data/benchmarks/) permet de comparer les exécutions.
+
+Usage : python benchmark_scaling.py [--sizes 1000 10000] [--no-memory] [--output rapport.json]
+"""
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime
+from utils import load_json, print_info, print_success, print_warning
+from synthetic_jobs import SyntheticJobGenerator
+import config
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def _measure(fn, memory):
+    """
+    Exécute une opération chronométrée, puis une seconde fois sous tracemalloc si demandé
+
+    Returns:
+        Tuple (résultat, secondes, pic mémoire en Mo ou None)
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    peak_mb = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_mb = round(peak / (1024 * 1024), 2)
+    return result, seconds, peak_mb
+
+
+def _write_json(data, path):
+    """
+    Écrit un fichier JSON du benchmark
+
+    utils.save_json n'est pas utilisé : il recopie certains fichiers (offres, jobs.json) sur le
+    bureau de l'utilisateur, qui serait écrasé par les offres synthétiques.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def _operations(size, generator, workdir):
+    """Opérations mesurées pour une taille donnée : liste de (nom, fonction)"""
+    from compare_jobs import compare_jobs
+    from analyzer import SkillsAnalyzer
+    from seen_index import SeenIndex
+    from job_store import JobStore
+
+    state = {}
+    jobs_file = os.path.join(workdir, "data", f"synthetic_{size}.json")
+    seen_file = os.path.join(workdir, "data", f"seen_{size}.json")
+    tracked_file = os.path.join(workdir, "data", f"tracked_{size}.json")
+
+    def generate():
+        state['jobs'] = generator.jobs(size)
+        state['next_day'] = generator.next_day(state['jobs'])
+        return state['jobs']
+
+    def diff(near_duplicates):
+        def run():
+            config.DEDUP_CONFIG["enabled"] = near_duplicates
+            return compare_jobs(state['jobs'], state['next_day'])
+        return run
+
+    def incremental_diff():
+        index = SeenIndex(seen_file)
+        index.add(state['jobs'])
+        return index.add(state['next_day'])
+
+    def analyze():
+        return SkillsAnalyzer().analyze_jobs(state['next_day'])
+
+    def tracker_filters():
+        from tracker import JobTracker
+        _write_json(state['jobs'], tracked_file)
+        # Offres suivies lues depuis le dossier temporaire (jamais depuis config.TRACKED_JOBS_FILE)
+        tracker = JobTracker.__new__(JobTracker)
+        tracker.tracked_jobs_file = tracked_file
+        tracker.tracked_jobs = load_json(tracked_file)
+        return len(tracker.get_jobs_by_keyword("data")), len(tracker.get_recent_jobs(7))
+
+    def applications_lookup():
+        from application_manager import ApplicationManager
+        # Sans générateur de lettres : pas de détection d'Ollama pendant le benchmark
+        manager = ApplicationManager.__new__(ApplicationManager)
+        manager.applications = state.setdefault('applications', generator.applications(state['jobs']))
+        urls = [job['url'] for job in state['next_day'][:1000]]
+        return sum(1 for url in urls if manager.has_applied(url))
+
+    def store_run():
+        store = JobStore(os.path.join(workdir, "data", f"bench_{size}.db"))
+        try:
+            store.record_run(state['jobs'])
+            store.record_run(state['next_day'])
+            return len(store.get_latest_jobs())
+        finally:
+            store.close()
+
+    return [
+        ('generate', generate),
+        ('save_json', lambda: _write_json(state['jobs'], jobs_file)),
+        ('load_json', lambda: load_json(jobs_file)),
+        ('diff', diff(False)),
+        ('diff_near_duplicates', diff(True)),
+        ('incremental_diff', incremental_diff),
+        ('skills_analysis', analyze),
+        ('sqlite_store', store_run),
+        ('tracker_filters', tracker_filters),
+        ('applications_lookup', applications_lookup)
+    ]
+
+
+def run_benchmarks(sizes, memory=True, operations=None):
+    """Lance les opérations pour chaque taille et retourne les mesures"""
+    results = []
+    original_cwd = os.getcwd()
+    saved = {
+        'dedup': config.DEDUP_CONFIG["enabled"],
+        'backend': config.STORAGE_CONFIG["backend"]
+    }
+    with tempfile.TemporaryDirectory(prefix="bench_scaling_") as workdir:
+        os.chdir(workdir)
+        # Fichiers JSON : l'index des offres vues et les offres suivies restent dans le dossier temporaire
+        config.STORAGE_CONFIG["backend"] = "json"
+        try:
+            for size in sizes:
+                print_info(f"=== {size} offres ===")
+                generator = SyntheticJobGenerator(seed=size)
+                for name, fn in _operations(size, generator, workdir):
+                    if operations and name not in operations and name != 'generate':
+                        continue
+                    entry = {'size': size, 'operation': name}
+                    try:
+                        _, seconds, peak_mb = _measure(fn, memory and name != 'generate')
+                    except Exception as e:
+                        entry['error'] = f"{type(e).__name__}: {str(e)[:200]}"
+                        print_warning(f"  {name}: {entry['error']}")
+                        results.append(entry)
+                        continue
+                    entry.update({
+                        'seconds': round(seconds, 4),
+                        'us_per_job': round(seconds * 1e6 / size, 2),
+                        'peak_mb': peak_mb
+                    })
+                    results.append(entry)
+                    memory_info = f", pic {peak_mb} Mo" if peak_mb is not None else ""
+                    print_info(f"  {name:<22}{seconds:>10.3f}s{memory_info}")
+        finally:
+            os.chdir(original_cwd)
+            config.DEDUP_CONFIG["enabled"] = saved['dedup']
+            config.STORAGE_CONFIG["backend"] = saved['backend']
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de montée en charge sur des offres synthétiques")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Nombres d'offres")
+    parser.add_argument('--operations', nargs='+', help='Opérations à mesurer (par défaut: toutes)')
+    parser.add_argument('--no-memory', action='store_true', help='Ne pas mesurer le pic mémoire (deux fois plus rapide)')
+    parser.add_argument('--output', help='Rapport JSON (par défaut: data/benchmarks/scaling_<date>.json)')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, memory=not args.no_memory, operations=args.operations)
+
+    output = args.output or os.path.join(
+        config.DATA_DIR, "benchmarks", f"scaling_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': args.sizes,
+        'results': results
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print_success(f"Rapport: {output}")
+    return 1 if any('error' in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
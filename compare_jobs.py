@@ -5,17 +5,36 @@ import json
 import os
 from datetime import datetime
 from utils import load_json, save_json, print_info, print_success
+from job_store import get_store, use_sqlite
+from offer_ids import canonicalize
+from near_duplicates import filter_new_jobs
+from metrics import timed, count
 import config
 
 
 def get_job_signature(job):
     """Crée une signature unique pour une offre d'emploi"""
-    # Utilise l'URL comme identifiant principal, sinon titre + entreprise + source
+    # Identifiant stable du site (posé à l'extraction), sinon URL canonique, sinon titre + entreprise + source
+    if job.get('offer_id'):
+        return job['offer_id']
     if job.get('url'):
-        return job.get('url')
+        offer_id, url = canonicalize(job['url'])
+        return offer_id or url
     return f"{job.get('title', '')}_{job.get('company', '')}_{job.get('source', '')}"
 
 
+def rekey_signature(signature):
+    """
+    Signature actuelle d'une signature enregistrée auparavant
+
+    Les anciennes signatures étaient l'URL brute de l'offre : elles sont ramenées à
+    l'identifiant de l'offre ou à l'URL canonique (les autres sont inchangées).
+    """
+    if signature.startswith(('http://', 'https://')):
+        return get_job_signature({'url': signature})
+    return signature
+
+
 def compare_jobs(old_jobs, new_jobs):
     """
     Compare deux listes d'offres et retourne les nouvelles
@@ -34,6 +53,9 @@ def compare_jobs(old_jobs, new_jobs):
     # Nouvelles offres : dans new_jobs mais pas dans old_jobs
     new_job_signatures = set(new_signatures.keys()) - set(old_signatures.keys())
     new_jobs_list = [new_signatures[sig] for sig in new_job_signatures]
+    if config.DEDUP_CONFIG["enabled"]:
+        # Même poste déjà connu sur un autre site, ou publié sur plusieurs sites : une seule offre
+        new_jobs_list = filter_new_jobs(new_jobs_list, old_jobs)
     
     # Offres supprimées : dans old_jobs mais pas dans new_jobs
     removed_job_signatures = set(old_signatures.keys()) - set(new_signatures.keys())
@@ -42,37 +64,40 @@ def compare_jobs(old_jobs, new_jobs):
     return new_jobs_list, removed_jobs_list
 
 
-def save_jobs_history(jobs, filename=None):
-    """Sauvegarde l'historique des offres avec timestamp"""
-    if filename is None:
-        filename = config.JOBS_FILE.replace('.json', '_history.json')
-    
-    history_file = os.path.join(config.DATA_DIR, 'jobs_history.json')
-    
-    # Charger l'historique existant
-    if os.path.exists(history_file):
-        with open(history_file, 'r', encoding='utf-8') as f:
-            history = json.load(f)
-    else:
-        history = []
-    
-    # Ajouter la nouvelle entrée
-    history_entry = {
-        'timestamp': datetime.now().isoformat(),
-        'total_jobs': len(jobs),
-        'jobs': jobs
-    }
-    history.append(history_entry)
+def save_jobs_history(jobs, previous_jobs=None):
+    """
+    Ajoute l'exécution à l'historique : seules les offres apparues et disparues
+    depuis previous_jobs sont écrites (voir job_history.py)
+    """
+    from job_history import append_history
+    return append_history(previous_jobs, jobs)
+
+
+def _load_current_and_previous():
+    """
+    Offres de la dernière recherche et de la précédente
     
-    # Garder seulement les 30 derniers jours
-    if len(history) > 30:
-        history = history[-30:]
+    Returns:
+        Tuple (offres_actuelles ou None, offres_precedentes ou None)
+    """
+    if use_sqlite():
+        # Les exécutions de scraping sont en base : rien à recopier
+        store = get_store()
+        runs = store.get_runs(limit=2)
+        if not runs:
+            return None, None
+        previous_jobs = store.get_run_jobs(runs[1]['id']) if len(runs) > 1 else None
+        return store.get_run_jobs(runs[0]['id']), previous_jobs
     
-    # Sauvegarder
-    save_json(history, history_file)
-    return history_file
+    current_jobs_file = config.JOBS_FILE
+    previous_jobs_file = os.path.join(config.DATA_DIR, 'jobs_previous.json')
+    if not os.path.exists(current_jobs_file):
+        return None, None
+    previous_jobs = load_json(previous_jobs_file) if os.path.exists(previous_jobs_file) else None
+    return load_json(current_jobs_file), previous_jobs
 
 
+@timed("get_new_jobs")
 def get_new_jobs():
     """
     Compare les offres actuelles avec les précédentes et retourne les nouvelles
@@ -80,38 +105,67 @@ def get_new_jobs():
     Returns:
         Tuple (nouvelles_offres, total_offres)
     """
-    current_jobs_file = config.JOBS_FILE
     previous_jobs_file = os.path.join(config.DATA_DIR, 'jobs_previous.json')
     
-    # Charger les offres actuelles
-    if not os.path.exists(current_jobs_file):
+    # Charger les offres actuelles et précédentes
+    current_jobs, previous_jobs = _load_current_and_previous()
+    if current_jobs is None:
         print_info("Aucune offre actuelle trouvée")
         return [], []
     
-    current_jobs = load_json(current_jobs_file)
-    
-    # Charger les offres précédentes
-    if not os.path.exists(previous_jobs_file):
+    if previous_jobs is None:
         print_info("Première exécution : toutes les offres sont considérées comme nouvelles")
-        # Sauvegarder les offres actuelles comme précédentes
-        save_json(current_jobs, previous_jobs_file)
+        if not use_sqlite():
+            # Sauvegarder les offres actuelles comme précédentes
+            save_json(current_jobs, previous_jobs_file)
+            save_jobs_history(current_jobs)
+        if config.INCREMENTAL_CONFIG["enabled"]:
+            from seen_index import SeenIndex
+            seen_index = SeenIndex()
+            seen_index.add(current_jobs)
+            seen_index.save()
+        count("new_jobs", len(current_jobs))
         return current_jobs, current_jobs
     
-    previous_jobs = load_json(previous_jobs_file)
-    
-    # Comparer
-    new_jobs, removed_jobs = compare_jobs(previous_jobs, current_jobs)
-    
-    print_info(f"Total offres actuelles: {len(current_jobs)}")
-    print_info(f"Nouvelles offres: {len(new_jobs)}")
-    print_info(f"Offres supprimées: {len(removed_jobs)}")
-    
-    # Sauvegarder les offres actuelles comme précédentes pour la prochaine fois
-    save_json(current_jobs, previous_jobs_file)
-    
-    # Sauvegarder l'historique
-    save_jobs_history(current_jobs)
+    if config.INCREMENTAL_CONFIG["enabled"]:
+        # Le scraping incrémental ne revoit pas toutes les offres : la référence est l'index
+        # des offres déjà vues, pas la liste de la veille
+        from seen_index import SeenIndex
+        seen_index = SeenIndex()
+        if not len(seen_index):
+            seen_index.add(previous_jobs)
+        new_jobs = seen_index.add(current_jobs)
+        if config.DEDUP_CONFIG["enabled"]:
+            new_signatures = {get_job_signature(job) for job in new_jobs}
+            known_jobs = [job for job in current_jobs if get_job_signature(job) not in new_signatures]
+            new_jobs = filter_new_jobs(new_jobs, known_jobs)
+        expired = seen_index.prune()
+        seen_index.save()
+        # Une exécution partielle garde les offres non revues (job_store.carry_over_jobs) :
+        # celles qui manquent ont bien disparu
+        current_signatures = {get_job_signature(job) for job in current_jobs}
+        removed_jobs = [job for job in previous_jobs if get_job_signature(job) not in current_signatures]
+        
+        print_info(f"Total offres actuelles: {len(current_jobs)}")
+        print_info(f"Nouvelles offres: {len(new_jobs)}")
+        print_info(f"Offres supprimées: {len(removed_jobs)}")
+        print_info(f"Offres oubliées de l'index: {expired}")
+    else:
+        # Comparer
+        new_jobs, removed_jobs = compare_jobs(previous_jobs, current_jobs)
+        
+        print_info(f"Total offres actuelles: {len(current_jobs)}")
+        print_info(f"Nouvelles offres: {len(new_jobs)}")
+        print_info(f"Offres supprimées: {len(removed_jobs)}")
+    
+    if not use_sqlite():
+        # Sauvegarder les offres actuelles comme précédentes pour la prochaine fois
+        save_json(current_jobs, previous_jobs_file)
+        
+        # Sauvegarder l'historique (en SQLite, l'historique est tenu par la base)
+        save_jobs_history(current_jobs, previous_jobs)
     
+    count("new_jobs", len(new_jobs))
     return new_jobs, current_jobs
 
 
@@ -49,6 +49,39 @@ TECHNICAL_SKILLS = [
     "Git", "CI/CD"
 ]
 
+# Synonymes : compétence -> termes recherchés dans les offres (en plus du nom de la compétence).
+# Une compétence absente de TECHNICAL_SKILLS est ajoutée à l'analyse.
+SKILL_SYNONYMS = {
+    "Machine Learning": ["apprentissage automatique"],
+    "Scikit-learn": ["sklearn"],
+    "Power BI": ["powerbi"],
+    "GCP": ["google cloud"],
+    "Statistics": ["statistique", "statistiques", "statistical"],
+    "Data Visualization": ["visualisation", "visualization", "dashboard"],
+    "Etl": ["etl", "extract transform load"],
+    "Nlp": ["nlp", "natural language processing", "traitement du langage"],
+    "Computer Vision": ["computer vision", "vision par ordinateur", "opencv"],
+    "Time Series": ["time series", "séries temporelles", "forecasting"],
+    "A/B Testing": ["a/b testing", "ab testing", "test ab"],
+    "Agile": ["agile", "scrum", "kanban"],
+    "Jupyter": ["jupyter", "notebook"],
+    "Matplotlib": ["matplotlib", "seaborn", "plotly"],
+    "Excel": ["excel", "vba", "pivot table"],
+    "Nosql": ["nosql", "mongodb", "cassandra", "redis"],
+    "Postgresql": ["postgresql", "postgres"],
+    "Mysql": ["mysql", "mariadb"],
+    "Elasticsearch": ["elasticsearch", "elastic search"],
+    "Airflow": ["airflow", "apache airflow"],
+    "Dbt": ["dbt", "data build tool"],
+    "Snowflake": ["snowflake"],
+    "Databricks": ["databricks"],
+    "Mlflow": ["mlflow", "ml flow"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Terraform": ["terraform"],
+    "Jenkins": ["jenkins", "ci/cd"],
+    "Github": ["github", "gitlab", "bitbucket"]
+}
+
 # Templates de messages de networking
 NETWORKING_MESSAGES = {
     "data_scientist": """Bonjour {name},
@@ -87,7 +120,35 @@ SCRAPING_CONFIG = {
     "delay_between_requests": 2,  # secondes
     "max_pages": 5,  # nombre maximum de pages à scraper
     "headless": False,  # mode headless du navigateur
-    "timeout": 30  # timeout en secondes
+    "timeout": 30,  # timeout en secondes
+    "workers": _get_int_env('SCRAPING_WORKERS', '1'),  # sites scrapés en parallèle
+    "site_timeout": _get_int_env('SCRAPING_SITE_TIMEOUT', '600'),  # timeout par site en secondes
+    "batch_extraction": os.getenv('BATCH_EXTRACTION', 'true').lower() == 'true'  # une lecture du DOM par page
+}
+
+# Récupération HTTP simple avant Selenium (sites statiques)
+HTTP_CONFIG = {
+    "enabled": os.getenv('HTTP_FIRST', 'true').lower() == 'true',  # essayer HTTP avant Selenium
+    "timeout": _get_int_env('HTTP_TIMEOUT', '15'),  # timeout d'une requête en secondes
+    "pool_size": _get_int_env('HTTP_POOL_SIZE', '10')  # connexions keep-alive par hôte
+}
+
+# Bornes maximales des attentes (secondes) - voir waits.py
+WAIT_CONFIG = {
+    "page_load": _get_int_env('WAIT_PAGE_LOAD', '10'),  # document.readyState == complete
+    "selector": _get_int_env('WAIT_SELECTOR', '10'),  # présence d'un sélecteur
+    "cards": _get_int_env('WAIT_CARDS', '10'),  # nombre de cartes stable
+    "network_idle": _get_int_env('WAIT_NETWORK_IDLE', '5'),  # plus de requêtes réseau
+    "url": _get_int_env('WAIT_URL', '15'),  # changement d'URL (connexion)
+    "manual_login": _get_int_env('WAIT_MANUAL_LOGIN', '30'),  # vérification captcha/2FA
+    "scroll": 2,  # chargement après un scroll
+    "settle": 0.5  # durée de stabilité requise
+}
+
+# Pool de navigateurs partagés entre les scrapers
+DRIVER_POOL_CONFIG = {
+    "size": _get_int_env('DRIVER_POOL_SIZE', '1'),  # navigateurs démarrés à l'avance
+    "max_pages_per_driver": _get_int_env('DRIVER_MAX_PAGES', '20')  # recyclage après K pages
 }
 
 # Fichiers de stockage
@@ -95,6 +156,114 @@ DATA_DIR = "data"
 JOBS_FILE = f"{DATA_DIR}/jobs.json"
 SKILLS_FILE = f"{DATA_DIR}/skills_analysis.json"
 TRACKED_JOBS_FILE = f"{DATA_DIR}/tracked_jobs.json"
+SEEN_INDEX_FILE = f"{DATA_DIR}/seen_index.json"
+JOB_DETAILS_FILE = f"{DATA_DIR}/job_details.json"
+CV_PROFILES_FILE = f"{DATA_DIR}/cv_profiles.json"
+
+# Historique des exécutions : journal des ajouts/retraits et instantanés périodiques
+HISTORY_CONFIG = {
+    "snapshot_every": _get_int_env('HISTORY_SNAPSHOT_EVERY', '7'),  # exécutions entre deux instantanés
+    "retention_days": _get_int_env('HISTORY_RETENTION_DAYS', '365')  # journal conservé
+}
+
+# Stockage des offres, candidatures et exécutions (voir job_store.py)
+# JSON par défaut : data/jobs.json reste écrit (workflow GitHub, check_companies.py, copie sur le bureau)
+STORAGE_CONFIG = {
+    "backend": os.getenv('STORAGE_BACKEND', 'json').lower(),  # 'json' (fichiers historiques) ou 'sqlite'
+    "db_file": os.getenv('STORAGE_DB_FILE', f"{DATA_DIR}/jobs.db")
+}
+
+# Scraping incrémental : arrêt de la pagination sur les pages déjà connues (voir seen_index.py)
+# Désactivé par défaut : une exécution arrêtée tôt ne revoit pas toutes les offres
+INCREMENTAL_CONFIG = {
+    "enabled": os.getenv('INCREMENTAL_SCRAPING', 'false').lower() == 'true',
+    "known_ratio": float(os.getenv('INCREMENTAL_KNOWN_RATIO', '0.8')),  # part d'offres connues pour s'arrêter
+    "retention_days": _get_int_env('INCREMENTAL_RETENTION_DAYS', '60')  # oubli des offres non revues
+}
+
+# Cache disque des pages téléchargées (voir page_cache.py)
+PAGE_CACHE_CONFIG = {
+    "enabled": os.getenv('PAGE_CACHE', 'true').lower() == 'true',
+    "directory": os.getenv('PAGE_CACHE_DIR', f"{DATA_DIR}/page_cache"),
+    "ttl_hours": _get_int_env('PAGE_CACHE_TTL_HOURS', '12'),  # au-delà, la page est retéléchargée
+    "search_ttl_minutes": _get_int_env('PAGE_CACHE_SEARCH_TTL_MINUTES', '30'),  # pages de résultats
+    "max_mb": _get_int_env('PAGE_CACHE_MAX_MB', '500'),  # taille maximale, éviction LRU
+    "replay": os.getenv('PAGE_CACHE_REPLAY', 'false').lower() == 'true'  # ignorer la durée de validité
+}
+
+# Corpus de pages de résultats pour les benchmarks d'extraction (voir page_corpus.py)
+CORPUS_CONFIG = {
+    "capture": os.getenv('CAPTURE_CORPUS', 'false').lower() == 'true',  # enregistrer les pages scrapées
+    "directory": os.getenv('CORPUS_DIR', "fixtures/corpus"),
+    "version": os.getenv('CORPUS_VERSION', '')  # par défaut : date de la capture
+}
+
+# Enrichissement : pages de détail des nouvelles offres (voir enrichment.py)
+ENRICHMENT_CONFIG = {
+    "enabled": os.getenv('ENRICHMENT', 'true').lower() == 'true',
+    "workers": _get_int_env('ENRICHMENT_WORKERS', '4'),  # pages de détail téléchargées en parallèle
+    "budget_seconds": _get_int_env('ENRICHMENT_BUDGET', '300')  # durée maximale par exécution
+}
+
+# Détection des offres publiées sur plusieurs sites (near_duplicates.py)
+DEDUP_CONFIG = {
+    "enabled": os.getenv('NEAR_DUPLICATES', 'true').lower() == 'true',
+    "threshold": float(os.getenv('NEAR_DUPLICATES_THRESHOLD', '0.7')),  # similarité de Jaccard estimée à partir de laquelle deux offres sont le même poste
+    "min_shingles": _get_int_env('NEAR_DUPLICATES_MIN_SHINGLES', '5'),  # en dessous, l'offre n'est jamais regroupée
+    "num_perm": 64,  # taille des signatures MinHash
+    "bands": 16  # bandes LSH (num_perm / bands lignes par bande)
+}
+
+# Cache des réponses des LLM (voir llm_cache.py)
+LLM_CACHE_CONFIG = {
+    "enabled": os.getenv('LLM_CACHE', 'true').lower() == 'true',
+    "db_file": os.getenv('LLM_CACHE_FILE', f"{DATA_DIR}/llm_cache.db"),
+    "max_entries": _get_int_env('LLM_CACHE_MAX_ENTRIES', '1000'),  # au-delà, éviction LRU
+    "ttl_days": _get_int_env('LLM_CACHE_TTL_DAYS', '30')  # durée de validité d'une réponse
+}
+
+# Lettres générées en même temps par fournisseur (préparation des candidatures par lots)
+LLM_CONCURRENCY = {
+    "ollama": _get_int_env('LLM_CONCURRENCY_OLLAMA', '2'),  # à accorder avec OLLAMA_NUM_PARALLEL
+    "openai": _get_int_env('LLM_CONCURRENCY_OPENAI', '4'),
+    "mistral": _get_int_env('LLM_CONCURRENCY_MISTRAL', '4'),
+    "claude": _get_int_env('LLM_CONCURRENCY_CLAUDE', '4'),
+    "templates": 8  # sans LLM
+}
+
+# Routage des lettres entre plusieurs fournisseurs LLM (voir llm_router.py)
+LLM_ROUTER_CONFIG = {
+    # Fournisseurs utilisés, "fournisseur" ou "fournisseur:modèle" séparés par des virgules
+    # (ex: "ollama,openai:gpt-4o-mini") ; vide : un seul fournisseur (LLM_PROVIDER)
+    "providers": [p.strip() for p in os.getenv('LLM_PROVIDERS', '').split(',') if p.strip()],
+    "hedge": os.getenv('LLM_HEDGE', 'false').lower() == 'true',  # doubler une requête lente vers un autre fournisseur
+    "hedge_delay": _get_int_env('LLM_HEDGE_DELAY', '20'),  # délai avant de doubler, tant que le p90 n'est pas mesuré
+    "window": _get_int_env('LLM_ROUTER_WINDOW', '20'),  # générations récentes prises en compte par fournisseur
+    "max_error_rate": float(os.getenv('LLM_ROUTER_MAX_ERROR_RATE', '0.5')),  # au-delà, fournisseur écarté
+    "cooldown": _get_int_env('LLM_ROUTER_COOLDOWN', '60')  # secondes avant de retenter un fournisseur écarté
+}
+
+# Budget des prompts des lettres en tokens (voir prompt_builder.py)
+PROMPT_CONFIG = {
+    "cv_tokens": _get_int_env('PROMPT_CV_TOKENS', '600'),  # extraits du CV
+    "description_tokens": _get_int_env('PROMPT_DESCRIPTION_TOKENS', '450')  # paragraphes de l'offre
+}
+
+# Clients LLM partagés par le processus (voir llm_clients.py)
+LLM_CLIENT_CONFIG = {
+    "ollama_url": os.getenv('OLLAMA_URL', 'http://localhost:11434'),
+    "ollama_keep_alive": os.getenv('OLLAMA_KEEP_ALIVE', '30m'),  # durée pendant laquelle le modèle reste chargé
+    "ollama_preload": os.getenv('OLLAMA_PRELOAD', 'true').lower() == 'true',  # charger le modèle dès le démarrage
+    "health_ttl": _get_int_env('LLM_HEALTH_TTL', '30'),  # secondes pendant lesquelles l'état d'Ollama est réutilisé
+    "timeout": _get_int_env('LLM_TIMEOUT', '120')  # timeout d'une génération en secondes
+}
+
+# Mesures des exécutions : durées par étape et compteurs (voir metrics.py)
+METRICS_CONFIG = {
+    "enabled": os.getenv('METRICS', 'true').lower() == 'true',
+    "reports_dir": os.getenv('METRICS_REPORTS_DIR', f"{DATA_DIR}/runs"),  # rapports JSON par exécution
+    "textfile_dir": os.getenv('METRICS_TEXTFILE_DIR', f"{DATA_DIR}/metrics")  # fichiers .prom (node_exporter)
+}
 
 # Votre profil
 YOUR_NAME = os.getenv('YOUR_NAME', 'Votre Nom')
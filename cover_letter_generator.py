@@ -5,6 +5,8 @@ Supporte les LLM (Ollama, OpenAI, Mistral, Claude) et les templates de secours
 import re
 import os
 from utils import print_success, print_info, print_warning, load_json
+from cv_profile import get_cv_profile
+from letter_stream import reset_stream
 import config
 
 class CoverLetterGenerator:
@@ -19,9 +21,10 @@ class CoverLetterGenerator:
         """
         self.templates = self._load_templates()
         
-        # Détection automatique d'Ollama si use_llm n'est pas spécifié
+        # Détection automatique d'Ollama si use_llm n'est pas spécifié (ou plusieurs fournisseurs configurés)
+        router_providers = config.LLM_ROUTER_CONFIG["providers"]
         if use_llm is None:
-            use_llm = self._check_ollama_available()
+            use_llm = bool(router_providers) or self._check_ollama_available()
         
         self.use_llm = use_llm
         
@@ -29,11 +32,17 @@ class CoverLetterGenerator:
         self.llm_generator = None
         if use_llm:
             try:
-                from llm_generator import LLMGenerator
-                # Charger la config depuis .env ou config.py
-                provider = os.getenv('LLM_PROVIDER', llm_provider)
-                model = os.getenv('LLM_MODEL', llm_model)
-                self.llm_generator = LLMGenerator(provider=provider, model=model)
+                if router_providers:
+                    # Plusieurs fournisseurs : chaque lettre va au plus rapide (voir llm_router.py)
+                    from llm_router import LLMRouter
+                    self.llm_generator = LLMRouter(router_providers)
+                    provider = self.llm_generator.provider
+                else:
+                    from llm_generator import LLMGenerator
+                    # Charger la config depuis .env ou config.py
+                    provider = os.getenv('LLM_PROVIDER', llm_provider)
+                    model = os.getenv('LLM_MODEL', llm_model)
+                    self.llm_generator = LLMGenerator(provider=provider, model=model)
                 print_info(f"✅ Mode LLM activé avec {provider} (modèle: {self.llm_generator.model})")
             except ImportError:
                 print_warning("Module llm_generator non trouvé. Utilisation des templates.")
@@ -45,18 +54,13 @@ class CoverLetterGenerator:
             print_info("Mode templates activé (pour utiliser Ollama, lancez: ollama serve)")
     
     def _check_ollama_available(self):
-        """Vérifie si Ollama est disponible localement"""
-        try:
-            import requests
-            response = requests.get("http://localhost:11434/api/tags", timeout=1)
-            if response.status_code == 200:
-                # Vérifier qu'un modèle est disponible
-                models = response.json().get('models', [])
-                if models:
-                    print_info(f"✅ Ollama détecté avec {len(models)} modèle(s). Activation du mode LLM.")
-                    return True
-        except:
-            pass
+        """Vérifie si Ollama est disponible localement (état partagé, voir llm_clients.py)"""
+        from llm_clients import ollama_models
+        # Vérifier qu'un modèle est disponible
+        models = ollama_models()
+        if models:
+            print_info(f"✅ Ollama détecté avec {len(models)} modèle(s). Activation du mode LLM.")
+            return True
         return False
         
     def _load_templates(self):
@@ -128,6 +132,12 @@ Dans l'attente de votre retour,
 {contact_info}"""
         }
     
+    def concurrency(self):
+        """Nombre de lettres générées en même temps (limite du fournisseur LLM)"""
+        if self.use_llm and self.llm_generator:
+            return self.llm_generator.concurrency()
+        return config.LLM_CONCURRENCY["templates"]
+    
     def extract_keywords_from_job(self, job):
         """Extrait les mots-clés importants d'une offre"""
         text = " ".join([
@@ -154,11 +164,14 @@ Dans l'attente de votre retour,
         
         return skills_found[:5], keywords
     
-    def generate_cover_letter(self, job, personal_info, cv_path=None):
+    def generate_cover_letter(self, job, personal_info, cv_path=None, regenerate=False, on_chunk=None):
         """
         Génère une lettre de motivation adaptée à l'offre
         
-        Utilise un LLM si disponible, sinon utilise les templates
+        Utilise un LLM si disponible, sinon utilise les templates.
+        Avec regenerate=True, la lettre déjà générée par le LLM (cache) est ignorée.
+        Avec on_chunk, le texte est transmis au fil de la génération (affichage progressif) ;
+        voir letter_stream.py pour le remplacement par la lettre de secours.
         """
         # Essayer d'abord avec le LLM si activé
         if self.use_llm and self.llm_generator:
@@ -166,7 +179,9 @@ Dans l'attente de votre retour,
                 print_info("Génération de la lettre avec LLM...")
                 # Utiliser le cv_path passé en paramètre ou celui de personal_info
                 cv_path_to_use = cv_path or personal_info.get('cv_path')
-                cover_letter = self.llm_generator.generate_cover_letter(job, personal_info, cv_path_to_use)
+                cover_letter = self.llm_generator.generate_cover_letter(
+                    job, personal_info, cv_path_to_use, regenerate=regenerate, on_chunk=on_chunk
+                )
                 
                 # Vérifier que la lettre contient bien les informations de contact
                 if not personal_info.get('email', '') in cover_letter:
@@ -181,7 +196,12 @@ Dans l'attente de votre retour,
                 # Continuer avec les templates
         
         # Fallback vers les templates
-        return self._generate_with_templates(job, personal_info)
+        cover_letter = self._generate_with_templates(job, personal_info)
+        if on_chunk is not None:
+            # Le LLM a pu échouer en cours de route : le début de lettre affiché est remplacé
+            reset_stream(on_chunk)
+            on_chunk(cover_letter)
+        return cover_letter
     
     def _generate_with_templates(self, job, personal_info):
         """Génère une lettre avec les templates (méthode originale)"""
@@ -196,8 +216,12 @@ Dans l'attente de votre retour,
         elif 'alternance' in title_lower or 'apprentissage' in title_lower or 'stage' in title_lower:
             job_type = "alternance"
         
-        # Extraire les compétences clés
+        # Extraire les compétences clés (celles qui figurent aussi dans le CV en premier)
         skills_found, keywords = self.extract_keywords_from_job(job)
+        profile = get_cv_profile(personal_info.get('cv_path'))
+        if profile:
+            cv_skills = profile.matching_skills(job)
+            skills_found = cv_skills + [skill for skill in skills_found if skill not in cv_skills]
         key_skills = ", ".join(skills_found[:3]) if skills_found else ", ".join(config.YOUR_SKILLS[:3])
         
         # Construire les informations de contact
@@ -279,6 +303,10 @@ Dans l'attente de votre retour,
         # Nom de fichier basé sur le titre de l'offre
         safe_title = re.sub(r'[^\w\s-]', '', job.get('title', 'offre'))[:50]
         safe_title = safe_title.replace(' ', '_')
+        # L'entreprise évite d'écraser la lettre d'une autre offre de même titre (préparation par lots)
+        safe_company = re.sub(r'[^\w\s-]', '', job.get('company') or '')[:30].strip().replace(' ', '_')
+        if safe_company and safe_company != 'NA':
+            safe_title = f"{safe_title}_{safe_company}"
         filename = f"{output_dir}/{safe_title}_{datetime.now().strftime('%Y%m%d')}.txt"
         
         with open(filename, 'w', encoding='utf-8') as f:
@@ -0,0 +1,135 @@
+"""
+Profil extrait du CV (PDF), calculé une seule fois
+Le texte du CV est extrait avec PyPDF2, découpé en sections (expérience, formation,
+compétences, projets) et ses compétences sont repérées avec le matcher de compétences.
+Le profil est mis en cache sur disque (empreinte du fichier) et en mémoire (chemin, date de
+modification et taille) : générer N lettres ne relit le PDF qu'une fois.
+"""
+import os
+import re
+import hashlib
+import threading
+from utils import load_json, save_json, print_info, print_warning
+from skill_matcher import get_skill_matcher
+import config
+
+# Profils conservés sur disque (les plus anciennes versions du CV sont oubliées)
+MAX_STORED_PROFILES = 5
+
+SECTION_HEADINGS = {
+    'experience': r"exp[ée]riences?(?: professionnelles?)?|parcours professionnel|professional experience|work experience|experience",
+    'education': r"formations?|[ée]tudes|dipl[ôo]mes?|education|cursus",
+    'skills': r"comp[ée]tences?(?: techniques)?|savoir-faire|soft skills|skills|technical skills|outils",
+    'projects': r"projets?(?: personnels| académiques)?|projects?|r[ée]alisations",
+    # Titres reconnus pour ne pas mélanger leur contenu aux sections précédentes
+    'other': r"langues|languages|centres? d.int[ée]r[êe]ts?|loisirs|interests|hobbies|contact"
+}
+_HEADING = re.compile(
+    r"^\s*(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in SECTION_HEADINGS.items()) + r")\s*:?\s*$",
+    re.IGNORECASE
+)
+
+
+def split_sections(text):
+    """Découpe le texte du CV en sections ('summary' pour ce qui précède le premier titre)"""
+    sections = {}
+    current = 'summary'
+    for line in text.splitlines():
+        match = _HEADING.match(line) if len(line) < 60 else None
+        if match:
+            current = match.lastgroup
+            continue
+        if line.strip():
+            sections.setdefault(current, []).append(line.strip())
+    return {name: "\n".join(lines) for name, lines in sections.items()}
+
+
+def _read_pdf(cv_path):
+    """Texte brut du PDF (chaîne vide si PyPDF2 est absent ou si la lecture échoue)"""
+    try:
+        import PyPDF2
+    except ImportError:
+        print_warning("PyPDF2 non installé. Installez-le avec: pip install PyPDF2")
+        return ""
+    try:
+        with open(cv_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            return "\n".join(page.extract_text() or "" for page in pdf_reader.pages).strip()
+    except Exception as e:
+        print_warning(f"Erreur lors de l'extraction du CV: {str(e)}")
+        return ""
+
+
+class CVProfile:
+    """Texte, sections et compétences d'un CV"""
+
+    def __init__(self, file_hash, text, sections=None, skills=None):
+        self.file_hash = file_hash
+        self.text = text
+        self.sections = sections if sections is not None else split_sections(text)
+        if skills is None:
+            skills = [
+                get_skill_matcher().skills[j] for j in sorted(get_skill_matcher().match_text(text.lower()))
+            ]
+        self.skills = skills
+
+    def matching_skills(self, job):
+        """Compétences du CV demandées par une offre"""
+        cv_skills = set(self.skills)
+        return [skill for skill in get_skill_matcher().match_job(job) if skill in cv_skills]
+
+    def to_dict(self):
+        return {'file_hash': self.file_hash, 'text': self.text, 'sections': self.sections, 'skills': self.skills}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['file_hash'], data['text'], data.get('sections'), data.get('skills'))
+
+
+_profiles = {}
+_lock = threading.Lock()
+
+
+def _file_hash(cv_path):
+    digest = hashlib.sha256()
+    with open(cv_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_cv_profile(cv_path):
+    """
+    Profil du CV, extrait au premier appel puis relu depuis le cache
+
+    Returns:
+        CVProfile, ou None si le fichier n'existe pas ou si aucun texte n'a pu être extrait
+    """
+    if not cv_path or not os.path.exists(cv_path):
+        return None
+    stat = os.stat(cv_path)
+    memo_key = (os.path.abspath(cv_path), stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        if memo_key in _profiles:
+            return _profiles[memo_key]
+
+        # Même contenu (CV copié ou simplement touché) : profil déjà calculé sur disque
+        file_hash = _file_hash(cv_path)
+        stored = load_json(config.CV_PROFILES_FILE) if os.path.exists(config.CV_PROFILES_FILE) else {}
+        if file_hash in stored:
+            profile = CVProfile.from_dict(stored[file_hash])
+        else:
+            text = _read_pdf(cv_path)
+            if not text:
+                # Échec mémorisé : pas de nouvelle tentative pour chaque lettre
+                _profiles[memo_key] = None
+                return None
+            profile = CVProfile(file_hash, text)
+            stored[file_hash] = profile.to_dict()
+            save_json(dict(list(stored.items())[-MAX_STORED_PROFILES:]), config.CV_PROFILES_FILE)
+            print_info(
+                f"CV analysé: {len(profile.skills)} compétence(s), "
+                f"sections: {', '.join(profile.sections) or 'aucune'}"
+            )
+        _profiles[memo_key] = profile
+        return profile
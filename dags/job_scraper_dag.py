@@ -15,6 +15,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from scrape_jobs_airflow import run_daily_scraping
 from compare_jobs import get_new_jobs
 from email_notifier import send_email
+from metrics import reset_metrics, write_run_report
 from utils import print_info, print_success, print_error
 
 
@@ -22,6 +23,8 @@ def scrape_jobs_task(**context):
     """Tâche de scraping"""
     print_info("🚀 Démarrage de la tâche de scraping...")
     success, message, count = run_daily_scraping()
+    # Durée et rendement par site, suivis d'une exécution à l'autre via XCom
+    context['ti'].xcom_push(key='run_metrics', value=write_run_report("scrape"))
     
     if success:
         print_success(f"✅ Scraping terminé: {message}")
@@ -36,6 +39,7 @@ def scrape_jobs_task(**context):
 def compare_and_notify_task(**context):
     """Tâche de comparaison et envoi d'email"""
     print_info("📊 Comparaison des nouvelles offres...")
+    reset_metrics()
     
     try:
         # Récupérer les nouvelles offres
@@ -51,6 +55,7 @@ def compare_and_notify_task(**context):
         # (pour confirmer que le scraping a fonctionné)
         print_info("📧 Envoi de l'email de notification...")
         email_sent = send_email(new_jobs, jobs_count)
+        context['ti'].xcom_push(key='run_metrics', value=write_run_report("notify"))
         
         if email_sent:
             print_success(f"✅ Email envoyé avec {new_jobs_count} nouvelles offres")
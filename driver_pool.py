@@ -0,0 +1,205 @@
+"""
+Pool de drivers Selenium partagés entre les scrapers
+Les navigateurs sont démarrés à la demande par acquire() puis réutilisés d'un site à l'autre ;
+le pool vérifie leur état et les recycle après un certain nombre de pages. start() peut
+démarrer `size` navigateurs à l'avance.
+"""
+import threading
+from selenium import webdriver
+from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from utils import print_success, print_warning, print_info
+from metrics import timed
+import config
+
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+
+def get_chromedriver_path():
+    """Retourne le chemin du chromedriver (ChromeDriverManager n'est appelé qu'une fois)"""
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            _chromedriver_path = ChromeDriverManager().install()
+        return _chromedriver_path
+
+
+def build_chrome_options(headless=False):
+    """Options Chrome communes à tous les scrapers"""
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
+    return chrome_options
+
+
+@timed("driver_startup")
+def create_chrome_driver(headless=False):
+    """Démarre un nouveau navigateur Chrome"""
+    service = Service(get_chromedriver_path())
+    driver = webdriver.Chrome(service=service, options=build_chrome_options(headless))
+    driver.maximize_window()
+    return driver
+
+
+class DriverPool:
+    """Pool de navigateurs Chrome réutilisables, démarrés à la demande"""
+
+    def __init__(self, size=None, max_pages_per_driver=None, headless=False):
+        """
+        Initialise le pool
+
+        Args:
+            size: Nombre de navigateurs démarrés à l'avance par start() (optionnel)
+            max_pages_per_driver: Nombre de pages avant de recycler un navigateur
+            headless: Mode headless du navigateur
+        """
+        self.size = size or config.DRIVER_POOL_CONFIG["size"]
+        self.max_pages_per_driver = max_pages_per_driver or config.DRIVER_POOL_CONFIG["max_pages_per_driver"]
+        self.headless = headless
+        self._idle = []
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        """Démarre `size` navigateurs à l'avance (sinon acquire() les démarre au premier besoin)"""
+        for _ in range(self.size):
+            try:
+                driver = create_chrome_driver(self.headless)
+            except Exception as e:
+                print_warning(f"Impossible de démarrer un navigateur du pool: {str(e)}")
+                continue
+            with self._lock:
+                self._pages[id(driver)] = 0
+                self._idle.append(driver)
+        print_success(f"Pool de {len(self._idle)} navigateur(s) Chrome initialisé")
+        return self
+
+    def acquire(self, timeout=None):
+        """
+        Fournit un navigateur en bon état (en démarre un nouveau si besoin)
+
+        Args:
+            timeout: Durée maximale du démarrage d'un nouveau navigateur (secondes) ; au-delà,
+                TimeoutError est levée et le navigateur rejoint le pool une fois démarré
+        """
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Pool de navigateurs fermé")
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                break
+            if self._is_healthy(driver):
+                return driver
+            print_warning("Navigateur du pool hors service, remplacement...")
+            self._discard(driver)
+
+        if timeout is None:
+            driver = create_chrome_driver(self.headless)
+            with self._lock:
+                self._pages[id(driver)] = 0
+            return driver
+        return self._start_driver(timeout)
+
+    def _start_driver(self, timeout):
+        """Démarre un navigateur dans un thread pour ne pas attendre plus de timeout secondes"""
+        box = {}
+        ready = threading.Event()
+
+        def start():
+            driver = None
+            try:
+                driver = create_chrome_driver(self.headless)
+            except Exception as e:
+                box['error'] = e
+            with self._lock:
+                abandoned = box.get('abandoned', False)
+                box['driver'] = driver
+                if driver is not None:
+                    self._pages[id(driver)] = 0
+            ready.set()
+            if abandoned and driver is not None:
+                # Demande abandonnée : le navigateur sert au suivant (ou est fermé avec le pool)
+                self.release(driver, pages=0)
+
+        threading.Thread(target=start, name="driver-start", daemon=True).start()
+        ready.wait(timeout)
+        with self._lock:
+            if 'driver' not in box:
+                box['abandoned'] = True
+                raise TimeoutError(f"Navigateur non démarré après {timeout:.1f}s")
+        if 'error' in box:
+            raise box['error']
+        return box['driver']
+
+    def release(self, driver, pages=1):
+        """
+        Rend un navigateur au pool
+
+        Args:
+            driver: Navigateur obtenu via acquire()
+            pages: Nombre de pages chargées pendant l'utilisation
+        """
+        if driver is None:
+            return
+        with self._lock:
+            used = self._pages.get(id(driver), 0) + pages
+            self._pages[id(driver)] = used
+            closed = self._closed
+
+        if closed or used >= self.max_pages_per_driver or not self._is_healthy(driver):
+            if not closed:
+                print_info(f"Recyclage d'un navigateur après {used} page(s)")
+            self._discard(driver)
+            return
+
+        try:
+            driver.get("about:blank")
+        except Exception:
+            self._discard(driver)
+            return
+
+        with self._lock:
+            self._idle.append(driver)
+
+    def close(self):
+        """Ferme tous les navigateurs du pool"""
+        with self._lock:
+            self._closed = True
+            drivers, self._idle = self._idle, []
+        for driver in drivers:
+            self._discard(driver)
+        print_info("Pool de navigateurs fermé")
+
+    def _is_healthy(self, driver):
+        """Vérifie que le navigateur répond encore"""
+        try:
+            driver.execute_script("return document.readyState")
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        """Ferme définitivement un navigateur"""
+        with self._lock:
+            self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
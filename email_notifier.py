@@ -9,6 +9,7 @@ from email import encoders
 import os
 from datetime import datetime
 from utils import print_info, print_success, print_error, print_warning
+from metrics import timed, count
 import config
 
 
@@ -129,6 +130,7 @@ Cet email a été généré automatiquement par votre système de recherche d'em
     return text_content
 
 
+@timed("send_email")
 def send_email(new_jobs, total_jobs, recipient_email=None):
     """
     Envoie un email avec les nouvelles annonces
@@ -183,6 +185,7 @@ def send_email(new_jobs, total_jobs, recipient_email=None):
         
     except Exception as e:
         print_error(f"❌ Erreur lors de l'envoi de l'email: {str(e)}")
+        count("email_errors")
         return False
 
 
@@ -0,0 +1,168 @@
+"""
+Enrichissement des offres par leur page de détail (description complète et critères)
+Les cartes des résultats de recherche n'ont pas de description : seules les offres qui n'ont
+jamais été enrichies sont téléchargées, en parallèle et dans un temps limité par exécution.
+Les détails récupérés sont conservés (base SQLite ou data/job_details.json) et jamais retéléchargés.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from utils import load_json, save_json, print_info, print_success, print_warning
+from compare_jobs import get_job_signature
+from offer_ids import site_of
+from http_fetcher import fetch_html, parse_html
+from extraction_plan import get_extraction_plan
+from job_store import get_store, use_sqlite
+from metrics import timed
+from site_selectors import SITE_SELECTORS
+import config
+
+_SITES_BY_SOURCE = {spec['source']: site for site, spec in SITE_SELECTORS.items() if spec.get('source')}
+
+
+class DetailStore:
+    """Détails déjà récupérés, par signature d'offre"""
+
+    def __init__(self, filename=None):
+        self.filename = filename or config.JOB_DETAILS_FILE
+        self._details = None
+
+    def _load_file(self):
+        if self._details is None:
+            data = load_json(self.filename) if os.path.exists(self.filename) else {}
+            self._details = data if isinstance(data, dict) else {}
+        return self._details
+
+    def get(self, signatures):
+        """Détails connus pour ces signatures : {signature: {full_description, criteria}}"""
+        if use_sqlite():
+            return get_store().get_job_details(signatures)
+        details = self._load_file()
+        return {sig: details[sig] for sig in signatures if sig in details}
+
+    def save(self, details):
+        """Enregistre de nouveaux détails"""
+        if not details:
+            return
+        if use_sqlite():
+            get_store().save_job_details(details)
+        else:
+            self._load_file().update(details)
+            save_json(self._details, self.filename)
+
+
+def _site_for(job):
+    """Site du registre d'une offre (identifiant, domaine de l'URL ou source)"""
+    offer_id = job.get('offer_id') or ''
+    if ':' in offer_id:
+        return offer_id.split(':', 1)[0]
+    return site_of(job.get('url')) or _SITES_BY_SOURCE.get(job.get('source'))
+
+
+def fetch_details(job, site):
+    """
+    Télécharge la page de détail d'une offre (HTTP simple)
+
+    Returns:
+        Dictionnaire {full_description, criteria}, ou None si la page n'a rien donné
+    """
+    html = fetch_html(job['url'])
+    if html is None:
+        return None
+    details = get_extraction_plan(site).extract_details(parse_html(html))
+    if not details['full_description'] and not details['criteria']:
+        return None
+    return details
+
+
+def _apply(job, details):
+    job['full_description'] = details['full_description']
+    job['criteria'] = details['criteria']
+    if not job.get('description'):
+        # Le prompt de la lettre de motivation lit 'description'
+        job['description'] = details['full_description']
+
+
+@timed("enrichment")
+def enrich_jobs(jobs, budget_seconds=None, workers=None, store=None):
+    """
+    Complète les offres avec leur description complète et leurs critères
+
+    Args:
+        jobs: Offres de l'exécution (modifiées sur place)
+        budget_seconds: Temps maximal consacré aux téléchargements ; les offres restantes
+            seront enrichies à l'exécution suivante
+        workers: Pages de détail téléchargées en parallèle
+        store: DetailStore (par défaut : celui de la configuration)
+
+    Returns:
+        La liste des offres
+    """
+    budget_seconds = budget_seconds if budget_seconds is not None else config.ENRICHMENT_CONFIG["budget_seconds"]
+    workers = workers or config.ENRICHMENT_CONFIG["workers"]
+    store = store or DetailStore()
+
+    by_signature = {}
+    for job in jobs:
+        by_signature.setdefault(get_job_signature(job), []).append(job)
+
+    # Détails déjà récupérés lors d'une exécution précédente
+    known = store.get(list(by_signature))
+    for signature, details in known.items():
+        for job in by_signature[signature]:
+            _apply(job, details)
+
+    # File des offres à enrichir : une seule fois par signature, jamais celles déjà enrichies
+    queue = []
+    for signature, same_jobs in by_signature.items():
+        job = same_jobs[0]
+        if signature in known or job.get('full_description') or not job.get('url'):
+            continue
+        site = _site_for(job)
+        if site:
+            queue.append((signature, job, site))
+    if not queue:
+        return jobs
+
+    print_info(f"Enrichissement de {len(queue)} offre(s) ({workers} en parallèle, {budget_seconds}s max)")
+    deadline = time.monotonic() + budget_seconds
+    fetched = {}
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = {}
+    try:
+        queue = iter(queue)
+        exhausted = False
+        while True:
+            # Nouvelles pages tant qu'il reste du temps (au plus `workers` en cours)
+            while not exhausted and len(pending) < workers and time.monotonic() < deadline:
+                item = next(queue, None)
+                if item is None:
+                    exhausted = True
+                    break
+                signature, job, site = item
+                pending[executor.submit(fetch_details, job, site)] = signature
+            if not pending:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print_warning(f"Budget d'enrichissement épuisé, {len(pending)} page(s) abandonnée(s)")
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                signature = pending.pop(future)
+                try:
+                    details = future.result()
+                except Exception as e:
+                    print_warning(f"Page de détail illisible: {str(e)[:100]}")
+                    continue
+                if details:
+                    fetched[signature] = details
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    store.save(fetched)
+    for signature, details in fetched.items():
+        for job in by_signature[signature]:
+            _apply(job, details)
+    print_success(f"{len(fetched)} offre(s) enrichie(s)")
+    return jobs
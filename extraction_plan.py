@@ -0,0 +1,340 @@
+"""
+Plans d'extraction compilés à partir du registre de sélecteurs (site_selectors.py)
+Un plan fonctionne aussi bien sur un élément BeautifulSoup que sur un WebElement Selenium.
+Les sélecteurs qui trouvent le plus souvent passent en premier ; les sélecteurs morts
+finissent en fin de liste et n'ajoutent plus de requêtes inutiles.
+"""
+import threading
+from collections import Counter
+from bs4.element import Tag
+from selenium.webdriver.common.by import By
+from site_selectors import SITE_SELECTORS
+from http_fetcher import element_text, absolute_url
+from offer_ids import get_site_rule, canonicalize, make_offer_id
+from page_corpus import capture_page
+from metrics import timed
+import config
+from utils import print_info, get_timestamp
+
+_plans = {}
+_plans_lock = threading.Lock()
+
+
+def _select(node, selector):
+    """Éléments correspondant au sélecteur CSS (BeautifulSoup ou Selenium)"""
+    if isinstance(node, Tag):
+        return node.select(selector)
+    return node.find_elements(By.CSS_SELECTOR, selector)
+
+
+def _text(elem):
+    """Texte visible d'un élément"""
+    if isinstance(elem, Tag):
+        return element_text(elem)
+    return elem.text.strip()
+
+
+def _attr(elem, name):
+    """Attribut d'un élément"""
+    if isinstance(elem, Tag):
+        value = elem.get(name)
+        return " ".join(value) if isinstance(value, list) else value
+    return elem.get_attribute(name)
+
+
+def _tag_name(elem):
+    """Nom de balise d'un élément"""
+    if isinstance(elem, Tag):
+        return elem.name
+    return elem.tag_name
+
+
+def _date_value(elem):
+    """Date d'une offre : attribut datetime ou texte"""
+    return _attr(elem, "datetime") or _text(elem)
+
+
+class ExtractionPlan:
+    """Plan d'extraction d'un site, adapté au fil des pages selon les sélecteurs qui trouvent"""
+
+    def __init__(self, site, spec):
+        self.site = site
+        self.source = spec.get('source')
+        self.base_url = spec['base_url']
+        self.cards = list(spec['cards'])
+        self.no_results = list(spec.get('no_results', []))
+        self.cards_min_text = spec.get('cards_min_text', 0)
+        self.title_min_len = spec.get('title_min_len', 0)
+        self.url_from_card = spec.get('url_from_card', True)
+        self.company_exclude = [w.lower() for w in spec.get('company_exclude', [])]
+        self.company_fallback = spec.get('company_fallback')
+        self.company_fallback_exclude = [w.lower() for w in spec.get('company_fallback_exclude', [])]
+        self.company_fallback_href = spec.get('company_fallback_href', [])
+        self.fields = {name: list(selectors) for name, selectors in spec['fields'].items()}
+        self.fields['cards'] = self.cards
+        self.id_rule = get_site_rule(site)
+        self._hits = {name: Counter() for name in self.fields}
+        self._lookups = Counter()
+        self._found = Counter()
+        self._last = {}
+        self._lock = threading.Lock()
+
+    @property
+    def cards_selector(self):
+        """Sélecteur combiné des cartes (pour les attentes)"""
+        return ", ".join(self.cards)
+
+    @property
+    def no_results_selector(self):
+        """Sélecteur combiné du message « aucun résultat » (None si le site n'en déclare pas)"""
+        return ", ".join(self.no_results) or None
+
+    def _ordered(self, field):
+        """Sélecteurs d'un champ : dernier gagnant, puis les plus fréquents (ordre du registre à égalité)"""
+        selectors = self.fields.get(field, [])
+        with self._lock:
+            hits = self._hits[field]
+            last = self._last.get(field)
+            ordered = sorted(selectors, key=lambda s: -hits[s])
+        if last in selectors:
+            ordered.remove(last)
+            ordered.insert(0, last)
+        return ordered
+
+    def _record(self, field, selector):
+        """Mémorise le résultat d'une recherche (selector None = rien trouvé)"""
+        with self._lock:
+            self._lookups[field] += 1
+            if selector is not None:
+                self._found[field] += 1
+                self._hits[field][selector] += 1
+                self._last[field] = selector
+
+    def last_matched(self, field):
+        """Dernier sélecteur ayant trouvé pour ce champ"""
+        with self._lock:
+            return self._last.get(field)
+
+    def select_cards(self, root):
+        """Cartes d'offres d'une page (premier sélecteur qui en trouve)"""
+        if config.CORPUS_CONFIG["capture"]:
+            # Page de résultats enregistrée pour les benchmarks hors ligne
+            if isinstance(root, Tag):
+                capture_page(self.site, str(root))
+            else:
+                capture_page(self.site, root.page_source, root.current_url)
+        for selector in self._ordered('cards'):
+            try:
+                cards = _select(root, selector)
+            except Exception:
+                continue
+            if self.cards_min_text:
+                cards = [card for card in cards if len(_text(card)) > self.cards_min_text]
+            if cards:
+                self._record('cards', selector)
+                return cards
+        self._record('cards', None)
+        return []
+
+    def first(self, root, field, accept=None, value=_text):
+        """
+        Premier élément d'un champ dont la valeur est acceptée
+
+        Returns:
+            Tuple (valeur, élément) ou (None, None)
+        """
+        for selector in self._ordered(field):
+            try:
+                elems = _select(root, selector)
+            except Exception:
+                continue
+            for elem in elems:
+                try:
+                    text = value(elem)
+                except Exception:
+                    continue
+                if text and (accept is None or accept(text)):
+                    self._record(field, selector)
+                    return text, elem
+        self._record(field, None)
+        return None, None
+
+    def _company_from_links(self, card, title):
+        """Entreprise déduite d'un lien vers sa page"""
+        for link in _select(card, "a"):
+            href = _attr(link, "href") or ""
+            text = _text(link)
+            if text and len(text) < 100 and text != title and any(p in href for p in self.company_fallback_href):
+                return text
+        return None
+
+    def _company_from_text(self, card, title):
+        """Entreprise déduite d'un texte court de la carte"""
+        for elem in _select(card, "span, div, p, a"):
+            text = _text(elem)
+            if (text and 2 < len(text) < 50 and text != title
+                    and not any(w in text.lower() for w in self.company_fallback_exclude)):
+                return text
+        return None
+
+    def extract_company(self, card, title):
+        """Entreprise d'une carte, avec le repli propre au site"""
+        company, _ = self.first(
+            card, 'company',
+            lambda t: 1 < len(t) < 100 and t != title
+            and not any(w in t.lower() for w in self.company_exclude)
+        )
+        if company:
+            return company
+        if self.company_fallback == 'links':
+            return self._company_from_links(card, title)
+        if self.company_fallback == 'text':
+            return self._company_from_text(card, title)
+        return None
+
+    def card_raw_id(self, card):
+        """Identifiant de l'offre lu directement sur la carte (attribut ou premier lien), sans extraction"""
+        rule = self.id_rule
+        if rule.attr:
+            value = _attr(card, rule.attr)
+            if not value:
+                elems = _select(card, f"[{rule.attr}]")
+                value = _attr(elems[0], rule.attr) if elems else None
+            if value:
+                return value
+        if rule.patterns:
+            links = [card] if _tag_name(card) == "a" else _select(card, "a[href]")
+            for link in links:
+                raw_id = rule.find_id(_attr(link, "href") or "")
+                if raw_id:
+                    return raw_id
+        return None
+
+    def already_seen(self, card, seen_ids):
+        """Vrai si l'offre de la carte a déjà été extraite"""
+        raw_id = self.card_raw_id(card)
+        return bool(raw_id) and make_offer_id(self.site, raw_id) in seen_ids
+
+    @timed("extract")
+    def extract(self, card, seen_ids=None):
+        """
+        Extrait une offre d'une carte (BeautifulSoup ou Selenium)
+
+        Args:
+            card: Carte d'offre
+            seen_ids: Identifiants déjà extraits pendant la recherche ; une carte déjà vue
+                (carte imbriquée, offre répétée d'une page à l'autre) est ignorée
+
+        Returns:
+            Dictionnaire de l'offre, ou None si aucun titre n'est trouvé ou si l'offre est déjà vue
+        """
+        raw_id = self.card_raw_id(card)
+        if raw_id and seen_ids is not None and make_offer_id(self.site, raw_id) in seen_ids:
+            return None
+
+        title, title_elem = self.first(card, 'title', lambda t: len(t) > self.title_min_len)
+        if not title and self.fields.get('title_fallback'):
+            title, title_elem = self.first(card, 'title_fallback', lambda t: 10 < len(t) < 200)
+        if not title:
+            return None
+
+        url = ""
+        if _tag_name(title_elem) == "a":
+            url = _attr(title_elem, "href")
+        elif self.url_from_card:
+            if _tag_name(card) == "a":
+                url = _attr(card, "href")
+            else:
+                links = _select(card, "a")
+                url = _attr(links[0], "href") if links else ""
+        url = absolute_url(self.base_url, url)
+        offer_id, url = canonicalize(url, self.site, raw_id)
+        if offer_id and seen_ids is not None:
+            if offer_id in seen_ids:
+                return None
+            seen_ids.add(offer_id)
+
+        company = self.extract_company(card, title)
+        location, _ = self.first(
+            card, 'location', lambda t: len(t) > 1 and 'il y a' not in t.lower() and 'ago' not in t.lower()
+        )
+        date, _ = self.first(card, 'date', value=_date_value)
+
+        job = {}
+        if self.source:
+            job['source'] = self.source
+        if offer_id:
+            job['offer_id'] = offer_id
+        job.update({
+            'title': title,
+            'company': company or "N/A",
+            'location': location or "N/A",
+            'url': url,
+            'date': date or "N/A",
+            'description': "",
+            'scraped_at': get_timestamp()
+        })
+        return job
+
+    def extract_details(self, root):
+        """
+        Description complète et critères d'une page de détail (BeautifulSoup ou Selenium)
+
+        Returns:
+            Dictionnaire {full_description, criteria}
+        """
+        description, _ = self.first(root, 'full_description', lambda t: len(t) > 50)
+        criteria = []
+        for selector in self._ordered('criteria'):
+            try:
+                elems = _select(root, selector)
+            except Exception:
+                continue
+            criteria = [text for text in (_text(elem) for elem in elems) if text]
+            if criteria:
+                self._record('criteria', selector)
+                break
+        else:
+            self._record('criteria', None)
+        return {'full_description': description or "", 'criteria': criteria}
+
+    def stats(self):
+        """Taux de réussite par champ et sélecteur gagnant"""
+        with self._lock:
+            result = {}
+            for field, lookups in self._lookups.items():
+                hits = self._hits[field]
+                result[field] = {
+                    'lookups': lookups,
+                    'found': self._found[field],
+                    'rate': round(self._found[field] / lookups, 2) if lookups else 0,
+                    'best': hits.most_common(1)[0][0] if hits else None,
+                    'dead': [s for s in self.fields[field] if not hits[s]]
+                }
+            return result
+
+
+def get_extraction_plan(site):
+    """Plan d'extraction d'un site (compilé une seule fois par processus)"""
+    with _plans_lock:
+        plan = _plans.get(site)
+        if plan is None:
+            plan = ExtractionPlan(site, SITE_SELECTORS[site])
+            _plans[site] = plan
+        return plan
+
+
+def print_extraction_stats():
+    """Affiche le taux de réussite des sélecteurs par site et par champ"""
+    with _plans_lock:
+        plans = list(_plans.values())
+    for plan in plans:
+        stats = plan.stats()
+        if not stats:
+            continue
+        print_info(f"Sélecteurs {plan.site}:")
+        for field, s in stats.items():
+            print_info(
+                f"  - {field}: {s['found']}/{s['lookups']} ({s['rate']:.0%}), "
+                f"meilleur: {s['best']}, {len(s['dead'])} sélecteur(s) sans résultat"
+            )
@@ -0,0 +1,150 @@
+"""
+Récupération des pages par HTTP simple (sans navigateur)
+Session requests partagée avec keep-alive ; les scrapers se replient sur
+Selenium quand la page nécessite JavaScript
+"""
+import time
+import threading
+from datetime import timedelta
+from contextlib import contextmanager
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup
+from utils import print_warning
+from page_cache import get_page_cache
+from metrics import span
+import config
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+_session = None
+_session_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_session():
+    """Retourne la session HTTP partagée (connexions réutilisées entre les requêtes)"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            retry = Retry(total=2, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+            adapter = HTTPAdapter(
+                pool_connections=config.HTTP_CONFIG["pool_size"],
+                pool_maxsize=config.HTTP_CONFIG["pool_size"],
+                max_retries=retry
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "User-Agent": USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "fr-FR,fr;q=0.9,en;q=0.8"
+            })
+            _session = session
+        return _session
+
+
+@contextmanager
+def http_deadline(seconds):
+    """Borne la durée totale des requêtes HTTP du thread courant (timeout d'un site)"""
+    previous = getattr(_local, 'deadline', None)
+    _local.deadline = time.monotonic() + seconds if seconds else None
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def _download(url, timeout=None):
+    """Télécharge une page (requête bornée par http_deadline), retourne None en cas d'échec"""
+    timeout = timeout or config.HTTP_CONFIG["timeout"]
+    deadline = getattr(_local, 'deadline', None)
+    if deadline is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print_warning(f"Temps du site écoulé, requête HTTP abandonnée: {url}")
+            return None
+        timeout = min(timeout, remaining)
+    try:
+        with span("http_fetch"):
+            response = get_session().get(url, timeout=timeout)
+    except requests.RequestException as e:
+        print_warning(f"Requête HTTP échouée ({url}): {str(e)[:100]}")
+        return None
+    if response.status_code != 200:
+        print_warning(f"Requête HTTP refusée ({response.status_code}): {url}")
+        return None
+    return response.text
+
+
+def fetch_html(url, timeout=None):
+    """Télécharge une page d'offre (ou la lit dans le cache disque), retourne None en cas d'échec"""
+    cache = get_page_cache()
+    if cache is not None:
+        html = cache.get(url)
+        if html is not None:
+            return html
+    html = _download(url, timeout)
+    if cache is not None and html is not None:
+        cache.put(url, html)
+    return html
+
+
+def parse_html(html):
+    """Parse du HTML avec BeautifulSoup"""
+    return BeautifulSoup(html, "lxml")
+
+
+def fetch_cards(url, plan):
+    """
+    Télécharge une page de résultats et retourne ses cartes d'offres
+    (sélectionnées par le plan d'extraction du site)
+
+    La page n'est relue depuis le cache que pendant search_ttl_minutes (ou en mode rejeu), et
+    n'y est enregistrée que si elle contient des cartes : une page vide ou bloquée est retéléchargée.
+
+    Returns:
+        Liste d'éléments BeautifulSoup, ou None si aucune carte n'est présente
+        dans le HTML statique (la page nécessite JavaScript)
+    """
+    cache = get_page_cache()
+    if cache is not None:
+        html = cache.get(url, ttl=timedelta(minutes=config.PAGE_CACHE_CONFIG["search_ttl_minutes"]))
+        if html is not None:
+            cards = plan.select_cards(parse_html(html))
+            if cards:
+                return cards
+    html = _download(url)
+    if html is None:
+        return None
+    cards = plan.select_cards(parse_html(html))
+    if cache is not None and cards:
+        cache.put(url, html)
+    return cards or None
+
+
+def element_text(elem):
+    """Texte visible d'un élément BeautifulSoup"""
+    return elem.get_text(" ", strip=True)
+
+
+def absolute_url(base_url, href):
+    """Convertit un lien relatif en URL absolue"""
+    if not href:
+        return ""
+    return urljoin(base_url, href)
+
+
+def parse_page_source(driver):
+    """Lit le DOM courant du navigateur en une seule fois et le parse (la page est gardée en cache)"""
+    html = driver.page_source
+    cache = get_page_cache()
+    if cache is not None:
+        cache.put(driver.current_url, html)
+    return parse_html(html)
@@ -0,0 +1,230 @@
+"""
+Historique des offres par journal de différences
+Chaque exécution n'ajoute que les offres apparues et disparues ; un instantané complet est
+écrit toutes les config.HISTORY_CONFIG["snapshot_every"] exécutions pour borner la reconstruction.
+
+En SQLite l'historique est dans la base (job_store.py) ; sinon dans un fichier JSON Lines
+(data/jobs_history.jsonl) écrit en ajout, dont le début est retiré quand il sort de
+HISTORY_RETENTION_DAYS. L'ancien fichier data/jobs_history.json (liste complète des offres
+à chaque exécution) est converti en journal à la première utilisation.
+"""
+import os
+import json
+from datetime import datetime, timedelta
+from utils import ensure_data_dir, load_json
+from compare_jobs import get_job_signature, rekey_signature
+from job_store import get_store, use_sqlite
+import config
+
+HISTORY_FILE = os.path.join(config.DATA_DIR, 'jobs_history.jsonl')
+HISTORY_STATE_FILE = os.path.join(config.DATA_DIR, 'jobs_history_state.json')
+LEGACY_HISTORY_FILE = os.path.join(config.DATA_DIR, 'jobs_history.json')
+
+
+def _read_state():
+    """Positions des instantanés dans le journal et nombre d'exécutions depuis le dernier"""
+    state = load_json(HISTORY_STATE_FILE) if os.path.exists(HISTORY_STATE_FILE) else {}
+    return state if isinstance(state, dict) else {}
+
+
+def _write_state(state):
+    with open(HISTORY_STATE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+
+
+def _make_entry(previous_jobs, current_jobs, timestamp, snapshot):
+    """Entrée du journal : instantané complet ou offres apparues et disparues"""
+    current = {get_job_signature(job): job for job in current_jobs}
+    if snapshot:
+        return {'timestamp': timestamp, 'snapshot': current}
+    previous = {get_job_signature(job) for job in previous_jobs}
+    return {
+        'timestamp': timestamp,
+        'added': {sig: job for sig, job in current.items() if sig not in previous},
+        'removed': [sig for sig in previous if sig not in current]
+    }
+
+
+def _import_legacy_history(state):
+    """
+    Convertit l'ancien historique (jobs_history.json) en entrées placées avant le journal
+
+    Le fichier converti est renommé en jobs_history.json.bak.
+    """
+    if not os.path.exists(LEGACY_HISTORY_FILE):
+        return state
+    legacy = load_json(LEGACY_HISTORY_FILE)
+    legacy = sorted(
+        (run for run in legacy if isinstance(run, dict) and 'jobs' in run) if isinstance(legacy, list) else [],
+        key=lambda run: run.get('timestamp', '')
+    )
+    existing = b""
+    if os.path.exists(HISTORY_FILE):
+        with open(HISTORY_FILE, 'rb') as f:
+            existing = f.read()
+
+    snapshots = []
+    runs_since = 0
+    with open(HISTORY_FILE + ".tmp", 'wb') as f:
+        previous_jobs = None
+        for i, run in enumerate(legacy):
+            snapshot = i == 0 or runs_since + 1 >= config.HISTORY_CONFIG["snapshot_every"]
+            runs_since = 0 if snapshot else runs_since + 1
+            entry = _make_entry(previous_jobs, run['jobs'], run.get('timestamp', ''), snapshot)
+            if snapshot:
+                snapshots.append([entry['timestamp'], f.tell()])
+            f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8'))
+            previous_jobs = run['jobs']
+        shift = f.tell()
+        f.write(existing)
+    os.replace(HISTORY_FILE + ".tmp", HISTORY_FILE)
+    os.replace(LEGACY_HISTORY_FILE, LEGACY_HISTORY_FILE + ".bak")
+
+    if existing:
+        # Le journal existant commence par un instantané : il suit les entrées converties
+        state['snapshots'] = snapshots + [[ts, offset + shift] for ts, offset in state.get('snapshots', [])]
+    else:
+        state['snapshots'] = snapshots
+        state['runs_since_snapshot'] = runs_since
+    _write_state(state)
+    return state
+
+
+def _compact(state):
+    """
+    Retire le début du journal sorti de la période de conservation
+
+    Le journal repart du dernier instantané antérieur à la limite (les jours conservés restent
+    reconstructibles) ; les positions des instantanés sont recalculées.
+    """
+    limit = (datetime.now() - timedelta(days=config.HISTORY_CONFIG["retention_days"])).isoformat()
+    snapshots = state.get('snapshots', [])
+    expired = [offset for timestamp, offset in snapshots if timestamp < limit]
+    if not expired or max(expired) == 0:
+        return state
+    start = max(expired)
+    with open(HISTORY_FILE, 'rb') as f:
+        f.seek(start)
+        kept = f.read()
+    with open(HISTORY_FILE + ".tmp", 'wb') as f:
+        f.write(kept)
+    os.replace(HISTORY_FILE + ".tmp", HISTORY_FILE)
+    state['snapshots'] = [[timestamp, offset - start] for timestamp, offset in snapshots if offset >= start]
+    _write_state(state)
+    return state
+
+
+def _load_state():
+    """État du journal, après conversion de l'ancien historique s'il existe encore"""
+    return _import_legacy_history(_read_state())
+
+
+def append_history(previous_jobs, current_jobs, timestamp=None):
+    """
+    Ajoute une exécution au journal (fichier JSON Lines)
+
+    Args:
+        previous_jobs: Offres de l'exécution précédente (None à la première exécution)
+        current_jobs: Offres de l'exécution courante
+    """
+    ensure_data_dir()
+    timestamp = timestamp or datetime.now().isoformat()
+    state = _load_state()
+    runs_since = state.get('runs_since_snapshot', 0) + 1
+
+    snapshot = previous_jobs is None or not state.get('snapshots') or runs_since >= config.HISTORY_CONFIG["snapshot_every"]
+    entry = _make_entry(previous_jobs, current_jobs, timestamp, snapshot)
+    if snapshot:
+        runs_since = 0
+
+    with open(HISTORY_FILE, 'ab') as f:
+        offset = f.tell()
+        f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8'))
+
+    if snapshot:
+        state.setdefault('snapshots', []).append([timestamp, offset])
+    state['runs_since_snapshot'] = runs_since
+    _write_state(state)
+    _compact(state)
+    return HISTORY_FILE
+
+
+def _rekey_entry(entry):
+    """Entrée du journal avec les signatures actuelles (les entrées ne sont jamais réécrites)"""
+    for field in ('snapshot', 'added'):
+        if field in entry:
+            entry[field] = {rekey_signature(sig): job for sig, job in entry[field].items()}
+    if 'removed' in entry:
+        entry['removed'] = [rekey_signature(sig) for sig in entry['removed']]
+    return entry
+
+
+def _iter_entries(offset=0):
+    """Parcourt le journal dans l'ordre chronologique à partir d'une position"""
+    if not os.path.exists(HISTORY_FILE):
+        return
+    with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+        f.seek(offset)
+        for line in f:
+            if line.strip():
+                yield _rekey_entry(json.loads(line))
+
+
+def _replay(until=None):
+    """Rejoue le journal depuis le dernier instantané antérieur à une date"""
+    offset = 0
+    for timestamp, snapshot_offset in _load_state().get('snapshots', []):
+        if until is None or timestamp[:10] <= until:
+            offset = snapshot_offset
+    jobs = {}
+    for entry in _iter_entries(offset):
+        if until and entry['timestamp'][:10] > until:
+            break
+        if 'snapshot' in entry:
+            jobs = dict(entry['snapshot'])
+        else:
+            jobs.update(entry['added'])
+            for sig in entry['removed']:
+                jobs.pop(sig, None)
+    return jobs
+
+
+def get_jobs_at(day):
+    """Offres présentes à une date (YYYY-MM-DD ou date)"""
+    day = day if isinstance(day, str) else day.isoformat()
+    if use_sqlite():
+        return get_store().get_jobs_at(day)
+    return list(_replay(day[:10]).values())
+
+
+def get_job_presence(job_or_signature):
+    """
+    Première et dernière apparition d'une offre
+
+    Returns:
+        Dictionnaire {first_seen, last_seen, present} ou None si l'offre n'a jamais été vue
+    """
+    signature = rekey_signature(job_or_signature) if isinstance(job_or_signature, str) else get_job_signature(job_or_signature)
+    if use_sqlite():
+        return get_store().get_job_presence(signature)
+
+    first_seen = last_seen = None
+    present = False
+    _load_state()
+    for entry in _iter_entries():
+        if 'snapshot' in entry:
+            now_present = signature in entry['snapshot']
+        elif signature in entry['added']:
+            now_present = True
+        elif signature in entry['removed']:
+            now_present = False
+        else:
+            now_present = present
+        if now_present and first_seen is None:
+            first_seen = entry['timestamp']
+        if now_present:
+            last_seen = entry['timestamp']
+        present = now_present
+    if first_seen is None:
+        return None
+    return {'first_seen': first_seen, 'last_seen': last_seen, 'present': present}
@@ -0,0 +1,645 @@
+"""
+Stockage SQLite (mode WAL) des offres, candidatures, offres suivies et exécutions de scraping
+Chaque écriture ne touche que les lignes modifiées ; les fichiers JSON/CSV ne sont plus
+que des exports à la demande (voir export_jobs)
+
+L'historique des exécutions est un journal des offres ajoutées/retirées à chaque exécution,
+avec un instantané complet toutes les config.HISTORY_CONFIG["snapshot_every"] exécutions
+"""
+import os
+import json
+import sqlite3
+import threading
+import argparse
+from datetime import datetime, timedelta
+import pandas as pd
+from utils import ensure_data_dir, load_json, save_json, print_info, print_success
+from metrics import timed
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    signature TEXT PRIMARY KEY,
+    source TEXT,
+    title TEXT,
+    company TEXT,
+    url TEXT,
+    data TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_source ON jobs(source);
+CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs(last_seen);
+
+CREATE TABLE IF NOT EXISTS scrape_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    keywords TEXT,
+    location TEXT,
+    total_jobs INTEGER NOT NULL DEFAULT 0,
+    added_jobs INTEGER NOT NULL DEFAULT 0,
+    removed_jobs INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'running'
+);
+CREATE INDEX IF NOT EXISTS idx_scrape_runs_started_at ON scrape_runs(started_at);
+
+CREATE TABLE IF NOT EXISTS job_changes (
+    run_id INTEGER NOT NULL REFERENCES scrape_runs(id) ON DELETE CASCADE,
+    signature TEXT NOT NULL,
+    change TEXT NOT NULL CHECK (change IN ('added', 'removed')),
+    PRIMARY KEY (run_id, signature)
+);
+CREATE INDEX IF NOT EXISTS idx_job_changes_signature ON job_changes(signature);
+
+CREATE TABLE IF NOT EXISTS run_snapshots (
+    run_id INTEGER PRIMARY KEY REFERENCES scrape_runs(id) ON DELETE CASCADE,
+    signatures TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_url TEXT,
+    status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_applications_job_url ON applications(job_url);
+CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(status);
+
+CREATE TABLE IF NOT EXISTS tracked_jobs (
+    signature TEXT PRIMARY KEY,
+    url TEXT,
+    data TEXT NOT NULL,
+    tracked_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS seen_jobs (
+    signature TEXT PRIMARY KEY,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS job_details (
+    signature TEXT PRIMARY KEY,
+    full_description TEXT,
+    criteria TEXT NOT NULL,
+    fetched_at TEXT NOT NULL
+);
+"""
+
+# Version du contenu de la base (PRAGMA user_version), voir JobStore._migrate
+# 1 : signatures par identifiant d'offre ou URL canonique (offer_ids.py)
+SCHEMA_VERSION = 1
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _signature(job):
+    """Signature d'une offre (même règle que compare_jobs)"""
+    from compare_jobs import get_job_signature
+    return get_job_signature(job)
+
+
+def use_sqlite():
+    """Vrai si le stockage SQLite est activé (sinon fichiers JSON historiques)"""
+    return config.STORAGE_CONFIG["backend"] == "sqlite"
+
+
+class JobStore:
+    """Accès à la base SQLite (une connexion partagée, protégée par un verrou)"""
+
+    def __init__(self, db_file=None):
+        self.db_file = db_file or config.STORAGE_CONFIG["db_file"]
+        ensure_data_dir()
+        is_new = not os.path.exists(self.db_file)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_file, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        if is_new:
+            self._import_legacy_files()
+        self._migrate()
+
+    def close(self):
+        """Ferme la connexion"""
+        with self._lock:
+            self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Offres et exécutions de scraping
+    # ------------------------------------------------------------------
+
+    def start_run(self, keywords="", location=""):
+        """Enregistre le début d'une exécution de scraping et retourne son identifiant"""
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO scrape_runs (started_at, keywords, location) VALUES (?, ?, ?)",
+                (datetime.now().isoformat(), keywords, location)
+            )
+            return cursor.lastrowid
+
+    def finish_run(self, run_id, jobs, status="success", carried_over=()):
+        """
+        Enregistre les offres d'une exécution (upsert par signature) et clôt l'exécution
+        Seules les différences avec l'exécution précédente sont ajoutées à l'historique
+
+        Args:
+            carried_over: Offres non revues d'une exécution partielle (voir carry_over_jobs),
+                toujours présentes dans l'historique mais sans mise à jour de last_seen
+
+        Returns:
+            Liste des offres jamais vues auparavant
+        """
+        now = datetime.now().isoformat()
+        with self._lock, self.conn:
+            new_jobs = self._upsert_jobs(jobs, now)
+            added, removed = [], []
+            if status == "success":
+                signatures = [_signature(job) for job in list(jobs) + list(carried_over)]
+                added, removed = self._record_changes(run_id, signatures)
+            self.conn.execute(
+                """
+                UPDATE scrape_runs SET finished_at = ?, total_jobs = ?, added_jobs = ?, removed_jobs = ?,
+                    status = ? WHERE id = ?
+                """,
+                (now, len(jobs), len(added), len(removed), status, run_id)
+            )
+        return new_jobs
+
+    def _record_changes(self, run_id, signatures):
+        """Ajoute au journal les offres apparues et disparues depuis l'exécution précédente"""
+        signatures = list(dict.fromkeys(signatures))
+        row = self.conn.execute(
+            "SELECT MAX(id) AS id FROM scrape_runs WHERE status = 'success' AND id < ?", (run_id,)
+        ).fetchone()
+        previous = self.get_run_signatures(row['id']) if row['id'] is not None else []
+        previous_set, current_set = set(previous), set(signatures)
+        added = [sig for sig in signatures if sig not in previous_set]
+        removed = [sig for sig in previous if sig not in current_set]
+        self.conn.executemany(
+            "INSERT INTO job_changes (run_id, signature, change) VALUES (?, ?, ?)",
+            [(run_id, sig, 'added') for sig in added] + [(run_id, sig, 'removed') for sig in removed]
+        )
+        
+        # Instantané périodique : la reconstruction repart du dernier instantané
+        last_snapshot = self.conn.execute("SELECT MAX(run_id) AS run_id FROM run_snapshots").fetchone()['run_id']
+        runs_since = self.conn.execute(
+            "SELECT COUNT(*) AS n FROM scrape_runs WHERE status = 'success' AND id > ? AND id < ?",
+            (last_snapshot or 0, run_id)
+        ).fetchone()['n'] + 1
+        if last_snapshot is None or runs_since >= config.HISTORY_CONFIG["snapshot_every"]:
+            self.conn.execute(
+                "INSERT INTO run_snapshots (run_id, signatures) VALUES (?, ?)",
+                (run_id, json.dumps(signatures, ensure_ascii=False))
+            )
+            self._compact_history()
+        return added, removed
+
+    def _compact_history(self):
+        """Oublie le journal antérieur au plus ancien instantané encore conservé"""
+        limit = (datetime.now() - timedelta(days=config.HISTORY_CONFIG["retention_days"])).isoformat()
+        row = self.conn.execute(
+            """
+            SELECT MAX(run_snapshots.run_id) AS run_id FROM run_snapshots
+            JOIN scrape_runs ON scrape_runs.id = run_snapshots.run_id
+            WHERE scrape_runs.started_at < ?
+            """,
+            (limit,)
+        ).fetchone()
+        if row['run_id'] is not None:
+            self.conn.execute("DELETE FROM job_changes WHERE run_id <= ?", (row['run_id'],))
+            self.conn.execute("DELETE FROM run_snapshots WHERE run_id < ?", (row['run_id'],))
+
+    def record_run(self, jobs, keywords="", location="", carried_over=()):
+        """Enregistre une exécution complète en une fois"""
+        run_id = self.start_run(keywords, location)
+        self.finish_run(run_id, jobs, carried_over=carried_over)
+        return run_id
+
+    def _upsert_jobs(self, jobs, now):
+        """Insère ou met à jour des offres ; retourne celles qui n'existaient pas"""
+        signatures = [_signature(job) for job in jobs]
+        existing = self._existing_signatures("jobs", signatures)
+        self.conn.executemany(
+            """
+            INSERT INTO jobs (signature, source, title, company, url, data, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(signature) DO UPDATE SET
+                source = excluded.source, title = excluded.title, company = excluded.company,
+                url = excluded.url, data = excluded.data, last_seen = excluded.last_seen
+            """,
+            [
+                (sig, job.get('source'), job.get('title'), job.get('company'), job.get('url'),
+                 json.dumps(job, ensure_ascii=False), now, now)
+                for sig, job in zip(signatures, jobs)
+            ]
+        )
+        return [job for sig, job in zip(signatures, jobs) if sig not in existing]
+
+    def _existing_signatures(self, table, signatures):
+        """Signatures déjà présentes dans une table (requêtes par lots)"""
+        existing = set()
+        unique = list(dict.fromkeys(signatures))
+        for i in range(0, len(unique), 500):
+            chunk = unique[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT signature FROM {table} WHERE signature IN ({placeholders})", chunk
+            )
+            existing.update(row['signature'] for row in rows)
+        return existing
+
+    def get_runs(self, status="success", limit=None):
+        """Exécutions de scraping, la plus récente en premier"""
+        query = "SELECT * FROM scrape_runs WHERE status = ? ORDER BY id DESC"
+        params = [status]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(query, params)]
+
+    def get_run_signatures(self, run_id):
+        """Signatures présentes lors d'une exécution (dernier instantané + journal des changements)"""
+        with self._lock:
+            snapshot = self.conn.execute(
+                "SELECT run_id, signatures FROM run_snapshots WHERE run_id <= ? ORDER BY run_id DESC LIMIT 1",
+                (run_id,)
+            ).fetchone()
+            if snapshot is None:
+                return []
+            signatures = dict.fromkeys(json.loads(snapshot['signatures']))
+            rows = self.conn.execute(
+                "SELECT signature, change FROM job_changes WHERE run_id > ? AND run_id <= ? ORDER BY run_id",
+                (snapshot['run_id'], run_id)
+            )
+            for row in rows:
+                if row['change'] == 'added':
+                    signatures[row['signature']] = None
+                else:
+                    signatures.pop(row['signature'], None)
+            return list(signatures)
+
+    def get_run_jobs(self, run_id):
+        """Offres présentes lors d'une exécution"""
+        signatures = self.get_run_signatures(run_id)
+        jobs = {}
+        with self._lock:
+            for i in range(0, len(signatures), 500):
+                chunk = signatures[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT signature, data FROM jobs WHERE signature IN ({placeholders})", chunk
+                )
+                jobs.update((row['signature'], json.loads(row['data'])) for row in rows)
+        return [jobs[sig] for sig in signatures if sig in jobs]
+
+    def get_jobs_at(self, day):
+        """Offres présentes à une date (dernière exécution réussie de ce jour ou d'avant)"""
+        day = day if isinstance(day, str) else day.isoformat()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT MAX(id) AS id FROM scrape_runs WHERE status = 'success' AND substr(started_at, 1, 10) <= ?",
+                (day[:10],)
+            ).fetchone()
+        return self.get_run_jobs(row['id']) if row['id'] is not None else []
+
+    def get_job_presence(self, signature):
+        """
+        Première et dernière exécution où une offre a été vue
+
+        Returns:
+            Dictionnaire {first_seen, last_seen, present} ou None si l'offre est inconnue
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                """
+                SELECT job_changes.run_id, job_changes.change, scrape_runs.started_at FROM job_changes
+                JOIN scrape_runs ON scrape_runs.id = job_changes.run_id
+                WHERE job_changes.signature = ? ORDER BY job_changes.run_id
+                """,
+                (signature,)
+            ).fetchall()
+            job = self.conn.execute(
+                "SELECT first_seen, last_seen FROM jobs WHERE signature = ?", (signature,)
+            ).fetchone()
+            if not rows:
+                # Journal compacté : seules les dates de la table des offres restent
+                return dict(job, present=None) if job else None
+            last = rows[-1]
+            if last['change'] == 'added':
+                last_run = self.conn.execute(
+                    "SELECT started_at FROM scrape_runs WHERE status = 'success' ORDER BY id DESC LIMIT 1"
+                ).fetchone()
+                last_seen, present = last_run['started_at'], True
+            else:
+                before = self.conn.execute(
+                    "SELECT started_at FROM scrape_runs WHERE status = 'success' AND id < ? ORDER BY id DESC LIMIT 1",
+                    (last['run_id'],)
+                ).fetchone()
+                last_seen, present = before['started_at'] if before else None, False
+            first_added = next((r for r in rows if r['change'] == 'added'), rows[0])
+            return {
+                'first_seen': job['first_seen'] if job else first_added['started_at'],
+                'last_seen': last_seen,
+                'present': present
+            }
+
+    def get_latest_jobs(self):
+        """Offres de la dernière exécution réussie"""
+        runs = self.get_runs(limit=1)
+        return self.get_run_jobs(runs[0]['id']) if runs else []
+
+    # ------------------------------------------------------------------
+    # Candidatures
+    # ------------------------------------------------------------------
+
+    def get_applications(self):
+        """Toutes les candidatures, dans l'ordre de création (application['id'] : ligne en base)"""
+        with self._lock:
+            rows = self.conn.execute("SELECT id, data FROM applications ORDER BY id")
+            return [{**json.loads(row['data']), 'id': row['id']} for row in rows]
+
+    def add_application(self, application):
+        """Ajoute une candidature (application['id'] reçoit l'identifiant de sa ligne)"""
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO applications (job_url, status, data) VALUES (?, ?, ?)",
+                (application.get('job_url'), application.get('status'),
+                 json.dumps(application, ensure_ascii=False))
+            )
+            application['id'] = cursor.lastrowid
+
+    def update_application(self, application):
+        """
+        Réécrit une candidature, identifiée par application['id']
+
+        Plusieurs candidatures peuvent partager une URL (vide notamment) : seule la ligne de
+        cette candidature est modifiée.
+        """
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE applications SET status = ?, data = ? WHERE id = ?",
+                (application.get('status'), json.dumps(application, ensure_ascii=False),
+                 application.get('id'))
+            )
+            return cursor.rowcount > 0
+
+    def delete_application(self, application_id):
+        """Supprime une candidature (identifiant de sa ligne)"""
+        with self._lock, self.conn:
+            cursor = self.conn.execute("DELETE FROM applications WHERE id = ?", (application_id,))
+            return cursor.rowcount > 0
+
+    # ------------------------------------------------------------------
+    # Offres suivies (tracker.py)
+    # ------------------------------------------------------------------
+
+    def get_tracked_jobs(self):
+        """Offres suivies, dans l'ordre d'ajout"""
+        with self._lock:
+            rows = self.conn.execute("SELECT data FROM tracked_jobs ORDER BY tracked_at, rowid")
+            return [json.loads(row['data']) for row in rows]
+
+    def add_tracked_jobs(self, jobs):
+        """Ajoute des offres suivies (les doublons sont ignorés)"""
+        now = datetime.now().isoformat()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO tracked_jobs (signature, url, data, tracked_at) VALUES (?, ?, ?, ?)",
+                [(_signature(job), job.get('url'), json.dumps(job, ensure_ascii=False), now) for job in jobs]
+            )
+
+    def delete_tracked_jobs(self, jobs):
+        """Retire des offres suivies"""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "DELETE FROM tracked_jobs WHERE signature = ?", [(_signature(job),) for job in jobs]
+            )
+
+    # ------------------------------------------------------------------
+    # Index des offres déjà vues (seen_index.py)
+    # ------------------------------------------------------------------
+
+    def get_seen_entries(self):
+        """Signatures déjà vues avec leurs dates de première et dernière apparition"""
+        with self._lock:
+            rows = self.conn.execute("SELECT signature, first_seen, last_seen FROM seen_jobs")
+            return {
+                row['signature']: {'first_seen': row['first_seen'], 'last_seen': row['last_seen']}
+                for row in rows
+            }
+
+    def save_seen_entries(self, entries, removed=()):
+        """Enregistre les entrées modifiées et supprime les entrées oubliées"""
+        with self._lock, self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO seen_jobs (signature, first_seen, last_seen) VALUES (?, ?, ?)
+                ON CONFLICT(signature) DO UPDATE SET last_seen = excluded.last_seen
+                """,
+                [(sig, entry['first_seen'], entry['last_seen']) for sig, entry in entries.items()]
+            )
+            self.conn.executemany("DELETE FROM seen_jobs WHERE signature = ?", [(sig,) for sig in removed])
+
+    # ------------------------------------------------------------------
+    # Pages de détail des offres (enrichment.py)
+    # ------------------------------------------------------------------
+
+    def get_job_details(self, signatures):
+        """Détails déjà récupérés : {signature: {full_description, criteria}} (requêtes par lots)"""
+        details = {}
+        unique = list(dict.fromkeys(signatures))
+        with self._lock:
+            for i in range(0, len(unique), 500):
+                chunk = unique[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT signature, full_description, criteria FROM job_details WHERE signature IN ({placeholders})",
+                    chunk
+                )
+                for row in rows:
+                    details[row['signature']] = {
+                        'full_description': row['full_description'] or "",
+                        'criteria': json.loads(row['criteria'])
+                    }
+        return details
+
+    def save_job_details(self, details):
+        """Enregistre des détails récupérés ({signature: {full_description, criteria}})"""
+        now = datetime.now().isoformat()
+        with self._lock, self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO job_details (signature, full_description, criteria, fetched_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(signature) DO NOTHING
+                """,
+                [
+                    (sig, d.get('full_description', ""), json.dumps(d.get('criteria', []), ensure_ascii=False), now)
+                    for sig, d in details.items()
+                ]
+            )
+
+    # ------------------------------------------------------------------
+    # Import des anciens fichiers JSON
+    # ------------------------------------------------------------------
+
+    def _migrate(self):
+        """Met à jour le contenu d'une base créée par une version précédente"""
+        with self._lock, self.conn:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                self._rekey_signatures()
+            if version < SCHEMA_VERSION:
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _rekey_signatures(self):
+        """
+        Réécrit une fois les signatures enregistrées sous forme d'URL brute
+
+        Sans cela, toutes les offres déjà connues seraient vues comme nouvelles (et les
+        anciennes comme disparues) à la première exécution après la mise à jour.
+        """
+        from compare_jobs import rekey_signature
+        renamed = 0
+        for table in ("jobs", "seen_jobs", "tracked_jobs", "job_details", "job_changes"):
+            rows = self.conn.execute(f"SELECT DISTINCT signature FROM {table}").fetchall()
+            mapping = {row['signature']: rekey_signature(row['signature']) for row in rows}
+            mapping = [(new, old) for old, new in mapping.items() if new != old]
+            # Les clés en conflit (même offre sous deux anciennes URL) restent sous l'ancienne
+            # signature après le renommage : leurs dates sont fusionnées puis elles sont supprimées
+            self.conn.executemany(f"UPDATE OR IGNORE {table} SET signature = ? WHERE signature = ?", mapping)
+            if table in ("jobs", "seen_jobs"):
+                self.conn.executemany(
+                    f"""
+                    UPDATE {table} SET
+                        first_seen = MIN(first_seen, COALESCE((SELECT first_seen FROM {table} WHERE signature = ?), first_seen)),
+                        last_seen = MAX(last_seen, COALESCE((SELECT last_seen FROM {table} WHERE signature = ?), last_seen))
+                    WHERE signature = ?
+                    """,
+                    [(old, old, new) for new, old in mapping]
+                )
+            self.conn.executemany(f"DELETE FROM {table} WHERE signature = ?", [(old,) for _, old in mapping])
+            renamed += len(mapping)
+        for row in self.conn.execute("SELECT run_id, signatures FROM run_snapshots").fetchall():
+            signatures = json.loads(row['signatures'])
+            rekeyed = list(dict.fromkeys(rekey_signature(sig) for sig in signatures))
+            if rekeyed != signatures:
+                self.conn.execute(
+                    "UPDATE run_snapshots SET signatures = ? WHERE run_id = ?",
+                    (json.dumps(rekeyed, ensure_ascii=False), row['run_id'])
+                )
+        if renamed:
+            print_info(f"Base {self.db_file}: {renamed} signatures d'offres converties en identifiants d'offre")
+
+    def _import_legacy_files(self):
+        """Reprend les fichiers JSON existants à la création de la base"""
+        imported = []
+        applications_file = os.path.join(config.DATA_DIR, "applications.json")
+        if os.path.exists(applications_file):
+            for application in load_json(applications_file):
+                self.add_application(application)
+            imported.append(applications_file)
+        if os.path.exists(config.TRACKED_JOBS_FILE):
+            self.add_tracked_jobs(load_json(config.TRACKED_JOBS_FILE))
+            imported.append(config.TRACKED_JOBS_FILE)
+        if os.path.exists(config.SEEN_INDEX_FILE):
+            entries = load_json(config.SEEN_INDEX_FILE)
+            if isinstance(entries, dict):
+                self.save_seen_entries(entries)
+                imported.append(config.SEEN_INDEX_FILE)
+        previous_jobs_file = os.path.join(config.DATA_DIR, "jobs_previous.json")
+        for jobs_file in (previous_jobs_file, config.JOBS_FILE):
+            if os.path.exists(jobs_file):
+                self.record_run(load_json(jobs_file))
+                imported.append(jobs_file)
+        if imported:
+            print_info(f"Base {self.db_file} initialisée depuis: {', '.join(imported)}")
+
+
+def get_store():
+    """Base partagée par le processus (ouverte une seule fois)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = JobStore()
+        return _store
+
+
+def carry_over_jobs(jobs, previous_jobs, stopped_sources):
+    """
+    Offres précédentes gardées par une exécution partielle (scraping incrémental)
+
+    Un site dont la pagination s'est arrêtée tôt n'a pas revu toutes ses offres : celles qui
+    manquent ne sont pas considérées comme disparues tant qu'elles ont été scrapées il y a
+    moins de INCREMENTAL_RETENTION_DAYS jours.
+
+    Args:
+        jobs: Offres de l'exécution courante
+        previous_jobs: Offres de la dernière exécution
+        stopped_sources: Sites arrêtés avant la dernière page (SeenIndex.stopped_sources)
+    """
+    if not stopped_sources:
+        return []
+    limit = (datetime.now() - timedelta(days=config.INCREMENTAL_CONFIG["retention_days"])).strftime("%Y-%m-%d %H:%M:%S")
+    current = {_signature(job) for job in jobs}
+    return [
+        job for job in previous_jobs
+        if (job.get('source') or 'LinkedIn') in stopped_sources
+        and job.get('scraped_at', '') >= limit
+        and _signature(job) not in current
+    ]
+
+
+@timed("save_jobs")
+def save_scraped_jobs(jobs, keywords="", location="", stopped_sources=None):
+    """
+    Enregistre le résultat d'une recherche
+
+    En SQLite : une exécution de scraping (upsert des offres par signature) ;
+    sinon : réécriture de config.JOBS_FILE comme auparavant
+
+    Args:
+        stopped_sources: Sites arrêtés tôt en mode incrémental : l'exécution est partielle et
+            leurs offres non revues sont gardées au lieu d'être notées comme disparues
+    """
+    if use_sqlite():
+        store = get_store()
+        carried = carry_over_jobs(jobs, store.get_latest_jobs() if stopped_sources else [], stopped_sources)
+        store.record_run(jobs, keywords, location, carried_over=carried)
+    else:
+        previous_jobs = load_json(config.JOBS_FILE) if stopped_sources and os.path.exists(config.JOBS_FILE) else []
+        carried = carry_over_jobs(jobs, previous_jobs, stopped_sources)
+        save_json(list(jobs) + carried, config.JOBS_FILE)
+    if carried:
+        print_info(f"Exécution partielle: {len(carried)} offres non revues gardées ({', '.join(sorted(stopped_sources))})")
+
+
+def load_current_jobs():
+    """Offres de la dernière recherche"""
+    if use_sqlite():
+        return get_store().get_latest_jobs()
+    return load_json(config.JOBS_FILE) if os.path.exists(config.JOBS_FILE) else []
+
+
+def export_jobs(filename, jobs=None):
+    """Export à la demande des offres (dernière recherche par défaut) en JSON ou CSV"""
+    jobs = load_current_jobs() if jobs is None else jobs
+    if filename.endswith(".csv"):
+        pd.DataFrame(jobs).to_csv(filename, index=False, encoding='utf-8')
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(jobs, f, ensure_ascii=False, indent=2)
+    print_success(f"{len(jobs)} offres exportées dans {filename}")
+    return filename
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export des offres stockées en base")
+    parser.add_argument('output', help="Fichier de sortie (.json ou .csv)")
+    args = parser.parse_args()
+    export_jobs(args.output)
@@ -0,0 +1,35 @@
+"""
+Affichage progressif des lettres de motivation dans les applications Streamlit
+Le callback on_chunk de CoverLetterGenerator.generate_cover_letter peut avoir une méthode
+reset() : elle est appelée avant d'envoyer la lettre de secours quand le LLM échoue en cours
+de route, pour que le début de lettre déjà affiché soit remplacé et non complété.
+"""
+
+
+class LetterStream:
+    """Callback qui affiche la lettre dans un emplacement Streamlit au fil de sa génération"""
+
+    def __init__(self, placeholder):
+        self.placeholder = placeholder
+        self.chunks = []
+
+    def __call__(self, chunk):
+        self.chunks.append(chunk)
+        self.placeholder.markdown("".join(self.chunks))
+
+    def reset(self):
+        """Efface le texte déjà affiché"""
+        self.chunks = []
+        self.placeholder.empty()
+
+
+def letter_stream(placeholder):
+    """Callback on_chunk pour un emplacement Streamlit (st.empty())"""
+    return LetterStream(placeholder)
+
+
+def reset_stream(on_chunk):
+    """Efface ce qu'un callback on_chunk a déjà affiché, s'il le permet"""
+    reset = getattr(on_chunk, 'reset', None)
+    if reset is not None:
+        reset()
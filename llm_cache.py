@@ -0,0 +1,140 @@
+"""
+Cache persistant des réponses des LLM
+Une lettre déjà générée pour la même offre, les mêmes informations personnelles, le même
+fournisseur, le même modèle et les mêmes paramètres est relue au lieu d'être régénérée
+(avec Ollama, une génération peut prendre jusqu'à deux minutes).
+
+Les entrées plus anciennes que la durée de validité sont ignorées puis supprimées ; au-delà
+du nombre maximal d'entrées, les moins récemment lues sont supprimées.
+"""
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from utils import ensure_data_dir, print_info
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    params TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    accessed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses(accessed_at);
+"""
+
+
+def prompt_hash(prompt):
+    """Empreinte SHA-256 d'un prompt"""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+
+def cache_key(provider, model, prompt, params=None):
+    """Clé d'une génération : fournisseur, modèle, empreinte du prompt et paramètres"""
+    payload = json.dumps(
+        [provider, model, prompt_hash(prompt), params or {}], sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """Réponses des LLM en SQLite, avec durée de validité et éviction LRU"""
+
+    def __init__(self, db_file=None, max_entries=None, ttl_days=None):
+        cfg = config.LLM_CACHE_CONFIG
+        self.db_file = db_file or cfg["db_file"]
+        self.max_entries = max_entries if max_entries is not None else cfg["max_entries"]
+        self.ttl = timedelta(days=ttl_days if ttl_days is not None else cfg["ttl_days"])
+        self._lock = threading.Lock()
+
+        ensure_data_dir()
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_file)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, provider, model, prompt, params=None):
+        """Réponse en cache (None si absente ou expirée)"""
+        key = cache_key(provider, model, prompt, params)
+        with self._lock:
+            row = self.conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or datetime.fromisoformat(row['created_at']) < datetime.now() - self.ttl:
+                self.misses += 1
+                return None
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (datetime.now().isoformat(), key)
+                )
+            self.hits += 1
+            return row['response']
+
+    def put(self, provider, model, prompt, response, params=None):
+        """Enregistre une réponse (remplace la précédente pour la même clé)"""
+        if not response:
+            return
+        now = datetime.now().isoformat()
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    """
+                    INSERT OR REPLACE INTO responses
+                        (key, provider, model, prompt_hash, params, response, created_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        cache_key(provider, model, prompt, params), provider, model, prompt_hash(prompt),
+                        json.dumps(params or {}, sort_keys=True), response, now, now
+                    )
+                )
+            self._evict()
+
+    def _evict(self):
+        """Supprime les entrées expirées puis les moins récemment lues au-delà du maximum"""
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", ((datetime.now() - self.ttl).isoformat(),)
+            )
+            self.conn.execute(
+                """
+                DELETE FROM responses WHERE key NOT IN (
+                    SELECT key FROM responses ORDER BY accessed_at DESC LIMIT ?
+                )
+                """,
+                (self.max_entries,)
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM responses")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Cache partagé par le processus, ou None s'il est désactivé"""
+    global _cache
+    if not config.LLM_CACHE_CONFIG["enabled"]:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+            print_info(f"Cache des réponses LLM: {len(_cache)} réponse(s) enregistrée(s)")
+        return _cache
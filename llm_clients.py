@@ -0,0 +1,129 @@
+"""
+Clients LLM partagés par le processus
+Les clients des SDK (OpenAI, Mistral, Anthropic) et la session HTTP vers Ollama sont créés
+une seule fois puis réutilisés : les connexions restent ouvertes d'une lettre à l'autre.
+
+L'état du serveur Ollama est gardé quelques secondes (LLM_HEALTH_TTL) au lieu d'être
+vérifié avant chaque génération, et le modèle est chargé en mémoire dès le démarrage puis
+maintenu chargé (keep_alive) pour que la première lettre ne paie pas son chargement.
+"""
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from utils import print_info, print_warning
+import config
+
+_lock = threading.Lock()
+_session = None
+_clients = {}
+_ollama_health = {}
+_warmed_models = set()
+
+
+def ollama_url(path=""):
+    """URL du serveur Ollama (config.LLM_CLIENT_CONFIG)"""
+    return config.LLM_CLIENT_CONFIG["ollama_url"].rstrip('/') + path
+
+
+def get_ollama_session():
+    """Session HTTP partagée vers Ollama (connexions keep-alive, sans nouvelle tentative automatique)"""
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            pool_size = max(2, config.LLM_CONCURRENCY.get("ollama", 1) + 1)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def ollama_models(refresh=False):
+    """
+    Modèles installés sur le serveur Ollama, résultat réutilisé pendant LLM_HEALTH_TTL secondes
+
+    Returns:
+        Liste des noms de modèles, ou None si Ollama ne répond pas
+    """
+    with _lock:
+        checked = _ollama_health.get('checked_at')
+        if not refresh and checked is not None and time.monotonic() - checked < config.LLM_CLIENT_CONFIG["health_ttl"]:
+            return _ollama_health['models']
+    try:
+        response = get_ollama_session().get(ollama_url("/api/tags"), timeout=1)
+        models = [m.get('name', 'N/A') for m in response.json().get('models', [])] if response.status_code == 200 else None
+    except (requests.RequestException, ValueError):
+        models = None
+    with _lock:
+        _ollama_health.update(checked_at=time.monotonic(), models=models)
+    return models
+
+
+def forget_ollama_health():
+    """Oublie l'état d'Ollama (après une erreur de connexion, la prochaine vérification interroge le serveur)"""
+    with _lock:
+        _ollama_health.clear()
+
+
+def warm_up_ollama(model, background=True):
+    """
+    Charge un modèle en mémoire (requête sans prompt), une seule fois par processus
+
+    Args:
+        background: Si True, le chargement se fait dans un thread (le démarrage n'attend pas)
+    """
+    with _lock:
+        if model in _warmed_models:
+            return
+        _warmed_models.add(model)
+
+    def load():
+        start = time.perf_counter()
+        try:
+            response = get_ollama_session().post(
+                ollama_url("/api/generate"),
+                json={"model": model, "keep_alive": config.LLM_CLIENT_CONFIG["ollama_keep_alive"]},
+                timeout=config.LLM_CLIENT_CONFIG["timeout"]
+            )
+            if response.status_code != 200:
+                raise requests.RequestException(f"statut {response.status_code}")
+            print_info(f"Modèle Ollama {model} chargé en {time.perf_counter() - start:.1f}s")
+        except requests.RequestException as e:
+            print_warning(f"Préchargement du modèle Ollama {model} impossible: {str(e)}")
+            with _lock:
+                _warmed_models.discard(model)
+
+    if background:
+        threading.Thread(target=load, name=f"ollama-warmup-{model}", daemon=True).start()
+    else:
+        load()
+
+
+def _create_client(provider, api_key):
+    timeout = config.LLM_CLIENT_CONFIG["timeout"]
+    if provider == "openai":
+        from openai import OpenAI
+        return OpenAI(api_key=api_key, timeout=timeout)
+    if provider == "mistral":
+        from mistralai import Mistral
+        return Mistral(api_key=api_key, timeout_ms=timeout * 1000)
+    if provider == "claude":
+        from anthropic import Anthropic
+        return Anthropic(api_key=api_key, timeout=timeout)
+    raise ValueError(f"Provider non supporté: {provider}")
+
+
+def get_client(provider, api_key):
+    """
+    Client SDK partagé pour un fournisseur et une clé API ("openai", "mistral", "claude")
+
+    Les clients des SDK sont utilisables depuis plusieurs threads : les lettres générées en
+    parallèle partagent le même pool de connexions.
+    """
+    key = (provider, api_key)
+    with _lock:
+        if key not in _clients:
+            _clients[key] = _create_client(provider, api_key)
+        return _clients[key]
@@ -4,40 +4,75 @@ Supporte : Ollama (local), OpenAI, Mistral, Anthropic Claude
 """
 import os
 import json
-from typing import Optional, Dict, Any
+import time
+import threading
+import requests
+from typing import Optional, Dict, Any, Callable, Iterator
 from utils import print_info, print_error, print_success, print_warning
+from llm_cache import get_llm_cache
+from cv_profile import get_cv_profile
+from prompt_builder import estimate_tokens, select_cv, select_description
+from skill_matcher import get_skill_matcher
+from metrics import count, observe
+from llm_clients import (
+    get_client, get_ollama_session, ollama_url, ollama_models, forget_ollama_health, warm_up_ollama
+)
+import config
 
-def extract_cv_text(cv_path: Optional[str]) -> str:
-    """Extrait le texte d'un CV PDF"""
-    if not cv_path or not os.path.exists(cv_path):
-        return ""
-    
-    try:
-        import PyPDF2
-        
-        cv_text = ""
-        with open(cv_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                cv_text += page.extract_text() + "\n"
-        
-        # Nettoyer le texte
-        cv_text = cv_text.strip()
-        # Limiter à 3000 caractères pour ne pas surcharger le prompt
-        if len(cv_text) > 3000:
-            cv_text = cv_text[:3000] + "..."
-        
-        return cv_text
-    except ImportError:
-        print_warning("PyPDF2 non installé. Installez-le avec: pip install PyPDF2")
-        return ""
-    except Exception as e:
-        print_warning(f"Erreur lors de l'extraction du CV: {str(e)}")
-        return ""
+# Taille minimale d'un préfixe mis en cache par Anthropic (modèles Sonnet et Opus)
+CLAUDE_MIN_CACHE_TOKENS = 1024
+
+_provider_slots = {}
+_provider_slots_lock = threading.Lock()
+
+
+def _provider_slot(provider: str) -> threading.BoundedSemaphore:
+    """Limite les appels simultanés à un fournisseur (config.LLM_CONCURRENCY), tous générateurs confondus"""
+    with _provider_slots_lock:
+        if provider not in _provider_slots:
+            _provider_slots[provider] = threading.BoundedSemaphore(max(1, config.LLM_CONCURRENCY.get(provider, 1)))
+        return _provider_slots[provider]
 
 class LLMGenerator:
     """Générateur utilisant différents LLM pour créer des lettres de motivation"""
     
+    # Paramètres de génération (font partie de la clé du cache)
+    GENERATION_PARAMS = {"temperature": 0.7, "top_p": 0.9, "max_tokens": 1000}
+    # Début du prompt identique pour toutes les lettres : les fournisseurs réutilisent ce préfixe
+    # d'une lettre à l'autre (voir _build_prompt)
+    SYSTEM_PROMPT = """Tu es un expert en rédaction de lettres de motivation professionnelles en français.
+
+Tâche : Rédige une lettre de motivation convaincante, professionnelle et HIGHLY PERSONNALISÉE pour le poste décrit à la fin du message, à partir du profil du candidat.
+
+═══════════════════════════════════════════════════════════════
+INSTRUCTIONS DÉTAILLÉES :
+═══════════════════════════════════════════════════════════════
+1. La lettre doit être en français, professionnelle mais chaleureuse et authentique
+2. Longueur : environ 300-400 mots (pas trop courte, pas trop longue)
+3. PERSONNALISATION MAXIMALE :
+   - Adapte-toi spécifiquement à cette offre et cette entreprise
+   - Utilise des détails précis de l'offre (compétences mentionnées, missions, etc.)
+   - Si le CV est fourni, cite des expériences, projets ou réalisations CONCRÈTES du CV
+   - Mets en avant les compétences du CV demandées par l'offre
+   - Montre que tu as vraiment lu et compris l'offre
+4. Structure de la lettre :
+   - Salutation personnalisée (si le nom du recruteur n'est pas disponible, utilise "Madame, Monsieur")
+   - Paragraphe 1 : Accroche + pourquoi ce poste t'intéresse spécifiquement
+   - Paragraphe 2 : Tes compétences et expériences qui correspondent EXACTEMENT au poste (cite des exemples du CV si disponible)
+   - Paragraphe 3 : Pourquoi cette entreprise t'attire + ce que tu peux apporter
+   - Paragraphe 4 : Conclusion + disponibilité pour un entretien
+   - Formule de politesse
+   - Signature avec coordonnées complètes
+5. Points importants :
+   - Ne pas utiliser de placeholders ou de texte générique
+   - Tout doit être concret, spécifique et personnalisé
+   - Mentionne des compétences techniques précises de l'offre
+   - Si le CV contient des projets pertinents, mentionne-les brièvement
+   - Le ton doit être professionnel mais authentique et enthousiaste
+   - Évite les phrases toutes faites, sois original tout en restant professionnel
+
+Génère UNIQUEMENT la lettre de motivation complète, sans commentaires, sans explications, sans métadonnées. Commence directement par la salutation."""
+    
     def __init__(self, provider: str = "ollama", model: Optional[str] = None):
         """
         Initialise le générateur LLM
@@ -50,6 +85,10 @@ class LLMGenerator:
         self.model = model or self._get_default_model()
         self.api_key = self._load_api_key()
         
+        # Chargement du modèle en arrière-plan : la première lettre n'attend pas son chargement
+        if self.provider == "ollama" and config.LLM_CLIENT_CONFIG["ollama_preload"] and ollama_models() is not None:
+            warm_up_ollama(self.model)
+        
     def _get_default_model(self) -> str:
         """Retourne le modèle par défaut selon le provider"""
         defaults = {
@@ -84,7 +123,12 @@ class LLMGenerator:
         
         return None
     
-    def generate_cover_letter(self, job: Dict[str, Any], personal_info: Dict[str, Any], cv_path: Optional[str] = None) -> str:
+    def concurrency(self) -> int:
+        """Lettres générées en même temps avec ce fournisseur (config.LLM_CONCURRENCY)"""
+        return config.LLM_CONCURRENCY.get(self.provider, 1)
+    
+    def generate_cover_letter(self, job: Dict[str, Any], personal_info: Dict[str, Any], cv_path: Optional[str] = None,
+                              regenerate: bool = False, on_chunk: Optional[Callable[[str], None]] = None) -> str:
         """
         Génère une lettre de motivation personnalisée avec un LLM
         
@@ -92,13 +136,99 @@ class LLMGenerator:
             job: Dictionnaire avec les informations de l'offre (title, company, description, etc.)
             personal_info: Dictionnaire avec les informations personnelles (name, email, intro, experience, skills)
             cv_path: Chemin vers le CV PDF (optionnel, pour extraire le contenu)
+            regenerate: Si True, ignore la lettre en cache et en génère une nouvelle
+            on_chunk: Fonction appelée avec chaque morceau de texte dès qu'il est généré (streaming)
         
         Returns:
             Lettre de motivation générée
         """
+        if on_chunk is not None:
+            chunks = []
+            for chunk in self.stream_cover_letter(job, personal_info, cv_path, regenerate):
+                chunks.append(chunk)
+                on_chunk(chunk)
+            return self._clean_letter("".join(chunks))
+        
         prompt = self._build_prompt(job, personal_info, cv_path)
         
+        if not regenerate:
+            letter = self.cached_letter(prompt)
+            if letter is not None:
+                return letter
+        
         try:
+            letter = self.generate(prompt)
+        except Exception as e:
+            print_error(f"Erreur lors de la génération avec {self.provider}: {str(e)}")
+            # Fallback vers template simple si le LLM échoue (jamais mis en cache)
+            return self._generate_fallback_letter(job, personal_info)
+        
+        self.cache_letter(prompt, letter)
+        return letter
+    
+    def stream_cover_letter(self, job: Dict[str, Any], personal_info: Dict[str, Any], cv_path: Optional[str] = None,
+                            regenerate: bool = False) -> Iterator[str]:
+        """
+        Génère une lettre de motivation morceau par morceau, au fil de la génération
+        
+        Le premier morceau arrive dès le premier token au lieu d'attendre la lettre complète.
+        Une lettre en cache est renvoyée en un seul morceau. Si le LLM échoue avant le premier
+        morceau, la lettre de secours est renvoyée ; s'il échoue en cours de route, l'exception
+        est propagée (le début de lettre déjà affiché serait incohérent avec un autre texte).
+        
+        Yields:
+            Morceaux de texte, dont la concaténation est la lettre
+        """
+        prompt = self._build_prompt(job, personal_info, cv_path)
+        
+        if not regenerate:
+            letter = self.cached_letter(prompt)
+            if letter is not None:
+                yield letter
+                return
+        
+        chunks = []
+        try:
+            for chunk in self.stream(prompt):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            print_error(f"Erreur lors de la génération avec {self.provider}: {str(e)}")
+            if chunks:
+                raise
+            yield self._generate_fallback_letter(job, personal_info)
+            return
+        
+        letter = self._clean_letter("".join(chunks))
+        print_success(f"Lettre générée avec {self.provider} (streaming)")
+        self.cache_letter(prompt, letter)
+    
+    def cached_letter(self, prompt: Dict[str, str]) -> Optional[str]:
+        """Lettre déjà générée par ce fournisseur et ce modèle pour ce prompt (None si absente)"""
+        cache = get_llm_cache()
+        if cache is None:
+            return None
+        letter = cache.get(self.provider, self.model, self._prompt_text(prompt), self.GENERATION_PARAMS)
+        if letter is not None:
+            print_success(f"Lettre relue depuis le cache ({self.provider}, modèle: {self.model})")
+        return letter
+    
+    def cache_letter(self, prompt: Dict[str, str], letter: str):
+        """Met une lettre générée en cache"""
+        cache = get_llm_cache()
+        if cache is not None and letter:
+            cache.put(self.provider, self.model, self._prompt_text(prompt), letter, self.GENERATION_PARAMS)
+    
+    def generate(self, prompt: Dict[str, str], on_start: Optional[Callable[[], None]] = None) -> str:
+        """
+        Génère la lettre d'un prompt (lève une exception si le fournisseur échoue)
+
+        on_start est appelé une fois la place obtenue auprès du fournisseur (LLM_CONCURRENCY),
+        juste avant la requête : l'attente de la place n'est pas comptée dans sa latence.
+        """
+        with _provider_slot(self.provider):
+            if on_start is not None:
+                on_start()
             if self.provider == "ollama":
                 return self._generate_with_ollama(prompt)
             elif self.provider == "openai":
@@ -107,19 +237,62 @@ class LLMGenerator:
                 return self._generate_with_mistral(prompt)
             elif self.provider == "claude":
                 return self._generate_with_claude(prompt)
-            else:
-                raise ValueError(f"Provider non supporté: {self.provider}")
-        except Exception as e:
-            print_error(f"Erreur lors de la génération avec {self.provider}: {str(e)}")
-            # Fallback vers template simple si le LLM échoue
-            return self._generate_fallback_letter(job, personal_info)
+            raise ValueError(f"Provider non supporté: {self.provider}")
+    
+    def stream(self, prompt: Dict[str, str], on_start: Optional[Callable[[], None]] = None) -> Iterator[str]:
+        """Génère la lettre d'un prompt morceau par morceau (lève une exception si le fournisseur échoue, on_start comme generate)"""
+        streams = {
+            "ollama": self._stream_with_ollama,
+            "openai": self._stream_with_openai,
+            "mistral": self._stream_with_mistral,
+            "claude": self._stream_with_claude
+        }
+        if self.provider not in streams:
+            raise ValueError(f"Provider non supporté: {self.provider}")
+        with _provider_slot(self.provider):
+            if on_start is not None:
+                on_start()
+            start = time.perf_counter()
+            first = True
+            for chunk in streams[self.provider](prompt):
+                if chunk:
+                    if first:
+                        # Délai avant le premier token : baisse quand le début du prompt est en cache
+                        observe("llm_first_token", time.perf_counter() - start, provider=self.provider)
+                        first = False
+                    yield chunk
+    
+    @staticmethod
+    def _clean_letter(letter: str) -> str:
+        """Nettoie la réponse du LLM (markdown, titre "Lettre..." en première ligne)"""
+        letter = letter.replace('```', '').strip()
+        if letter.startswith('Lettre'):
+            # Enlever les préfixes possibles
+            lines = letter.split('\n')
+            letter = '\n'.join(lines[1:]) if len(lines) > 1 else letter
+        return letter
     
-    def _build_prompt(self, job: Dict[str, Any], personal_info: Dict[str, Any], cv_path: Optional[str] = None) -> str:
-        """Construit le prompt pour le LLM avec le contenu du CV"""
+    def _build_prompt(self, job: Dict[str, Any], personal_info: Dict[str, Any],
+                      cv_path: Optional[str] = None) -> Dict[str, str]:
+        """
+        Construit le prompt pour le LLM avec le contenu du CV
+        
+        Le prompt est découpé du plus stable au plus variable : consignes (SYSTEM_PROMPT,
+        identiques pour toutes les lettres), profil du candidat (identique pour toutes les
+        lettres d'un même candidat), puis l'offre. Les fournisseurs qui mettent en cache le début
+        des prompts ne traitent ainsi que la partie propre à l'offre à partir de la deuxième lettre.
+        
+        Seuls les passages de l'offre qui concernent les compétences demandées sont gardés, dans
+        la limite de config.PROMPT_CONFIG (voir prompt_builder.py).
+        
+        Returns:
+            Dictionnaire {'system', 'profile', 'job'}
+        """
         job_title = job.get('title', 'ce poste')
         company = job.get('company', 'cette entreprise')
         location = job.get('location', '')
-        description = job.get('description', '')[:2000]  # Augmenté pour plus de contexte
+        job_skills = get_skill_matcher().match_job(job)
+        description = select_description(job, job_skills)
         
         name = personal_info.get('name', 'le candidat')
         email = personal_info.get('email', '')
@@ -129,37 +302,27 @@ class LLMGenerator:
         experience = personal_info.get('experience', '')
         skills = ", ".join(personal_info.get('skills', []))
         
-        # Extraire le contenu du CV si disponible
+        # Extraits du CV choisis selon les compétences du CV (et non de l'offre) : le profil
+        # reste identique d'une offre à l'autre
         cv_content = ""
-        if cv_path:
-            cv_content = extract_cv_text(cv_path)
-            if cv_content:
-                print_info("✅ Contenu du CV extrait et inclus dans la génération")
+        matching = []
+        profile = get_cv_profile(cv_path)
+        if profile:
+            cv_content = select_cv(profile, profile.skills)
+            matching = profile.matching_skills(job)
+            print_info("✅ Contenu du CV extrait et inclus dans la génération")
         
         # Construire le prompt avec le CV
         cv_section = ""
         if cv_content:
             cv_section = f"""
-CONTENU DU CV DU CANDIDAT :
+EXTRAITS DU CV DU CANDIDAT :
 {cv_content}
 
 IMPORTANT : Utilise les informations précises du CV ci-dessus pour personnaliser la lettre. Mentionne des expériences, projets ou compétences spécifiques du CV qui correspondent au poste.
 """
         
-        prompt = f"""Tu es un expert en rédaction de lettres de motivation professionnelles en français.
-
-Tâche : Rédige une lettre de motivation convaincante, professionnelle et HIGHLY PERSONNALISÉE pour le poste suivant.
-
-═══════════════════════════════════════════════════════════════
-INFORMATIONS SUR LE POSTE :
-═══════════════════════════════════════════════════════════════
-- Titre du poste : {job_title}
-- Entreprise : {company}
-- Localisation : {location}
-- Description complète de l'offre :
-{description}
-
-═══════════════════════════════════════════════════════════════
+        candidate = f"""═══════════════════════════════════════════════════════════════
 INFORMATIONS SUR LE CANDIDAT :
 ═══════════════════════════════════════════════════════════════
 - Nom : {name}
@@ -169,116 +332,139 @@ INFORMATIONS SUR LE CANDIDAT :
 - Introduction personnelle : {intro}
 - Expérience mentionnée : {experience}
 - Compétences listées : {skills}
-{cv_section}
-═══════════════════════════════════════════════════════════════
-INSTRUCTIONS DÉTAILLÉES :
+{cv_section}"""
+        
+        matching_line = f"\n- Compétences du CV demandées par l'offre : {', '.join(matching)}" if matching else ""
+        job_part = f"""═══════════════════════════════════════════════════════════════
+INFORMATIONS SUR LE POSTE :
 ═══════════════════════════════════════════════════════════════
-1. La lettre doit être en français, professionnelle mais chaleureuse et authentique
-2. Longueur : environ 300-400 mots (pas trop courte, pas trop longue)
-3. PERSONNALISATION MAXIMALE :
-   - Adapte-toi spécifiquement à cette offre et cette entreprise
-   - Utilise des détails précis de l'offre (compétences mentionnées, missions, etc.)
-   - Si le CV est fourni, cite des expériences, projets ou réalisations CONCRÈTES du CV
-   - Montre que tu as vraiment lu et compris l'offre
-4. Structure de la lettre :
-   - Salutation personnalisée (si le nom du recruteur n'est pas disponible, utilise "Madame, Monsieur")
-   - Paragraphe 1 : Accroche + pourquoi ce poste t'intéresse spécifiquement
-   - Paragraphe 2 : Tes compétences et expériences qui correspondent EXACTEMENT au poste (cite des exemples du CV si disponible)
-   - Paragraphe 3 : Pourquoi cette entreprise t'attire + ce que tu peux apporter
-   - Paragraphe 4 : Conclusion + disponibilité pour un entretien
-   - Formule de politesse
-   - Signature avec coordonnées complètes
-5. Points importants :
-   - Ne pas utiliser de placeholders ou de texte générique
-   - Tout doit être concret, spécifique et personnalisé
-   - Mentionne des compétences techniques précises de l'offre
-   - Si le CV contient des projets pertinents, mentionne-les brièvement
-   - Le ton doit être professionnel mais authentique et enthousiaste
-   - Évite les phrases toutes faites, sois original tout en restant professionnel
-
-Génère UNIQUEMENT la lettre de motivation complète, sans commentaires, sans explications, sans métadonnées. Commence directement par la salutation."""
+- Titre du poste : {job_title}
+- Entreprise : {company}
+- Localisation : {location}{matching_line}
+- Description de l'offre :
+{description}
 
+Rédige maintenant la lettre de motivation pour ce poste."""
+        
+        prompt = {'system': self.SYSTEM_PROMPT, 'profile': candidate, 'job': job_part}
+        prefix_tokens = estimate_tokens(prompt['system']) + estimate_tokens(candidate)
+        tokens = prefix_tokens + estimate_tokens(job_part)
+        print_info(
+            f"Prompt: ~{tokens} tokens (consignes et profil ~{prefix_tokens}, "
+            f"offre ~{estimate_tokens(job_part)}, {len(job_skills)} compétence(s) de l'offre)"
+        )
+        count("prompt_tokens", tokens, provider=self.provider)
         return prompt
     
-    def _generate_with_ollama(self, prompt: str) -> str:
+    @staticmethod
+    def _prompt_text(prompt: Dict[str, str]) -> str:
+        """Prompt complet en un seul texte (clé du cache des réponses)"""
+        return "\n\n".join([prompt['system'], prompt['profile'], prompt['job']])
+    
+    @staticmethod
+    def _user_message(prompt: Dict[str, str]) -> str:
+        """Message utilisateur : profil puis offre"""
+        return f"{prompt['profile']}\n{prompt['job']}"
+    
+    def _chat_messages(self, prompt: Dict[str, str]) -> list:
+        """Messages OpenAI / Mistral (le préfixe commun est le message système puis le profil)"""
+        return [
+            {"role": "system", "content": prompt['system']},
+            {"role": "user", "content": self._user_message(prompt)}
+        ]
+    
+    @staticmethod
+    def _claude_messages(prompt: Dict[str, str]) -> list:
+        """
+        Message Claude : le profil est marqué comme point de cache (consignes et profil mis en cache)
+
+        Anthropic ne met pas en cache un préfixe de moins de CLAUDE_MIN_CACHE_TOKENS tokens
+        (2048 pour les modèles Haiku) : sans CV, les consignes seules (~600 tokens) n'y suffisent
+        pas et le point de cache n'est pas posé.
+        """
+        profile = {"type": "text", "text": prompt['profile']}
+        if estimate_tokens(prompt['system']) + estimate_tokens(prompt['profile']) >= CLAUDE_MIN_CACHE_TOKENS:
+            profile["cache_control"] = {"type": "ephemeral"}
+        return [{
+            "role": "user",
+            "content": [profile, {"type": "text", "text": prompt['job']}]
+        }]
+    
+    def _generate_with_ollama(self, prompt: Dict[str, str]) -> str:
         """Génère avec Ollama (local, gratuit)"""
         try:
-            import requests
-            
             print_info(f"Génération avec Ollama (modèle: {self.model})...")
             
-            # Vérifier que Ollama est disponible
-            try:
-                response = requests.get("http://localhost:11434/api/tags", timeout=2)
-                if response.status_code != 200:
-                    raise Exception("Ollama n'est pas accessible")
-            except:
-                raise Exception(
-                    "Ollama n'est pas accessible. "
-                    "Installez Ollama depuis https://ollama.ai et lancez-le, "
-                    f"puis téléchargez un modèle avec: ollama pull {self.model}"
-                )
+            # Vérifier que Ollama est disponible (état gardé quelques secondes, voir llm_clients.py)
+            self._check_ollama()
             
             # Générer la lettre
-            response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.7,
-                        "top_p": 0.9,
-                        "max_tokens": 1000
-                    }
-                },
-                timeout=120
+            response = get_ollama_session().post(
+                ollama_url("/api/generate"),
+                json=self._ollama_payload(prompt, stream=False),
+                timeout=config.LLM_CLIENT_CONFIG["timeout"]
             )
             
             if response.status_code == 200:
                 result = response.json()
-                letter = result.get('response', '').strip()
                 
                 # Nettoyer la réponse (enlever les markdown si présent)
-                letter = letter.replace('```', '').strip()
-                if letter.startswith('Lettre'):
-                    # Enlever les préfixes possibles
-                    lines = letter.split('\n')
-                    letter = '\n'.join(lines[1:]) if len(lines) > 1 else letter
+                letter = self._clean_letter(result.get('response', ''))
                 
                 print_success("Lettre générée avec Ollama")
                 return letter
             else:
                 raise Exception(f"Erreur Ollama: {response.status_code}")
                 
-        except ImportError:
-            raise Exception("Le package 'requests' est requis pour Ollama. Installez-le avec: pip install requests")
+        except requests.ConnectionError as e:
+            forget_ollama_health()
+            raise Exception(f"Erreur avec Ollama: {str(e)}")
         except Exception as e:
             raise Exception(f"Erreur avec Ollama: {str(e)}")
     
-    def _generate_with_openai(self, prompt: str) -> str:
+    def _ollama_payload(self, prompt: Dict[str, str], stream: bool) -> Dict[str, Any]:
+        """
+        Requête /api/generate (keep_alive : le modèle reste chargé entre deux lettres)
+        
+        Tant que le modèle reste chargé, Ollama réutilise les tokens déjà traités au début du
+        prompt précédent : seule la partie propre à l'offre est recalculée.
+        """
+        return {
+            "model": self.model,
+            "system": prompt['system'],
+            "prompt": self._user_message(prompt),
+            "stream": stream,
+            "keep_alive": config.LLM_CLIENT_CONFIG["ollama_keep_alive"],
+            "options": {
+                "temperature": self.GENERATION_PARAMS["temperature"],
+                "top_p": self.GENERATION_PARAMS["top_p"],
+                "max_tokens": self.GENERATION_PARAMS["max_tokens"]
+            }
+        }
+    
+    def _check_ollama(self):
+        """Lève une exception si le serveur Ollama ne répond pas"""
+        if ollama_models() is None:
+            raise Exception(
+                "Ollama n'est pas accessible. "
+                "Installez Ollama depuis https://ollama.ai et lancez-le, "
+                f"puis téléchargez un modèle avec: ollama pull {self.model}"
+            )
+    
+    def _generate_with_openai(self, prompt: Dict[str, str]) -> str:
         """Génère avec OpenAI API"""
         try:
-            from openai import OpenAI
-            
-            if not self.api_key:
-                raise Exception(
-                    "Clé API OpenAI manquante. "
-                    "Ajoutez OPENAI_API_KEY dans votre fichier .env ou variables d'environnement"
-                )
+            self._require_api_key("OpenAI", "OPENAI_API_KEY")
             
             print_info(f"Génération avec OpenAI (modèle: {self.model})...")
             
-            client = OpenAI(api_key=self.api_key)
+            client = get_client("openai", self.api_key)
             
             response = client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "Tu es un expert en rédaction de lettres de motivation professionnelles en français."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000
+                messages=self._chat_messages(prompt),
+                temperature=self.GENERATION_PARAMS["temperature"],
+                max_tokens=self.GENERATION_PARAMS["max_tokens"]
             )
             
             letter = response.choices[0].message.content.strip()
@@ -290,29 +476,20 @@ Génère UNIQUEMENT la lettre de motivation complète, sans commentaires, sans e
         except Exception as e:
             raise Exception(f"Erreur avec OpenAI: {str(e)}")
     
-    def _generate_with_mistral(self, prompt: str) -> str:
+    def _generate_with_mistral(self, prompt: Dict[str, str]) -> str:
         """Génère avec Mistral AI API"""
         try:
-            from mistralai import Mistral
-            
-            if not self.api_key:
-                raise Exception(
-                    "Clé API Mistral manquante. "
-                    "Ajoutez MISTRAL_API_KEY dans votre fichier .env ou variables d'environnement"
-                )
+            self._require_api_key("Mistral", "MISTRAL_API_KEY")
             
             print_info(f"Génération avec Mistral (modèle: {self.model})...")
             
-            client = Mistral(api_key=self.api_key)
+            client = get_client("mistral", self.api_key)
             
             response = client.chat.complete(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "Tu es un expert en rédaction de lettres de motivation professionnelles en français."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000
+                messages=self._chat_messages(prompt),
+                temperature=self.GENERATION_PARAMS["temperature"],
+                max_tokens=self.GENERATION_PARAMS["max_tokens"]
             )
             
             letter = response.choices[0].message.content.strip()
@@ -324,28 +501,21 @@ Génère UNIQUEMENT la lettre de motivation complète, sans commentaires, sans e
         except Exception as e:
             raise Exception(f"Erreur avec Mistral: {str(e)}")
     
-    def _generate_with_claude(self, prompt: str) -> str:
+    def _generate_with_claude(self, prompt: Dict[str, str]) -> str:
         """Génère avec Anthropic Claude API"""
         try:
-            from anthropic import Anthropic
-            
-            if not self.api_key:
-                raise Exception(
-                    "Clé API Anthropic manquante. "
-                    "Ajoutez ANTHROPIC_API_KEY dans votre fichier .env ou variables d'environnement"
-                )
+            self._require_api_key("Anthropic", "ANTHROPIC_API_KEY")
             
             print_info(f"Génération avec Claude (modèle: {self.model})...")
             
-            client = Anthropic(api_key=self.api_key)
+            client = get_client("claude", self.api_key)
             
             response = client.messages.create(
                 model=self.model,
-                max_tokens=1000,
-                temperature=0.7,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+                max_tokens=self.GENERATION_PARAMS["max_tokens"],
+                temperature=self.GENERATION_PARAMS["temperature"],
+                system=prompt['system'],
+                messages=self._claude_messages(prompt)
             )
             
             letter = response.content[0].text.strip()
@@ -357,6 +527,85 @@ Génère UNIQUEMENT la lettre de motivation complète, sans commentaires, sans e
         except Exception as e:
             raise Exception(f"Erreur avec Claude: {str(e)}")
     
+    def _require_api_key(self, label: str, env_name: str):
+        """Lève une exception si la clé API du fournisseur est absente"""
+        if not self.api_key:
+            raise Exception(
+                f"Clé API {label} manquante. "
+                f"Ajoutez {env_name} dans votre fichier .env ou variables d'environnement"
+            )
+    
+    def _stream_with_ollama(self, prompt: Dict[str, str]) -> Iterator[str]:
+        """Génère avec Ollama, token par token (réponse en JSON lines)"""
+        self._check_ollama()
+        print_info(f"Génération avec Ollama en streaming (modèle: {self.model})...")
+        try:
+            response = get_ollama_session().post(
+                ollama_url("/api/generate"),
+                json=self._ollama_payload(prompt, stream=True),
+                stream=True,
+                timeout=config.LLM_CLIENT_CONFIG["timeout"]
+            )
+        except requests.ConnectionError:
+            forget_ollama_health()
+            raise
+        with response:
+            if response.status_code != 200:
+                raise Exception(f"Erreur Ollama: {response.status_code}")
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                if data.get('error'):
+                    raise Exception(f"Erreur Ollama: {data['error']}")
+                yield data.get('response', '')
+                if data.get('done'):
+                    break
+    
+    def _stream_with_openai(self, prompt: Dict[str, str]) -> Iterator[str]:
+        """Génère avec OpenAI API en streaming"""
+        self._require_api_key("OpenAI", "OPENAI_API_KEY")
+        print_info(f"Génération avec OpenAI en streaming (modèle: {self.model})...")
+        stream = get_client("openai", self.api_key).chat.completions.create(
+            model=self.model,
+            messages=self._chat_messages(prompt),
+            temperature=self.GENERATION_PARAMS["temperature"],
+            max_tokens=self.GENERATION_PARAMS["max_tokens"],
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    def _stream_with_mistral(self, prompt: Dict[str, str]) -> Iterator[str]:
+        """Génère avec Mistral AI API en streaming"""
+        self._require_api_key("Mistral", "MISTRAL_API_KEY")
+        print_info(f"Génération avec Mistral en streaming (modèle: {self.model})...")
+        stream = get_client("mistral", self.api_key).chat.stream(
+            model=self.model,
+            messages=self._chat_messages(prompt),
+            temperature=self.GENERATION_PARAMS["temperature"],
+            max_tokens=self.GENERATION_PARAMS["max_tokens"]
+        )
+        for event in stream:
+            choices = event.data.choices
+            if choices and choices[0].delta.content:
+                yield choices[0].delta.content
+    
+    def _stream_with_claude(self, prompt: Dict[str, str]) -> Iterator[str]:
+        """Génère avec Anthropic Claude API en streaming"""
+        self._require_api_key("Anthropic", "ANTHROPIC_API_KEY")
+        print_info(f"Génération avec Claude en streaming (modèle: {self.model})...")
+        with get_client("claude", self.api_key).messages.stream(
+            model=self.model,
+            max_tokens=self.GENERATION_PARAMS["max_tokens"],
+            temperature=self.GENERATION_PARAMS["temperature"],
+            system=prompt['system'],
+            messages=self._claude_messages(prompt)
+        ) as stream:
+            for text in stream.text_stream:
+                yield text
+    
     def _generate_fallback_letter(self, job: Dict[str, Any], personal_info: Dict[str, Any]) -> str:
         """Génère une lettre basique en cas d'échec du LLM"""
         print_warning("Utilisation d'un template de secours")
@@ -376,11 +625,11 @@ Génère UNIQUEMENT la lettre de motivation complète, sans commentaires, sans e
 
 Je me permets de vous adresser ma candidature pour le poste de {job.get('title', 'ce poste')} au sein de {job.get('company', 'votre entreprise')}.
 
-{personal_info.get('intro', 'Passionné par la data et l\'analyse, je suis convaincu que mon profil correspond à vos attentes.')}
+{personal_info.get('intro', "Passionné par la data et l'analyse, je suis convaincu que mon profil correspond à vos attentes.")}
 
 Mon parcours m'a permis de développer des compétences solides en {', '.join(personal_info.get('skills', [])[:3])}, ce qui correspond aux exigences de votre offre.
 
-{personal_info.get('experience', 'J\'ai une expérience significative dans le domaine de la data.')}
+{personal_info.get('experience', "J'ai une expérience significative dans le domaine de la data.")}
 
 Je serais ravi de pouvoir discuter avec vous de la manière dont mon profil pourrait contribuer à vos projets.
 
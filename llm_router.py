@@ -0,0 +1,268 @@
+"""
+Routage des lettres de motivation entre plusieurs fournisseurs LLM
+Le routeur mesure la latence et le taux d'erreur récents de chaque fournisseur et modèle
+(fenêtre glissante partagée par le processus, sans l'attente d'une place LLM_CONCURRENCY) et envoie chaque lettre au plus rapide des fournisseurs
+en bonne santé ; en cas d'erreur, le suivant prend le relais avant de recourir à la lettre de
+secours.
+
+Avec LLM_HEDGE=true, une génération qui n'a pas répondu au bout du p90 de latence de son
+fournisseur est doublée vers le fournisseur suivant : la première lettre reçue est gardée.
+Un Ollama local chargé ou une API distante qui ralentit ne bloquent ainsi pas les lettres.
+"""
+import time
+import queue
+import threading
+from collections import deque
+from typing import Optional, Dict, Any, Callable, List
+from utils import print_info, print_error, print_success, print_warning
+from llm_generator import LLMGenerator
+from llm_clients import ollama_models
+from metrics import count, observe
+import config
+
+# Mesures nécessaires avant d'utiliser le p90 ou d'écarter un fournisseur
+MIN_SAMPLES = 5
+
+
+class ProviderStats:
+    """Latences et erreurs des dernières générations d'un fournisseur et d'un modèle"""
+
+    def __init__(self, window=None):
+        window = window or config.LLM_ROUTER_CONFIG["window"]
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.last_failure = None
+
+    def record(self, seconds, ok):
+        self.outcomes.append(ok)
+        if ok:
+            self.latencies.append(seconds)
+        else:
+            self.last_failure = time.monotonic()
+
+    @property
+    def error_rate(self):
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def percentile(self, q):
+        """Latence au quantile q (None sans mesure)"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def healthy(self):
+        """Faux si le taux d'erreur est trop élevé, jusqu'à la fin du délai de carence"""
+        if len(self.outcomes) < MIN_SAMPLES or self.error_rate <= config.LLM_ROUTER_CONFIG["max_error_rate"]:
+            return True
+        return time.monotonic() - self.last_failure >= config.LLM_ROUTER_CONFIG["cooldown"]
+
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def record_generation(provider, model, seconds, ok):
+    """Enregistre le résultat d'une génération (statistiques du routeur et mesures de l'exécution)"""
+    with _stats_lock:
+        _stats.setdefault((provider, model), ProviderStats()).record(seconds, ok)
+    observe("llm_generation", seconds, error=not ok, provider=provider, model=model)
+
+
+def provider_stats(provider, model):
+    """Copie des statistiques d'un fournisseur et d'un modèle : {'calls', 'error_rate', 'p50', 'p90', 'healthy'}"""
+    with _stats_lock:
+        stats = _stats.get((provider, model)) or ProviderStats()
+        return {
+            'calls': len(stats.outcomes),
+            'error_rate': stats.error_rate,
+            'p50': stats.percentile(0.5),
+            'p90': stats.percentile(0.9),
+            'healthy': stats.healthy()
+        }
+
+
+class LLMRouter:
+    """Plusieurs fournisseurs LLM derrière l'interface de LLMGenerator"""
+
+    def __init__(self, providers: List[str], hedge: Optional[bool] = None):
+        """
+        Args:
+            providers: Fournisseurs par ordre de préférence, "fournisseur" ou "fournisseur:modèle"
+            hedge: Doubler les requêtes lentes (par défaut : LLM_HEDGE)
+        """
+        self.hedge = config.LLM_ROUTER_CONFIG["hedge"] if hedge is None else hedge
+        self.generators = []
+        for spec in providers:
+            provider, _, model = spec.partition(':')
+            generator = LLMGenerator(provider=provider.strip(), model=model.strip() or None)
+            if generator.provider != "ollama" and not generator.api_key:
+                print_warning(f"Clé API manquante pour {generator.provider}: fournisseur ignoré par le routeur")
+                continue
+            self.generators.append(generator)
+        if not self.generators:
+            raise ValueError("Aucun fournisseur LLM utilisable")
+        self.provider = "+".join(g.provider for g in self.generators)
+        self.model = ", ".join(g.model for g in self.generators)
+
+    def concurrency(self) -> int:
+        """Lettres générées en même temps : somme des limites des fournisseurs"""
+        return sum(g.concurrency() for g in self.generators)
+
+    def ranked(self) -> List[LLMGenerator]:
+        """
+        Fournisseurs du plus rapide au plus lent (latence médiane), ceux en mauvaise santé en dernier
+
+        Un fournisseur encore jamais utilisé passe en premier (dans l'ordre de configuration)
+        pour que sa latence soit mesurée ; un fournisseur qui n'a encore qu'échoué passe après
+        ceux dont la latence est connue.
+        """
+        def key(item):
+            index, generator = item
+            stats = provider_stats(generator.provider, generator.model)
+            healthy = stats['healthy']
+            if generator.provider == "ollama" and ollama_models() is None:
+                healthy = False
+            if stats['calls'] == 0:
+                measured = 0
+            elif stats['p50'] is not None:
+                measured = 1
+            else:
+                measured = 2
+            return not healthy, measured, stats['p50'] or 0.0, index
+
+        return [g for _, g in sorted(enumerate(self.generators), key=key)]
+
+    def _hedge_delay(self, generator: LLMGenerator) -> float:
+        """Délai avant de doubler une requête : p90 du fournisseur (valeur configurée sans mesures suffisantes)"""
+        stats = provider_stats(generator.provider, generator.model)
+        if stats['calls'] >= MIN_SAMPLES and stats['p90'] is not None:
+            return stats['p90']
+        return config.LLM_ROUTER_CONFIG["hedge_delay"]
+
+    def generate_cover_letter(self, job: Dict[str, Any], personal_info: Dict[str, Any], cv_path: Optional[str] = None,
+                              regenerate: bool = False, on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """Même interface que LLMGenerator.generate_cover_letter"""
+        # Le prompt ne dépend pas du fournisseur : il est construit une seule fois
+        prompt = self.generators[0]._build_prompt(job, personal_info, cv_path)
+
+        if not regenerate:
+            for generator in self.generators:
+                letter = generator.cached_letter(prompt)
+                if letter is not None:
+                    if on_chunk is not None:
+                        on_chunk(letter)
+                    return letter
+
+        ranked = self.ranked()
+        if on_chunk is not None:
+            letter = self._stream(ranked, prompt, on_chunk)
+        else:
+            letter = self._generate(ranked, prompt)
+        if letter is not None:
+            return letter
+
+        # Tous les fournisseurs ont échoué
+        letter = ranked[0]._generate_fallback_letter(job, personal_info)
+        if on_chunk is not None:
+            on_chunk(letter)
+        return letter
+
+    @staticmethod
+    def _clock():
+        """Heure de début d'une requête, notée par on_start une fois la place du fournisseur obtenue"""
+        started = []
+        return started, lambda: started.append(time.perf_counter())
+
+    @staticmethod
+    def _record(generator: LLMGenerator, started: List[float], ok: bool):
+        now = time.perf_counter()
+        record_generation(generator.provider, generator.model, now - (started[0] if started else now), ok)
+
+    def _attempt(self, generator: LLMGenerator, prompt: Dict[str, str]) -> str:
+        """Une génération avec un fournisseur, mesurée et mise en cache"""
+        started, on_start = self._clock()
+        try:
+            letter = generator.generate(prompt, on_start=on_start)
+        except Exception:
+            self._record(generator, started, False)
+            raise
+        self._record(generator, started, True)
+        generator.cache_letter(prompt, letter)
+        return letter
+
+    def _generate(self, ranked: List[LLMGenerator], prompt: Dict[str, str]) -> Optional[str]:
+        """
+        Génère avec le premier fournisseur, le suivant en cas d'erreur (ou de lenteur avec hedge)
+
+        Returns:
+            La première lettre reçue, ou None si tous les fournisseurs ont échoué
+        """
+        results = queue.Queue()
+        pending = list(ranked)
+        running = 0
+        deadline = None
+
+        def run(generator):
+            try:
+                results.put((generator, self._attempt(generator, prompt), None))
+            except Exception as e:
+                results.put((generator, None, e))
+
+        def launch():
+            nonlocal running, deadline
+            generator = pending.pop(0)
+            running += 1
+            deadline = time.monotonic() + self._hedge_delay(generator)
+            threading.Thread(target=run, args=(generator,), name=f"llm-{generator.provider}", daemon=True).start()
+            return generator
+
+        current = launch()
+        while running:
+            timeout = max(0.0, deadline - time.monotonic()) if self.hedge and pending else None
+            try:
+                generator, letter, error = results.get(timeout=timeout)
+            except queue.Empty:
+                print_info(
+                    f"{current.provider} n'a pas répondu en {self._hedge_delay(current):.1f}s: "
+                    f"requête doublée vers {pending[0].provider}"
+                )
+                count("llm_hedged", provider=current.provider)
+                current = launch()
+                continue
+            running -= 1
+            if error is None:
+                if generator is not ranked[0]:
+                    print_success(f"Lettre générée par {generator.provider} (relais de {ranked[0].provider})")
+                return letter
+            print_error(f"Erreur lors de la génération avec {generator.provider}: {str(error)}")
+            if not running and pending:
+                current = launch()
+        return None
+
+    def _stream(self, ranked: List[LLMGenerator], prompt: Dict[str, str],
+                on_chunk: Callable[[str], None]) -> Optional[str]:
+        """
+        Génère en streaming avec le premier fournisseur, le suivant s'il échoue avant le premier morceau
+
+        Les requêtes ne sont pas doublées : deux lettres arriveraient mélangées à l'affichage.
+        """
+        for generator in ranked:
+            chunks = []
+            started, on_start = self._clock()
+            try:
+                for chunk in generator.stream(prompt, on_start=on_start):
+                    chunks.append(chunk)
+                    on_chunk(chunk)
+            except Exception as e:
+                self._record(generator, started, False)
+                print_error(f"Erreur lors de la génération avec {generator.provider}: {str(e)}")
+                if chunks:
+                    raise
+                continue
+            self._record(generator, started, True)
+            letter = generator._clean_letter("".join(chunks))
+            print_success(f"Lettre générée avec {generator.provider} (streaming)")
+            generator.cache_letter(prompt, letter)
+            return letter
+        return None
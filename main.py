@@ -11,6 +11,7 @@ from utils import (
     display_jobs_table, display_skills_table, save_to_excel, save_to_csv,
     print_success, print_error, print_info, print_warning, load_json
 )
+from job_store import save_scraped_jobs, load_current_jobs
 import config
 
 def main():
@@ -81,7 +82,7 @@ Exemples d'utilisation:
             
             if jobs:
                 display_jobs_table(jobs)
-                scraper.save_results()
+                save_scraped_jobs(jobs, args.search, args.location)
                 
                 # Export
                 if args.export == 'excel':
@@ -105,7 +106,7 @@ Exemples d'utilisation:
     # Mode analyse des compétences
     elif args.analyze_skills:
         print_info("=== MODE ANALYSE DES COMPÉTENCES ===")
-        jobs = load_json(config.JOBS_FILE)
+        jobs = load_current_jobs()
         
         if not jobs:
             print_error("Aucune donnée d'offres trouvée. Lancez d'abord une recherche avec --search")
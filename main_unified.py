@@ -4,19 +4,36 @@ Script unifié pour rechercher sur tous les sites d'emploi
 import argparse
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from scraper import LinkedInJobScraper
 from scraper_wttj import WelcomeToTheJungleScraper
 from scraper_indeed import IndeedScraper
 from scraper_apec import ApecScraper
 from scraper_helloworks import HelloworksScraper
+from driver_pool import DriverPool
+from http_fetcher import http_deadline
+from waits import reset_wait_timings, print_wait_summary
+from extraction_plan import print_extraction_stats
+from page_cache import print_cache_stats
+from job_store import save_scraped_jobs
+from enrichment import enrich_jobs
+from metrics import span, timed, count, reset_metrics, write_run_report
 from utils import (
     display_jobs_table, save_to_excel, save_to_csv,
     print_success, print_error, print_info, print_warning, save_json, load_json
 )
 import config
 
-def search_all_sites(keywords, location, pages=2, sites=None):
-    """Recherche sur tous les sites ou sites spécifiés"""
+@timed("search_all_sites")
+def search_all_sites(keywords, location, pages=2, sites=None, driver_pool=None, workers=None, site_timeout=None,
+                     seen_index=None):
+    """
+    Recherche sur tous les sites ou sites spécifiés
+    
+    seen_index: SeenIndex des offres déjà vues (mode incrémental, arrêt de la pagination
+    sur les pages déjà connues), ou None pour parcourir toutes les pages
+    """
     all_jobs = []
     
     # Sites disponibles
@@ -51,41 +68,147 @@ def search_all_sites(keywords, location, pages=2, sites=None):
     print_info(f"Mots-clés: {keywords} | Localisation: {location}")
     print("")
     
+    # Mode headless automatique si dans GitHub Actions ou variable d'environnement
+    is_headless = os.getenv('GITHUB_ACTIONS') == 'true' or os.getenv('HEADLESS', '').lower() == 'true'
+    
+    reset_wait_timings()
+    workers = max(1, workers or config.SCRAPING_CONFIG["workers"])
+    site_timeout = site_timeout or config.SCRAPING_CONFIG["site_timeout"]
+    
+    tasks = []
     for site_name in sites:
-        if site_name not in available_sites:
+        if site_name not in available_sites or available_sites[site_name] is None:
             print_warning(f"Site '{site_name}' non reconnu, ignoré")
             continue
-        
+        tasks.append((site_name, available_sites[site_name]))
+    
+    # Un seul pool de navigateurs pour toute l'exécution, démarrés à la demande :
+    # aucun navigateur si tous les sites répondent en HTTP
+    owns_pool = driver_pool is None
+    if owns_pool:
+        driver_pool = DriverPool(size=min(workers, len(tasks)) or 1, headless=is_headless)
+    
+    try:
+        # Même en séquentiel (workers=1), le site passe par _scrape_sites_parallel dont la
+        # surveillance ferme le navigateur d'un site qui dépasse site_timeout
+        all_jobs = _scrape_sites_parallel(
+            tasks, keywords, location, pages, driver_pool, is_headless, seen_index, workers, site_timeout
+        )
+    finally:
+        if owns_pool:
+            driver_pool.close()
+    
+    print_wait_summary()
+    print_extraction_stats()
+    print_cache_stats()
+    return all_jobs
+
+def _scrape_site(site_name, scraper_class, keywords, location, pages, driver_pool, is_headless, seen_index,
+                 site_timeout, state):
+    """
+    Scrape un seul site avec un navigateur du pool (les erreurs restent isolées)
+
+    Exécuté par _scrape_sites_parallel, y compris en mode séquentiel. Les requêtes HTTP et le
+    démarrage du navigateur sont bornés par site_timeout ; la recherche Selenium est interrompue
+    par _scrape_sites_parallel qui ferme le navigateur.
+    """
+    with span("site", site=site_name):
         print_info(f"=== Recherche sur {site_name.upper()} ===")
-        scraper_class = available_sites[site_name]
-        # Mode headless automatique si dans GitHub Actions ou variable d'environnement
-        is_headless = os.getenv('GITHUB_ACTIONS') == 'true' or os.getenv('HEADLESS', '').lower() == 'true'
         scraper = scraper_class(headless=is_headless)
-        
+        scraper.seen_index = seen_index
+        driver = None
+    
+        state['started'] = time.monotonic()
+    
         try:
-            scraper.setup_driver()
-            
+            # Sites statiques : HTTP simple d'abord, Selenium seulement si la page nécessite JavaScript
+            if config.HTTP_CONFIG["enabled"] and hasattr(scraper, 'search_jobs_http'):
+                with http_deadline(site_timeout):
+                    jobs = scraper.search_jobs_http(keywords, location, max_pages=pages)
+                if jobs is not None:
+                    print("")
+                    return jobs
+        
+            remaining = state['started'] + site_timeout - time.monotonic()
+            driver = driver_pool.acquire(timeout=max(1, remaining))
+            scraper.driver = driver
+            state['driver'] = driver
+        
             # LinkedIn nécessite une connexion
             if site_name == 'linkedin':
                 if not scraper.login():
                     print_warning(f"Échec de la connexion {site_name}, passage au site suivant")
-                    scraper.close()
-                    continue
-            
+                    return []
+        
             # Recherche
             jobs = scraper.search_jobs(keywords, location, max_pages=pages)
-            all_jobs.extend(jobs)
-            
-            scraper.close()
             print("")
-            
+            return jobs
+        
         except Exception as e:
             print_error(f"Erreur sur {site_name}: {str(e)}")
-            try:
-                scraper.close()
-            except:
-                pass
-            continue
+            return []
+        finally:
+            # Le navigateur retourne au pool au lieu d'être fermé
+            scraper.driver = None
+            if driver is not None:
+                driver_pool.release(driver, pages=scraper.pages_loaded)
+
+def _scrape_sites_parallel(tasks, keywords, location, pages, driver_pool, is_headless, seen_index, workers,
+                           site_timeout):
+    """Scrape les sites avec `workers` threads (1 = séquentiel), chacun avec son propre navigateur"""
+    all_jobs = []
+    states = {site_name: {} for site_name, _ in tasks}
+    
+    mode = "séquentiel" if workers == 1 else f"parallèle ({workers} workers)"
+    print_info(f"Mode {mode}, timeout de {site_timeout}s par site")
+    
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = {
+        executor.submit(
+            _scrape_site, site_name, scraper_class, keywords, location,
+            pages, driver_pool, is_headless, seen_index, site_timeout, states[site_name]
+        ): site_name
+        for site_name, scraper_class in tasks
+    }
+    pending = set(futures)
+    
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+            
+            # Fusionner les résultats au fur et à mesure
+            for future in done:
+                site_name = futures[future]
+                try:
+                    jobs = future.result()
+                except Exception as e:
+                    print_error(f"Erreur sur {site_name}: {str(e)}")
+                    continue
+                count("jobs_found", len(jobs), site=site_name)
+                all_jobs.extend(jobs)
+                print_success(f"{site_name.upper()} terminé: {len(jobs)} offres")
+            
+            # Interrompre les sites qui dépassent leur timeout
+            now = time.monotonic()
+            for future in list(pending):
+                site_name = futures[future]
+                state = states[site_name]
+                started = state.get('started')
+                if started is None or now - started < site_timeout:
+                    continue
+                print_error(f"Timeout sur {site_name} après {site_timeout}s, site abandonné")
+                count("site_timeouts", site=site_name)
+                pending.discard(future)
+                future.cancel()
+                # Fermer le navigateur débloque le thread (le pool le remplacera)
+                if state.get('driver') is not None:
+                    try:
+                        state['driver'].quit()
+                    except Exception:
+                        pass
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
     
     return all_jobs
 
@@ -104,23 +227,34 @@ def main():
     parser.add_argument('--export', type=str, choices=['excel', 'csv', 'json'], default='csv',
                        help='Format d\'export')
     parser.add_argument('--headless', action='store_true', help='Mode headless')
+    parser.add_argument('--workers', type=int, default=config.SCRAPING_CONFIG["workers"],
+                       help='Nombre de sites scrapés en parallèle (défaut: 1 = séquentiel)')
+    parser.add_argument('--site-timeout', type=int, default=config.SCRAPING_CONFIG["site_timeout"],
+                       help='Timeout en secondes par site')
     
     args = parser.parse_args()
+    reset_metrics()
     
     # Recherche
     jobs = search_all_sites(
         keywords=args.search,
         location=args.location,
         pages=args.pages,
-        sites=args.sites
+        sites=args.sites,
+        workers=args.workers,
+        site_timeout=args.site_timeout
     )
     
     if jobs:
         print_success(f"\n✅ Total: {len(jobs)} offres trouvées sur tous les sites")
         display_jobs_table(jobs)
         
+        # Pages de détail des offres jamais enrichies (temps limité)
+        if config.ENRICHMENT_CONFIG["enabled"]:
+            enrich_jobs(jobs)
+        
         # Sauvegarder
-        save_json(jobs, config.JOBS_FILE)
+        save_scraped_jobs(jobs, args.search, args.location)
         
         # Export
         if args.export == 'csv':
@@ -131,6 +265,8 @@ def main():
             save_json(jobs, f"data/jobs_all_sites_{args.search.replace(' ', '_')}.json")
     else:
         print_warning("Aucune offre trouvée")
+    
+    write_run_report("cli")
 
 if __name__ == "__main__":
     main()
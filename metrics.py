@@ -0,0 +1,235 @@
+"""
+Mesures d'une exécution : durées par étape (spans) et compteurs
+Les spans imbriqués héritent des libellés de leur parent (le site en cours de scraping par
+exemple), ce qui permet de savoir si une exécution lente vient du démarrage des navigateurs,
+de la connexion, du chargement des pages, de l'extraction ou de la sauvegarde.
+
+En fin d'exécution, write_run_report() écrit un rapport JSON (data/runs/) et un fichier
+texte Prometheus (collecteur textfile de node_exporter).
+"""
+import os
+import json
+import time
+import threading
+import functools
+from contextlib import contextmanager
+from datetime import datetime
+from utils import print_info
+import config
+
+PROMETHEUS_PREFIX = "job_scraper"
+
+_lock = threading.Lock()
+_spans = {}
+_counters = {}
+_context = threading.local()
+_run = {'started_at': datetime.now(), 'monotonic': time.monotonic()}
+
+
+def _enabled():
+    return config.METRICS_CONFIG["enabled"]
+
+
+def _current_labels():
+    stack = getattr(_context, 'labels', None)
+    return stack[-1] if stack else {}
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def reset_metrics():
+    """Démarre une nouvelle exécution (mesures remises à zéro)"""
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _run['started_at'] = datetime.now()
+        _run['monotonic'] = time.monotonic()
+
+
+def observe(name, seconds, error=False, **labels):
+    """Enregistre une durée mesurée ailleurs (libellés du span courant inclus)"""
+    if not _enabled():
+        return
+    key = _key(name, {**_current_labels(), **labels})
+    with _lock:
+        stats = _spans.setdefault(key, {'count': 0, 'total': 0.0, 'max': 0.0, 'errors': 0})
+        stats['count'] += 1
+        stats['total'] += seconds
+        stats['max'] = max(stats['max'], seconds)
+        if error:
+            stats['errors'] += 1
+
+
+def count(name, value=1, **labels):
+    """Incrémente un compteur (offres trouvées, timeouts...)"""
+    if not _enabled():
+        return
+    key = _key(name, {**_current_labels(), **labels})
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+@contextmanager
+def span(name, **labels):
+    """Mesure la durée d'un bloc ; une exception est comptée comme une erreur puis propagée"""
+    if not _enabled():
+        yield
+        return
+    merged = {**_current_labels(), **labels}
+    stack = getattr(_context, 'labels', None)
+    if stack is None:
+        stack = _context.labels = []
+    stack.append(merged)
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        stack.pop()
+        observe(name, time.perf_counter() - start, error, **merged)
+
+
+def timed(name):
+    """Décorateur : chaque appel de la fonction est un span"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def summary():
+    """
+    Résumé de l'exécution en cours
+
+    Returns:
+        Dictionnaire sérialisable : spans, compteurs et, par site, durée et nombre d'offres
+    """
+    with _lock:
+        spans = [
+            {
+                'name': name, 'labels': dict(labels), 'count': s['count'],
+                'total_seconds': round(s['total'], 3), 'max_seconds': round(s['max'], 3), 'errors': s['errors']
+            }
+            for (name, labels), s in sorted(_spans.items())
+        ]
+        counters = [
+            {'name': name, 'labels': dict(labels), 'value': value}
+            for (name, labels), value in sorted(_counters.items())
+        ]
+    sites = {}
+    for s in spans:
+        site = s['labels'].get('site')
+        if site and s['name'] == 'site':
+            sites.setdefault(site, {})['seconds'] = s['total_seconds']
+    for c in counters:
+        site = c['labels'].get('site')
+        if site and c['name'] == 'jobs_found':
+            sites.setdefault(site, {})['jobs'] = c['value']
+    return {
+        'started_at': _run['started_at'].isoformat(),
+        'duration_seconds': round(time.monotonic() - _run['monotonic'], 3),
+        'sites': sites,
+        'spans': spans,
+        'counters': counters
+    }
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+
+def _prometheus_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in sorted(labels.items())) + "}"
+
+
+def to_prometheus(data, run):
+    """Résumé au format texte Prometheus (valeurs de la dernière exécution, d'où des gauges)"""
+    p = PROMETHEUS_PREFIX
+    run_labels = {'run': run}
+    lines = [
+        f"# HELP {p}_run_timestamp_seconds Début de la dernière exécution",
+        f"# TYPE {p}_run_timestamp_seconds gauge",
+        f"{p}_run_timestamp_seconds{_prometheus_labels(run_labels)} "
+        f"{datetime.fromisoformat(data['started_at']).timestamp():.0f}",
+        f"# HELP {p}_run_duration_seconds Durée de la dernière exécution",
+        f"# TYPE {p}_run_duration_seconds gauge",
+        f"{p}_run_duration_seconds{_prometheus_labels(run_labels)} {data['duration_seconds']}"
+    ]
+    metrics = [
+        ('span_seconds', 'total_seconds', "Durée cumulée par étape"),
+        ('span_max_seconds', 'max_seconds', "Durée maximale d'un appel par étape"),
+        ('span_calls', 'count', "Nombre d'appels par étape"),
+        ('span_errors', 'errors', "Appels en erreur (exception ou attente expirée)")
+    ]
+    for metric, field, help_text in metrics:
+        lines += [f"# HELP {p}_{metric} {help_text}", f"# TYPE {p}_{metric} gauge"]
+        for s in data['spans']:
+            labels = {**run_labels, 'span': s['name'], **s['labels']}
+            lines.append(f"{p}_{metric}{_prometheus_labels(labels)} {s[field]}")
+    for name in sorted({c['name'] for c in data['counters']}):
+        lines += [f"# HELP {p}_{name} Compteur {name} de la dernière exécution", f"# TYPE {p}_{name} gauge"]
+        for c in data['counters']:
+            if c['name'] == name:
+                lines.append(f"{p}_{name}{_prometheus_labels({**run_labels, **c['labels']})} {c['value']}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_atomic(path, content):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def write_run_report(run="scrape"):
+    """
+    Écrit le rapport JSON et le fichier Prometheus de l'exécution en cours
+
+    Args:
+        run: Nom de l'exécution ('scrape', 'notify', 'cli'...), un fichier Prometheus par nom
+
+    Returns:
+        Le résumé (poussé en XCom par le DAG), ou None si les mesures sont désactivées
+    """
+    if not _enabled():
+        return None
+    data = {'run': run, **summary()}
+    stamp = datetime.fromisoformat(data['started_at']).strftime('%Y%m%d_%H%M%S')
+    report_file = os.path.join(config.METRICS_CONFIG["reports_dir"], f"{run}_{stamp}.json")
+    _write_atomic(report_file, json.dumps(data, ensure_ascii=False, indent=2))
+    # Écriture atomique : le collecteur textfile ne doit jamais lire un fichier à moitié écrit
+    _write_atomic(
+        os.path.join(config.METRICS_CONFIG["textfile_dir"], f"{PROMETHEUS_PREFIX}_{run}.prom"),
+        to_prometheus(data, run)
+    )
+    print_run_summary(data)
+    print_info(f"Rapport d'exécution: {report_file}")
+    return data
+
+
+def print_run_summary(data=None):
+    """Affiche les étapes les plus longues et le rendement par site"""
+    data = data or summary()
+    if not data['spans']:
+        return
+    print_info(f"Durée de l'exécution: {data['duration_seconds']:.1f}s")
+    for s in sorted(data['spans'], key=lambda s: s['total_seconds'], reverse=True)[:10]:
+        labels = ", ".join(f"{k}={v}" for k, v in s['labels'].items())
+        errors = f", {s['errors']} erreur(s)" if s['errors'] else ""
+        print_info(
+            f"  - {s['name']}{f' ({labels})' if labels else ''}: {s['total_seconds']:.1f}s "
+            f"sur {s['count']} appel(s){errors}"
+        )
+    for site, s in data['sites'].items():
+        print_info(f"  - {site}: {s.get('jobs', 0)} offre(s) en {s.get('seconds', 0):.1f}s")
@@ -0,0 +1,254 @@
+"""
+Détection des offres quasi identiques publiées sur plusieurs sites (MinHash + LSH)
+Chaque offre est réduite à une signature MinHash de ses shingles (titre, entreprise, localisation,
+description normalisés). Les signatures sont découpées en bandes : deux offres ne sont comparées
+que si elles partagent au moins une bande, ce qui évite toute comparaison deux à deux.
+
+Pour ne pas fusionner des postes différents, deux offres ne sont regroupées que si elles ont
+la même entreprise (connue), ne viennent pas du même site sous deux identifiants différents, et
+ont assez de shingles (un titre générique et une ville ne suffisent pas). Chaque offre d'un
+groupe ressemble directement à la première du groupe : pas de chaîne A~B~C.
+"""
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+import numpy as np
+import config
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Mentions sans rapport avec le poste lui-même
+_NOISE = re.compile(r"\b(?:h|f|m|w)\s*/\s*(?:h|f|m|w)(?:\s*/\s*(?:h|f|m|w))?\b|\b(?:cdi|cdd|stage|alternance|freelance)\b")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_LOCATION_SPLIT = re.compile(r"[,(]| - ")
+
+
+def normalize(text):
+    """Texte en minuscules, sans accents, mentions H/F ni ponctuation"""
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode('ascii').lower()
+    text = _NOISE.sub(" ", text)
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def _value(job, field):
+    value = job.get(field) or ''
+    return '' if value == 'N/A' else value
+
+
+def company_key(job):
+    """Entreprise normalisée (None si inconnue)"""
+    return normalize(_value(job, 'company')) or None
+
+
+def job_shingles(job, size=3):
+    """
+    Ensemble des shingles d'une offre (entiers 32 bits stables d'un processus à l'autre)
+
+    Le titre et l'entreprise donnent des mots et paires de mots préfixés par le champ ;
+    la localisation se limite à la ville ; la description donne des n-grammes de mots.
+    """
+    shingles = set()
+    for field in ('title', 'company'):
+        words = normalize(_value(job, field)).split()
+        shingles.update(f"{field}:{w}" for w in words)
+        shingles.update(f"{field}:{a} {b}" for a, b in zip(words, words[1:]))
+    # "Toulouse (31)", "Toulouse, Occitanie" et "Toulouse - Haute-Garonne" donnent la même ville
+    city = " ".join(w for w in normalize(_LOCATION_SPLIT.split(_value(job, 'location'))[0]).split() if not w.isdigit())
+    if city:
+        shingles.add(f"location:{city}")
+    words = normalize(_value(job, 'description') or _value(job, 'full_description')).split()
+    shingles.update(" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 0)))
+    return np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+class MinHasher:
+    """Permutations aléatoires (a * x + b) mod p fixées par une graine, pour des signatures reproductibles"""
+
+    def __init__(self, num_perm=None, seed=1):
+        self.num_perm = num_perm or config.DEDUP_CONFIG["num_perm"]
+        rng = np.random.RandomState(seed)
+        # a < 2^29 et x < 2^32 : a * x + b tient dans un entier non signé 64 bits
+        self.a = rng.randint(1, 1 << 29, size=self.num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 29, size=self.num_perm, dtype=np.uint64)
+
+    def signature(self, shingles):
+        """Signature MinHash (num_perm entiers) d'un ensemble de shingles"""
+        if not len(shingles):
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        hashes = (np.outer(self.a, shingles) + self.b[:, None]) % _MERSENNE_PRIME
+        return (hashes & _MAX_HASH).min(axis=1)
+
+
+def similarity(sig_a, sig_b):
+    """Similarité de Jaccard estimée entre deux signatures"""
+    return float(np.mean(sig_a == sig_b))
+
+
+class NearDuplicateIndex:
+    """
+    Index LSH des offres : chaque nouvelle offre est rattachée au groupe de ses quasi-doublons
+
+    Le coût d'un ajout dépend du nombre de candidats partageant une bande, pas de la taille de l'index.
+    """
+
+    def __init__(self, threshold=None, num_perm=None, bands=None, min_shingles=None):
+        self.threshold = threshold if threshold is not None else config.DEDUP_CONFIG["threshold"]
+        self.min_shingles = min_shingles if min_shingles is not None else config.DEDUP_CONFIG["min_shingles"]
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands or config.DEDUP_CONFIG["bands"]
+        if self.hasher.num_perm % self.bands:
+            raise ValueError("num_perm doit être un multiple de bands")
+        self.rows = self.hasher.num_perm // self.bands
+        self._buckets = [defaultdict(list) for _ in range(self.bands)]
+        # Signatures rangées dans une matrice (une ligne par offre) pour comparer les candidats en une fois
+        self._matrix = np.empty((1024, self.hasher.num_perm), dtype=np.uint64)
+        self._keys = []
+        self._meta = []
+        self._rows = {}
+        self._group = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._group
+
+    def _band_keys(self, sig):
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    @staticmethod
+    def _meta_of(key, job):
+        return company_key(job), job.get('source') or '', job.get('offer_id') or key
+
+    @staticmethod
+    def _compatible(meta, other):
+        """Même entreprise connue, et pas deux offres distinctes du même site"""
+        company, source, offer_id = meta
+        other_company, other_source, other_offer_id = other
+        if company is None or company != other_company:
+            return False
+        return not (source and source == other_source and offer_id != other_offer_id)
+
+    def _signature(self, job):
+        """Signature de l'offre, ou None si elle a trop peu de shingles pour être comparée"""
+        shingles = job_shingles(job)
+        if len(shingles) < self.min_shingles:
+            return None
+        return self.hasher.signature(shingles)
+
+    def query(self, job, sig=None, key=None):
+        """
+        Offres indexées quasi identiques à une offre
+
+        Returns:
+            Liste de tuples (clé, similarité estimée), la plus proche en premier
+        """
+        if key is None:
+            from compare_jobs import get_job_signature
+            key = get_job_signature(job)
+        meta = self._meta_of(key, job)
+        if meta[0] is None:
+            return []
+        sig = sig if sig is not None else self._signature(job)
+        if sig is None:
+            return []
+        candidates = set()
+        for band, band_key in enumerate(self._band_keys(sig)):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        candidates = [row for row in candidates if self._compatible(meta, self._meta[row])]
+        if not candidates:
+            return []
+        rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        scores = (self._matrix[rows] == sig).mean(axis=1)
+        keep = scores >= self.threshold
+        matches = [(self._keys[row], float(score)) for row, score in zip(rows[keep], scores[keep])]
+        return sorted(matches, key=lambda m: -m[1])
+
+    def add(self, key, job):
+        """
+        Indexe une offre et la rattache au groupe de l'offre la plus proche qui représente un groupe
+
+        Une offre qui ne ressemble qu'à un membre (et pas au représentant) forme son propre groupe :
+        les groupes ne s'étendent pas de proche en proche.
+
+        Returns:
+            Clé du représentant du groupe
+        """
+        if key in self._group:
+            return self._group[key]
+        self._group[key] = key
+        sig = self._signature(job)
+        if sig is None:
+            # Trop peu d'informations : l'offre reste seule
+            return key
+        for other, _ in self.query(job, sig, key):
+            if self._group[other] == other:
+                self._group[key] = other
+                break
+
+        row = len(self._keys)
+        if row == len(self._matrix):
+            self._matrix = np.concatenate([self._matrix, np.empty_like(self._matrix)])
+        self._matrix[row] = sig
+        self._keys.append(key)
+        self._meta.append(self._meta_of(key, job))
+        self._rows[key] = row
+        for band, band_key in enumerate(self._band_keys(sig)):
+            self._buckets[band][band_key].append(row)
+        return self._group[key]
+
+    def cluster_of(self, key):
+        """Représentant du groupe d'une offre indexée"""
+        return self._group[key]
+
+    def clusters(self):
+        """Groupes de plus d'une offre : {représentant: [clés]}"""
+        groups = defaultdict(list)
+        for key, root in self._group.items():
+            groups[root].append(key)
+        return {root: keys for root, keys in groups.items() if len(keys) > 1}
+
+
+def group_near_duplicates(jobs, index=None):
+    """
+    Regroupe les offres quasi identiques (même poste sur plusieurs sites)
+
+    Args:
+        jobs: Liste d'offres
+        index: NearDuplicateIndex à compléter (un nouvel index par défaut)
+
+    Returns:
+        Une offre par groupe, dans l'ordre d'origine ; les autres publications du groupe
+        sont listées dans job['also_on'] ({source, url})
+    """
+    from compare_jobs import get_job_signature
+    index = index if index is not None else NearDuplicateIndex()
+    keys = [get_job_signature(job) for job in jobs]
+    groups = {}
+    for key, job in zip(keys, jobs):
+        groups.setdefault(index.add(key, job), []).append(job)
+
+    grouped = []
+    for members in groups.values():
+        first = dict(members[0])
+        if len(members) > 1:
+            first['also_on'] = [
+                {'source': job.get('source', ''), 'url': job.get('url', '')} for job in members[1:]
+            ]
+        grouped.append(first)
+    return grouped
+
+
+def filter_new_jobs(new_jobs, known_jobs):
+    """
+    Nouvelles offres qui ne sont pas la republication d'une offre connue sur un autre site,
+    regroupées entre elles (voir group_near_duplicates)
+    """
+    from compare_jobs import get_job_signature
+    index = NearDuplicateIndex()
+    for job in known_jobs:
+        index.add(get_job_signature(job), job)
+    fresh = [job for job in new_jobs if not index.query(job, key=get_job_signature(job))]
+    return group_near_duplicates(fresh)
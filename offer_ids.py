@@ -0,0 +1,109 @@
+"""
+Identifiants stables des offres et URL canoniques
+Les URL de LinkedIn ou d'Indeed portent des paramètres de suivi qui changent à chaque recherche ;
+l'identifiant de l'offre (id LinkedIn, jk Indeed, numéro APEC, slug WTTJ...) ne change pas.
+Les règles de chaque site sont dans le registre site_selectors.py.
+"""
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from site_selectors import SITE_SELECTORS
+
+# Paramètres de requête sans rapport avec l'offre elle-même
+TRACKING_PARAMS = {
+    'trk', 'trackingid', 'refid', 'eboid', 'lipi', 'position', 'pagenum', 'from', 'tk',
+    'xkcb', 'xpse', 'xfps', 'advn', 'adid', 'fccid', 'vjs', 'sjdu', 'ebp', 'gclid', 'fbclid'
+}
+
+
+class _SiteRule:
+    """Règle d'identification compilée d'un site"""
+
+    def __init__(self, site, spec):
+        self.site = site
+        self.host = urlsplit(spec['base_url']).netloc.split('.', 1)[-1]
+        self.patterns = [re.compile(p) for p in spec.get('offer_id_patterns', [])]
+        self.attr = spec.get('offer_id_attr')
+        self.template = spec.get('canonical_url')
+
+    def find_id(self, url):
+        """Identifiant de l'offre dans une URL, ou None"""
+        for pattern in self.patterns:
+            match = pattern.search(url)
+            if match:
+                return match.group(1)
+        return None
+
+
+_rules = {site: _SiteRule(site, spec) for site, spec in SITE_SELECTORS.items()}
+
+
+def get_site_rule(site):
+    """Règle d'identification d'un site du registre"""
+    return _rules[site]
+
+
+def site_of(url):
+    """Site du registre correspondant au domaine d'une URL, ou None"""
+    netloc = urlsplit(url).netloc if url else ''
+    return next((r.site for r in _rules.values() if netloc and netloc.endswith(r.host)), None)
+
+
+def strip_tracking(url):
+    """URL sans fragment ni paramètres de suivi"""
+    parts = urlsplit(url)
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith('utm_')
+    ]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ''))
+
+
+def is_offer_url(url):
+    """
+    Vrai si l'URL est la page d'une offre (et non une page de résultats qui en sélectionne une)
+
+    Les recherches LinkedIn (currentJobId=) ou Indeed (vjk=) portent l'identifiant d'une offre
+    sans en être la page : l'identifiant doit être dans le chemin, ou le chemin doit être celui
+    de l'URL canonique.
+    """
+    rule = _rules.get(site_of(url))
+    if rule is None:
+        return False
+    path = urlsplit(url).path
+    if rule.find_id(path):
+        return True
+    raw_id = rule.find_id(url)
+    return bool(raw_id and rule.template) and urlsplit(rule.template.format(id=raw_id)).path == path
+
+
+def make_offer_id(site, raw_id):
+    """Identifiant d'offre préfixé par le site ("linkedin:3912345678")"""
+    return f"{site}:{raw_id}"
+
+
+def canonicalize(url, site=None, raw_id=None):
+    """
+    Identifiant et URL canonique d'une offre
+
+    Args:
+        url: URL de l'offre
+        site: Site du registre (déduit du domaine de l'URL si absent)
+        raw_id: Identifiant déjà connu (attribut de la carte), sinon lu dans l'URL
+
+    Returns:
+        Tuple (offer_id ou None, url canonique)
+    """
+    if not url and raw_id is None:
+        return None, url
+    rule = _rules.get(site or site_of(url))
+    if rule is None:
+        return None, strip_tracking(url) if url else url
+
+    raw_id = raw_id or (rule.find_id(url) if url else None)
+    if raw_id is None:
+        return None, strip_tracking(url) if url else url
+    if rule.template:
+        url = rule.template.format(id=raw_id)
+    elif url:
+        url = strip_tracking(url)
+    return make_offer_id(rule.site, raw_id), url
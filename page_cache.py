@@ -0,0 +1,197 @@
+"""
+Cache disque des pages téléchargées
+Les pages sont indexées par URL (canonique pour les pages d'offres) et stockées compressées sous le hash de leur contenu
+(une page identique n'est stockée qu'une fois). Au-delà de la taille maximale, les pages les
+moins récemment lues sont supprimées.
+
+Les pages de résultats de recherche changent vite : elles sont relues avec une durée de validité
+courte (search_ttl_minutes) au lieu de ttl_hours, qui vaut pour les pages d'offres.
+En mode rejeu (PAGE_CACHE_REPLAY=true), la durée de validité est ignorée : une nouvelle version
+des sélecteurs peut être testée sur les pages de la veille sans rien retélécharger.
+"""
+import os
+import gzip
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from utils import ensure_data_dir, print_info
+from offer_ids import canonicalize, strip_tracking, is_offer_url
+import config
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    fetched_at TEXT NOT NULL,
+    accessed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_content_hash ON pages(content_hash);
+CREATE INDEX IF NOT EXISTS idx_pages_accessed_at ON pages(accessed_at);
+"""
+
+
+def _cache_key(url):
+    """
+    URL sans paramètres de suivi ni fragment ; URL canonique pour la page d'une offre
+
+    Une page de résultats qui sélectionne une offre (currentJobId=, vjk=) garde sa propre clé :
+    elle ne doit pas être relue comme la page de détail de l'offre.
+    """
+    if is_offer_url(url):
+        return canonicalize(url)[1]
+    return strip_tracking(url)
+
+
+class PageCache:
+    """Pages HTML compressées, adressées par contenu, avec durée de validité et éviction LRU"""
+
+    def __init__(self, directory=None, ttl_hours=None, max_mb=None, replay=None):
+        cfg = config.PAGE_CACHE_CONFIG
+        self.directory = directory or cfg["directory"]
+        self.ttl = timedelta(hours=ttl_hours if ttl_hours is not None else cfg["ttl_hours"])
+        self.max_bytes = (max_mb if max_mb is not None else cfg["max_mb"]) * 1024 * 1024
+        self.replay = cfg["replay"] if replay is None else replay
+        self._lock = threading.RLock()
+
+        ensure_data_dir()
+        os.makedirs(self.directory, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(self.directory, "index.db"), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(INDEX_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+
+    def _blob_path(self, content_hash):
+        return os.path.join(self.directory, content_hash[:2], f"{content_hash}.html.gz")
+
+    def get(self, url, ttl=None):
+        """Page en cache (None si absente ou expirée ; ttl : durée de validité si autre que celle du cache)"""
+        key = _cache_key(url)
+        ttl = ttl if ttl is not None else self.ttl
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT content_hash, fetched_at FROM pages WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None or (not self.replay and datetime.fromisoformat(row['fetched_at']) < datetime.now() - ttl):
+                self.misses += 1
+                return None
+            try:
+                with gzip.open(self._blob_path(row['content_hash']), 'rt', encoding='utf-8') as f:
+                    html = f.read()
+            except OSError:
+                self.conn.execute("DELETE FROM pages WHERE url = ?", (key,))
+                self.conn.commit()
+                self.misses += 1
+                return None
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE pages SET accessed_at = ? WHERE url = ?", (datetime.now().isoformat(), key)
+                )
+            self.hits += 1
+            return html
+
+    def put(self, url, html):
+        """Enregistre une page (le contenu n'est écrit que s'il n'existe pas déjà)"""
+        if not html:
+            return
+        key = _cache_key(url)
+        data = html.encode('utf-8')
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(content_hash)
+        now = datetime.now().isoformat()
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with gzip.open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            previous = self.conn.execute("SELECT content_hash FROM pages WHERE url = ?", (key,)).fetchone()
+            with self.conn:
+                self.conn.execute(
+                    """
+                    INSERT INTO pages (url, content_hash, size, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(url) DO UPDATE SET content_hash = excluded.content_hash, size = excluded.size,
+                        fetched_at = excluded.fetched_at, accessed_at = excluded.accessed_at
+                    """,
+                    (key, content_hash, os.path.getsize(path), now, now)
+                )
+            if previous and previous['content_hash'] != content_hash:
+                self._delete_unreferenced([previous['content_hash']])
+            self._evict()
+
+    def _delete_unreferenced(self, content_hashes):
+        """Supprime les fichiers qui ne sont plus référencés par aucune URL"""
+        for content_hash in set(content_hashes):
+            used = self.conn.execute(
+                "SELECT 1 FROM pages WHERE content_hash = ? LIMIT 1", (content_hash,)
+            ).fetchone()
+            if not used:
+                try:
+                    os.remove(self._blob_path(content_hash))
+                except OSError:
+                    pass
+
+    def size(self):
+        """Taille du cache sur disque (octets, chaque contenu compté une fois)"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT COALESCE(SUM(size), 0) AS total FROM (SELECT DISTINCT content_hash, size FROM pages)"
+            ).fetchone()
+            return row['total']
+
+    def _evict(self):
+        """Supprime les pages les moins récemment lues jusqu'à repasser sous la taille maximale"""
+        total = self.size()
+        if total <= self.max_bytes:
+            return
+        removed = []
+        rows = self.conn.execute("SELECT url, content_hash, size FROM pages ORDER BY accessed_at").fetchall()
+        with self.conn:
+            for row in rows:
+                if total <= self.max_bytes:
+                    break
+                self.conn.execute("DELETE FROM pages WHERE url = ?", (row['url'],))
+                removed.append(row['content_hash'])
+                shared = self.conn.execute(
+                    "SELECT 1 FROM pages WHERE content_hash = ? LIMIT 1", (row['content_hash'],)
+                ).fetchone()
+                if not shared:
+                    total -= row['size']
+        self._delete_unreferenced(removed)
+
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            hashes = [row['content_hash'] for row in self.conn.execute("SELECT DISTINCT content_hash FROM pages")]
+            with self.conn:
+                self.conn.execute("DELETE FROM pages")
+            self._delete_unreferenced(hashes)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_page_cache():
+    """Cache partagé par le processus, ou None s'il est désactivé"""
+    global _cache
+    if not config.PAGE_CACHE_CONFIG["enabled"]:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = PageCache()
+        return _cache
+
+
+def print_cache_stats():
+    """Affiche les pages servies par le cache et sa taille"""
+    if _cache is None or not (_cache.hits or _cache.misses):
+        return
+    print_info(
+        f"Cache des pages: {_cache.hits} lue(s) sur disque, {_cache.misses} téléchargée(s), "
+        f"{_cache.size() / (1024 * 1024):.1f} Mo"
+    )
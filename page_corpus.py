@@ -0,0 +1,85 @@
+"""
+Corpus de pages de résultats enregistrées, pour rejouer l'extraction hors ligne
+En mode capture (CAPTURE_CORPUS=true), chaque page de résultats passée au plan d'extraction
+est enregistrée dans fixtures/corpus/<version>/<site>/ ; benchmark_extraction.py rejoue ensuite
+ce corpus sans accéder aux sites.
+"""
+import os
+import gzip
+import json
+import hashlib
+import threading
+from datetime import datetime
+import config
+
+MANIFEST_FILE = "manifest.json"
+
+_lock = threading.Lock()
+
+
+def corpus_version():
+    """Version du corpus en cours de capture (CORPUS_VERSION, sinon la date du jour)"""
+    return config.CORPUS_CONFIG["version"] or datetime.now().strftime("%Y-%m-%d")
+
+
+def _load_manifest(version_dir):
+    path = os.path.join(version_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def capture_page(site, html, url=None):
+    """Enregistre une page de résultats dans le corpus (une page identique n'est gardée qu'une fois)"""
+    if not config.CORPUS_CONFIG["capture"] or not html:
+        return
+    data = html.encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    version_dir = os.path.join(config.CORPUS_CONFIG["directory"], corpus_version())
+    with _lock:
+        manifest = _load_manifest(version_dir)
+        pages = manifest.setdefault(site, [])
+        if any(page['sha'] == digest for page in pages):
+            return
+        filename = f"{site}/page_{len(pages) + 1:03d}.html.gz"
+        path = os.path.join(version_dir, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path, 'wb') as f:
+            f.write(data)
+        pages.append({
+            'file': filename,
+            'sha': digest,
+            'url': url,
+            'captured_at': datetime.now().isoformat()
+        })
+        with open(os.path.join(version_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def list_versions(directory=None):
+    """Versions du corpus disponibles, de la plus ancienne à la plus récente"""
+    directory = directory or config.CORPUS_CONFIG["directory"]
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        name for name in os.listdir(directory)
+        if os.path.exists(os.path.join(directory, name, MANIFEST_FILE))
+    )
+
+
+def load_corpus(version, directory=None):
+    """
+    Pages d'une version du corpus
+
+    Returns:
+        Dictionnaire {site: [html, ...]}
+    """
+    version_dir = os.path.join(directory or config.CORPUS_CONFIG["directory"], version)
+    corpus = {}
+    for site, pages in _load_manifest(version_dir).items():
+        corpus[site] = []
+        for page in pages:
+            with gzip.open(os.path.join(version_dir, page['file']), 'rt', encoding='utf-8') as f:
+                corpus[site].append(f.read())
+    return corpus
@@ -0,0 +1,112 @@
+"""
+Sélection des passages du CV et de l'offre inclus dans le prompt d'une lettre
+Au lieu de tronquer le CV et la description à un nombre fixe de caractères, les passages
+(sections du CV, paragraphes de l'offre) sont notés selon les compétences qu'ils mentionnent ;
+les meilleurs sont gardés dans la limite d'un budget de tokens puis remis dans leur ordre
+d'origine. Le prompt est plus court (plus rapide à traiter, surtout avec Ollama en local).
+
+Les sections du CV sont notées selon les compétences du CV lui-même (select_cv(profile,
+profile.skills)) : le début du prompt reste identique d'une offre à l'autre et peut être mis
+en cache par le fournisseur. Seule la description de l'offre est notée selon les compétences
+de l'offre.
+"""
+import re
+from skill_matcher import get_skill_matcher
+import config
+
+# Approximation sans tokenizer : environ 4 caractères par token (français comme anglais)
+CHARS_PER_TOKEN = 4
+# Les paragraphes plus longs sont découpés en lignes ou en phrases
+MAX_PASSAGE_CHARS = 400
+
+SECTION_LABELS = {
+    'summary': "Profil",
+    'experience': "Expérience",
+    'education': "Formation",
+    'skills': "Compétences",
+    'projects': "Projets",
+    'other': "Divers"
+}
+
+
+def estimate_tokens(text):
+    """Nombre de tokens estimé d'un texte"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def split_passages(text, max_chars=MAX_PASSAGE_CHARS):
+    """Découpe un texte en paragraphes, les plus longs en groupes de lignes ou de phrases"""
+    passages = []
+    for block in re.split(r"\n\s*\n", text or ""):
+        block = block.strip()
+        if len(block) <= max_chars:
+            if block:
+                passages.append(block)
+            continue
+        current = ""
+        for piece in re.split(r"\n|(?<=[.!?;])\s+", block):
+            piece = piece.strip()
+            if not piece:
+                continue
+            if current and len(current) + len(piece) + 1 > max_chars:
+                passages.append(current)
+                current = piece
+            else:
+                current = f"{current}\n{piece}" if current else piece
+        if current:
+            passages.append(current)
+    return passages
+
+
+def select_passages(passages, skills, budget):
+    """
+    Passages qui mentionnent le plus de compétences de l'offre, dans la limite du budget
+
+    À score égal, les premiers passages sont préférés : sans compétence reconnue, le résultat
+    équivaut à une troncature.
+
+    Returns:
+        Passages gardés, dans leur ordre d'origine
+    """
+    matcher = get_skill_matcher()
+    wanted = set(skills)
+
+    def score(i):
+        return len({matcher.skills[j] for j in matcher.match_text(passages[i].lower())} & wanted)
+
+    kept = []
+    used = 0
+    for i in sorted(range(len(passages)), key=lambda i: (-score(i), i)):
+        tokens = estimate_tokens(passages[i])
+        if used + tokens <= budget:
+            kept.append(i)
+            used += tokens
+    if not kept and passages and budget > 0:
+        # Aucun passage ne tient dans le budget : le meilleur est tronqué
+        best = min(range(len(passages)), key=lambda i: (-score(i), i))
+        return [passages[best][:budget * CHARS_PER_TOKEN] + "..."]
+    return [passages[i] for i in sorted(kept)]
+
+
+def select_cv(profile, skills, budget=None):
+    """Extraits du CV (profil de cv_profile.py) présentés par section"""
+    budget = config.PROMPT_CONFIG["cv_tokens"] if budget is None else budget
+    tagged = [
+        (section, passage)
+        for section, text in profile.sections.items()
+        for passage in split_passages(text)
+    ]
+    kept = set(select_passages([passage for _, passage in tagged], skills, budget))
+    parts = []
+    for section in profile.sections:
+        passages = [passage for name, passage in tagged if name == section and passage in kept]
+        if passages:
+            parts.append(f"{SECTION_LABELS.get(section, section)} :\n" + "\n".join(passages))
+    return "\n\n".join(parts)
+
+
+def select_description(job, skills, budget=None):
+    """Paragraphes de la description de l'offre (complète si elle a été récupérée)"""
+    budget = config.PROMPT_CONFIG["description_tokens"] if budget is None else budget
+    description = job.get('full_description') or job.get('description', '') or ''
+    return "\n\n".join(select_passages(split_passages(description), skills, budget))
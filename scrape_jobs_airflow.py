@@ -7,6 +7,9 @@ import os
 from datetime import datetime
 from utils import print_info, print_success, print_error, save_json
 from main_unified import search_all_sites
+from job_store import save_scraped_jobs, export_jobs
+from enrichment import enrich_jobs
+from metrics import reset_metrics, write_run_report
 import config
 
 
@@ -16,7 +19,10 @@ def run_daily_scraping():
     
     Returns:
         Tuple (success: bool, message: str, jobs_count: int)
+        
+    Les mesures de l'exécution repartent de zéro ; write_run_report() les enregistre ensuite
     """
+    reset_metrics()
     try:
         print_info("=" * 60)
         print_info("🔍 DÉMARRAGE DU SCRAPING QUOTIDIEN")
@@ -31,6 +37,13 @@ def run_daily_scraping():
         print_info(f"🔎 Recherche: '{keywords}'")
         print_info(f"📍 Localisation: {location}")
         print_info(f"📄 Pages: {pages}")
+        
+        # Mode incrémental : les scrapers s'arrêtent sur les pages d'offres déjà vues
+        seen_index = None
+        if config.INCREMENTAL_CONFIG["enabled"]:
+            from seen_index import SeenIndex
+            seen_index = SeenIndex()
+            print_info(f"♻️  Mode incrémental: {len(seen_index)} offres déjà connues")
         print_info("")
         
         # Lancer la recherche sur tous les sites
@@ -38,12 +51,17 @@ def run_daily_scraping():
             keywords=keywords,
             location=location,
             pages=pages,
-            sites=None  # Tous les sites
+            sites=None,  # Tous les sites
+            seen_index=seen_index
         )
         
         if jobs:
+            # Description complète des nouvelles offres, dans le budget de temps de l'exécution
+            if config.ENRICHMENT_CONFIG["enabled"]:
+                enrich_jobs(jobs)
+            
             # Sauvegarder les résultats
-            save_json(jobs, config.JOBS_FILE)
+            save_scraped_jobs(jobs, keywords, location, seen_index.stopped_sources if seen_index else None)
             print_success(f"✅ {len(jobs)} offres trouvées et sauvegardées")
             
             # Copier aussi dans le dossier Annonces sur le bureau
@@ -51,15 +69,15 @@ def run_daily_scraping():
             annonces_dir = ensure_desktop_annonces()
             desktop_path = os.path.join(annonces_dir, "offres_linkedin.json")
             try:
-                save_json(jobs, desktop_path)
+                export_jobs(desktop_path, jobs)
                 print_success(f"✅ Fichier copié dans Annonces: {desktop_path}")
             except Exception as e:
                 print_error(f"⚠️  Impossible de copier dans Annonces: {str(e)}")
             
             return True, f"Scraping réussi: {len(jobs)} offres trouvées", len(jobs)
         else:
-            # Aucun résultat n'est pas une erreur : on sauvegarde un fichier vide
-            save_json([], config.JOBS_FILE)
+            # Aucun résultat n'est pas une erreur : on enregistre une exécution vide
+            save_scraped_jobs([], keywords, location)
             print_info("ℹ️  Aucune offre trouvée aujourd'hui")
             return True, "Aucune offre trouvée", 0
             
@@ -72,6 +90,7 @@ def run_daily_scraping():
 if __name__ == "__main__":
     # Exécution directe (pour tests)
     success, message, count = run_daily_scraping()
+    write_run_report("scrape")
     if success:
         print_success(f"✅ {message}")
         sys.exit(0)
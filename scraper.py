@@ -3,42 +3,37 @@ Module de scraping des offres d'emploi LinkedIn
 """
 import time
 import json
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from bs4 import BeautifulSoup
+from seen_index import should_stop_paging
 import config
 from utils import print_success, print_error, print_warning, print_info, save_json, get_timestamp
+from waits import wait_for_page_ready, wait_for_stable_count, wait_for_network_idle, wait_for_url, wait_until
+from http_fetcher import parse_page_source
+from metrics import timed
+from extraction_plan import get_extraction_plan
+from driver_pool import create_chrome_driver
 
 class LinkedInJobScraper:
     def __init__(self, headless=False):
         self.driver = None
         self.headless = headless
         self.jobs = []
+        self.seen_index = None  # SeenIndex en mode incrémental
+        self.offer_ids = set()  # Identifiants des offres déjà extraites (doublons ignorés)
+        self.pages_loaded = 0  # Pages de résultats chargées dans le navigateur (recyclage du pool)
+        self.plan = get_extraction_plan('linkedin')
         
     def setup_driver(self):
-        """Configure le driver Selenium"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.maximize_window()
+        """Démarre un navigateur pour ce scraper (hors pool : main.py, tracker.py)"""
+        self.driver = create_chrome_driver(self.headless)
         print_success("Driver Chrome initialisé")
         
+    @timed("login")
     def login(self, email=None, password=None):
         """Se connecte à LinkedIn"""
         email = email or config.LINKEDIN_EMAIL
@@ -51,7 +46,6 @@ class LinkedInJobScraper:
         try:
             print_info("Connexion à LinkedIn...")
             self.driver.get("https://www.linkedin.com/login")
-            time.sleep(2)
             
             email_field = WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.ID, "username"))
@@ -62,8 +56,8 @@ class LinkedInJobScraper:
             password_field.send_keys(password)
             password_field.send_keys(Keys.RETURN)
             
-            # Attendre plus longtemps pour la connexion et les vérifications
-            time.sleep(10)
+            # Attendre la redirection après connexion (ou la page de vérification)
+            wait_for_url(self.driver, lambda url: "/login" not in url)
             
             # Vérifier si la connexion a réussi
             current_url = self.driver.current_url
@@ -73,8 +67,12 @@ class LinkedInJobScraper:
             elif "challenge" in current_url or "checkpoint" in current_url:
                 print_warning("LinkedIn demande une vérification (captcha/2FA).")
                 print_info("Veuillez compléter la vérification dans le navigateur qui s'est ouvert.")
-                print_info("Attente de 30 secondes pour que vous puissiez vous connecter manuellement...")
-                time.sleep(30)
+                print_info("Attente (30 secondes max) pour que vous puissiez vous connecter manuellement...")
+                wait_for_url(
+                    self.driver,
+                    lambda url: "feed" in url or "linkedin.com/in/" in url or "linkedin.com/jobs" in url,
+                    timeout=config.WAIT_CONFIG['manual_login']
+                )
                 # Vérifier à nouveau après l'attente
                 current_url = self.driver.current_url
                 if "feed" in current_url or "linkedin.com/in/" in current_url or "linkedin.com/jobs" in current_url:
@@ -92,6 +90,7 @@ class LinkedInJobScraper:
             print_error(f"Erreur lors de la connexion: {str(e)}")
             return False
     
+    @timed("search_jobs")
     def search_jobs(self, keywords, location="", experience_level="", max_pages=5):
         """Recherche des offres d'emploi"""
         try:
@@ -111,7 +110,7 @@ class LinkedInJobScraper:
             url = f"{base_url}?{query_string}"
             
             self.driver.get(url)
-            time.sleep(3)
+            wait_for_page_ready(self.driver)
             
             # Scroller pour charger plus de résultats
             self._scroll_page()
@@ -136,7 +135,13 @@ class LinkedInJobScraper:
             
             while scrolls < max_scrolls:
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
+                # Attendre que la page grandisse (nouveaux résultats) au lieu d'une pause fixe
+                wait_until(
+                    self.driver,
+                    lambda d: d.execute_script("return document.body.scrollHeight") != last_height,
+                    config.WAIT_CONFIG['scroll'],
+                    name='scroll'
+                )
                 new_height = self.driver.execute_script("return document.body.scrollHeight")
                 
                 if new_height == last_height:
@@ -152,33 +157,16 @@ class LinkedInJobScraper:
         page = 0
         
         try:
-            # Attendre que la page se charge
-            time.sleep(5)
-            
             while page < max_pages:
-                # Attendre que les résultats se chargent
-                time.sleep(3)
+                self.pages_loaded += 1
+                # Attendre que le nombre de cartes soit stable
+                wait_for_stable_count(self.driver, self.plan.cards_selector, no_results=self.plan.no_results_selector)
                 
-                # Essayer plusieurs sélecteurs CSS possibles pour LinkedIn
-                job_cards = []
-                selectors = [
-                    "ul.jobs-search__results-list > li",
-                    "div.jobs-search-results-list > ul > li",
-                    "li.jobs-search-results__list-item",
-                    "div[data-job-id]",
-                    "li[data-occludable-job-id]",
-                    "div.job-card-container",
-                    "li.job-card-list__entity-lockup"
-                ]
-                
-                for selector in selectors:
-                    try:
-                        job_cards = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        if job_cards:
-                            print_info(f"Trouvé {len(job_cards)} offres avec le sélecteur: {selector}")
-                            break
-                    except:
-                        continue
+                # Sélecteurs des cartes essayés dans l'ordre du plan (le dernier gagnant d'abord)
+                job_cards = self.plan.select_cards(self.driver)
+                matched_selector = self.plan.last_matched('cards')
+                if job_cards:
+                    print_info(f"Trouvé {len(job_cards)} offres avec le sélecteur: {matched_selector}")
                 
                 if not job_cards:
                     print_warning("Aucune offre trouvée. Vérification de la page...")
@@ -195,10 +183,22 @@ class LinkedInJobScraper:
                 
                 print_info(f"Extraction des offres de la page {page + 1}...")
                 
+                # Une seule lecture du DOM pour toute la page (mêmes cartes, même ordre)
+                soup_cards = []
+                if config.SCRAPING_CONFIG["batch_extraction"]:
+                    soup_cards = parse_page_source(self.driver).select(matched_selector)
+                
+                page_start = len(jobs)
                 for i, card in enumerate(job_cards[:25]):  # Limiter à 25 par page
                     try:
+                        # Carte imbriquée ou offre déjà vue : ni extraction ni clic
+                        if self.plan.already_seen(soup_cards[i] if i < len(soup_cards) else card, self.offer_ids):
+                            continue
                         # Extraire les données directement depuis la carte sans clic si possible
-                        job_data = self._extract_job_details_from_card(card, i)
+                        try:
+                            job_data = self.plan.extract(soup_cards[i] if i < len(soup_cards) else card, self.offer_ids)
+                        except Exception:
+                            job_data = None
                         if not job_data or job_data.get('title') == "N/A":
                             # Si l'extraction directe échoue, essayer avec clic
                             job_data = self._extract_job_details(card, i)
@@ -210,6 +210,10 @@ class LinkedInJobScraper:
                         print_warning(f"  ✗ Erreur sur l'offre {i+1}: {str(e)[:50]}")
                         continue
                 
+                # Mode incrémental : page déjà connue, inutile de charger les suivantes
+                if should_stop_paging(self.seen_index, jobs[page_start:], "LinkedIn"):
+                    break
+                
                 # Essayer de passer à la page suivante
                 try:
                     next_selectors = [
@@ -229,7 +233,7 @@ class LinkedInJobScraper:
                     
                     if next_button and next_button.is_enabled():
                         next_button.click()
-                        time.sleep(3)
+                        wait_for_network_idle(self.driver)
                         page += 1
                     else:
                         print_info("Pas de page suivante disponible")
@@ -243,342 +247,52 @@ class LinkedInJobScraper:
         
         return jobs
     
-    def _extract_job_details_from_card(self, card, index=0):
-        """Extrait les détails directement depuis la carte sans clic"""
-        try:
-            job_data = {}
-            
-            # Titre - plusieurs sélecteurs possibles
-            title_selectors = [
-                "a.job-card-list__title",
-                "a.base-card__full-link",
-                "h3.base-search-card__title a",
-                "span.job-search-card__title",
-                "a[data-control-name='job_card_title']",
-                "a[href*='/jobs/view/']",
-                "h3 a"
-            ]
-            for selector in title_selectors:
-                try:
-                    title_elem = card.find_element(By.CSS_SELECTOR, selector)
-                    job_data['title'] = title_elem.text.strip()
-                    job_data['url'] = title_elem.get_attribute('href')
-                    if job_data['title']:
-                        break
-                except:
-                    continue
-            if 'title' not in job_data or not job_data.get('title'):
-                return None
-            
-            # Entreprise - sélecteurs améliorés avec fallback
-            company_selectors = [
-                "h4.base-search-card__subtitle",
-                "h4.job-card-container__company-name",
-                "span.job-card-container__primary-description",
-                "a.job-card-container__company-name",
-                "h4 a",
-                "a.base-card__full-link",
-                "span.job-card-container__company-name",
-                "div.job-card-container__company-name",
-                "h4[class*='company']",
-                "span[class*='company']",
-                "a[class*='company']",
-                # Sélecteurs génériques
-                "h4",
-                "span[aria-label*='company']",
-                "div[aria-label*='company']"
-            ]
-            company_found = False
-            for selector in company_selectors:
-                try:
-                    company_elems = card.find_elements(By.CSS_SELECTOR, selector)
-                    for company_elem in company_elems:
-                        company_text = company_elem.text.strip()
-                        # Filtrer les éléments qui sont probablement des titres ou des dates
-                        if company_text and len(company_text) > 1 and len(company_text) < 100:
-                            # Exclure les dates et autres éléments
-                            if not any(word in company_text.lower() for word in ['il y a', 'ago', 'jour', 'day', 'semaine', 'week']):
-                                if company_text != job_data.get('title', ''):
-                                    job_data['company'] = company_text
-                                    company_found = True
-                                    break
-                    if company_found:
-                        break
-                except:
-                    continue
-            
-            # Fallback : chercher dans tous les éléments de la carte
-            if not company_found:
-                try:
-                    # Chercher tous les liens qui pourraient être des entreprises
-                    all_links = card.find_elements(By.CSS_SELECTOR, "a")
-                    for link in all_links:
-                        href = link.get_attribute('href') or ''
-                        text = link.text.strip()
-                        # Si le lien pointe vers une page entreprise
-                        if ('/company/' in href or '/companies/' in href) and text and len(text) < 100:
-                            job_data['company'] = text
-                            company_found = True
-                            break
-                except:
-                    pass
-            
-            if not company_found:
-                job_data['company'] = "N/A"
-            
-            # Localisation
-            location_selectors = [
-                "span.job-card-container__metadata-item",
-                "span.job-search-card__location",
-                "li.job-search-card__location",
-                "span[class*='location']"
-            ]
-            for selector in location_selectors:
-                try:
-                    location_elems = card.find_elements(By.CSS_SELECTOR, selector)
-                    if location_elems:
-                        job_data['location'] = location_elems[0].text.strip()
-                        break
-                except:
-                    continue
-            if 'location' not in job_data:
-                job_data['location'] = "N/A"
-            
-            # Date
-            date_selectors = [
-                "time.job-card-container__metadata-item",
-                "time.job-search-card__listdate",
-                "span.job-card-container__listed-time",
-                "time"
-            ]
-            for selector in date_selectors:
-                try:
-                    date_elem = card.find_element(By.CSS_SELECTOR, selector)
-                    job_data['date'] = date_elem.get_attribute('datetime') or date_elem.text.strip()
-                    if job_data['date']:
-                        break
-                except:
-                    continue
-            if 'date' not in job_data:
-                job_data['date'] = "N/A"
-            
-            job_data['description'] = ""  # Description vide pour extraction directe
-            job_data['scraped_at'] = get_timestamp()
-            
-            return job_data
-            
-        except Exception as e:
-            return None
-    
     def _extract_job_details(self, card, index=0):
         """Extrait les détails d'une offre d'emploi"""
         try:
-            job_data = {}
-            
             # Essayer de cliquer sur la carte pour charger les détails
             try:
                 # Scroller pour rendre l'élément visible
                 self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", card)
-                time.sleep(1)
                 # Essayer de cliquer avec JavaScript si le clic normal échoue
                 try:
                     card.click()
                 except:
                     # Si le clic normal échoue, utiliser JavaScript
                     self.driver.execute_script("arguments[0].click();", card)
-                time.sleep(2)
+                # Le panneau de détails est attendu plus bas via la description
+                wait_for_network_idle(self.driver, timeout=2)
             except Exception as e:
                 # Si même le clic JS échoue, continuer sans clic
                 pass
             
-            # Titre - plusieurs sélecteurs possibles
-            title_selectors = [
-                "a.job-card-list__title",
-                "a.base-card__full-link",
-                "h3.base-search-card__title a",
-                "span.job-search-card__title",
-                "a[data-control-name='job_card_title']"
-            ]
-            for selector in title_selectors:
-                try:
-                    title_elem = card.find_element(By.CSS_SELECTOR, selector)
-                    job_data['title'] = title_elem.text.strip()
-                    job_data['url'] = title_elem.get_attribute('href')
-                    break
-                except:
-                    continue
-            if 'title' not in job_data:
-                job_data['title'] = "N/A"
-                job_data['url'] = ""
-            
-            # Entreprise - plusieurs sélecteurs (carte + panneau de détails) avec améliorations
-            company_selectors = [
-                "h4.base-search-card__subtitle",
-                "h4.job-card-container__company-name",
-                "span.job-card-container__primary-description",
-                "a.job-card-container__company-name",
-                "a.base-card__full-link",
-                "span.job-card-container__company-name",
-                "div.job-card-container__company-name",
-                "h4[class*='company']",
-                "span[class*='company']",
-                "a[class*='company']",
-                "h4",
-                "span[aria-label*='company']"
-            ]
-            company_found = False
-            for selector in company_selectors:
-                try:
-                    company_elems = card.find_elements(By.CSS_SELECTOR, selector)
-                    for company_elem in company_elems:
-                        company_text = company_elem.text.strip()
-                        # Filtrer les éléments qui sont probablement des titres ou des dates
-                        if company_text and len(company_text) > 1 and len(company_text) < 100:
-                            # Exclure les dates et le titre
-                            if not any(word in company_text.lower() for word in ['il y a', 'ago', 'jour', 'day', 'semaine', 'week']):
-                                if company_text != job_data.get('title', ''):
-                                    job_data['company'] = company_text
-                                    company_found = True
-                                    break
-                    if company_found:
-                        break
-                except:
-                    continue
-            
-            # Fallback : chercher dans les liens de la carte
-            if not company_found:
-                try:
-                    all_links = card.find_elements(By.CSS_SELECTOR, "a")
-                    for link in all_links:
-                        href = link.get_attribute('href') or ''
-                        text = link.text.strip()
-                        # Si le lien pointe vers une page entreprise
-                        if ('/company/' in href or '/companies/' in href or '/in/company/' in href) and text and len(text) < 100:
-                            if text != job_data.get('title', ''):
-                                job_data['company'] = text
-                                company_found = True
-                                break
-                except:
-                    pass
-            
-            # Si pas trouvé dans la carte, essayer dans le panneau de détails
-            if not company_found:
-                try:
-                    detail_panel_selectors = [
-                        "div.jobs-details-top-card__company-name a",
-                        "a.jobs-details-top-card__company-name",
-                        "span.jobs-details-top-card__company-name",
-                        "h3.topcard__org-name",
-                        "a.topcard__org-name-link",
-                        "a[href*='/company/']",
-                        "a[href*='/companies/']"
-                    ]
-                    for selector in detail_panel_selectors:
-                        try:
-                            company_elems = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                            for company_elem in company_elems:
-                                company_text = company_elem.text.strip()
-                                if company_text and company_text != "" and len(company_text) < 100:
-                                    if company_text != job_data.get('title', ''):
-                                        job_data['company'] = company_text
-                                        company_found = True
-                                        break
-                            if company_found:
-                                break
-                        except:
-                            continue
-                except:
-                    pass
-            
-            if not company_found:
-                job_data['company'] = "N/A"
-            
-            # Localisation - plusieurs sélecteurs (carte + panneau de détails)
-            location_selectors = [
-                "span.job-card-container__metadata-item",
-                "span.job-search-card__location",
-                "li.job-search-card__location",
-                "span.job-card-container__metadata-wrapper",
-                "div.job-card-container__metadata-item"
-            ]
-            location_found = False
-            for selector in location_selectors:
-                try:
-                    location_elems = card.find_elements(By.CSS_SELECTOR, selector)
-                    for loc_elem in location_elems:
-                        loc_text = loc_elem.text.strip()
-                        # Filtrer les éléments qui contiennent "il y a" (dates) ou sont vides
-                        if loc_text and "il y a" not in loc_text.lower() and "ago" not in loc_text.lower() and len(loc_text) > 2:
-                            job_data['location'] = loc_text
-                            location_found = True
-                            break
-                    if location_found:
-                        break
-                except:
-                    continue
-            
-            # Si pas trouvé dans la carte, essayer dans le panneau de détails
-            if not location_found:
-                try:
-                    detail_location_selectors = [
-                        "span.jobs-details-top-card__bullet",
-                        "div.jobs-details-top-card__primary-description-without-tagline",
-                        "span.topcard__flavor--black-link",
-                        "div.topcard__flavor"
-                    ]
-                    for selector in detail_location_selectors:
-                        try:
-                            location_elems = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                            for loc_elem in location_elems:
-                                loc_text = loc_elem.text.strip()
-                                # Filtrer les dates et éléments vides
-                                if loc_text and "il y a" not in loc_text.lower() and "ago" not in loc_text.lower() and len(loc_text) > 2:
-                                    # Vérifier que ce n'est pas une date
-                                    if not any(char.isdigit() for char in loc_text[:3]):
-                                        job_data['location'] = loc_text
-                                        location_found = True
-                                        break
-                            if location_found:
-                                break
-                        except:
-                            continue
-                except:
-                    pass
-            
-            if not location_found:
-                job_data['location'] = "N/A"
+            # Champs de la carte (titre, entreprise, localisation, date)
+            job_data = self.plan.extract(card, self.offer_ids)
+            if not job_data:
+                return None
+            title = job_data['title']
             
-            # Date de publication - améliorée
-            date_selectors = [
-                "time.job-card-container__metadata-item",
-                "time.job-search-card__listdate",
-                "span.job-card-container__listed-time",
-                "time[datetime]",
-                "span[class*='date']",
-                "time"
-            ]
-            for selector in date_selectors:
-                try:
-                    date_elem = card.find_element(By.CSS_SELECTOR, selector)
-                    # Essayer d'abord l'attribut datetime
-                    date_text = date_elem.get_attribute('datetime')
-                    if not date_text:
-                        date_text = date_elem.text.strip()
-                    if date_text and date_text != "N/A":
-                        job_data['date'] = date_text
-                        break
-                except:
-                    continue
-            if 'date' not in job_data:
-                job_data['date'] = "N/A"
+            # Entreprise absente de la carte : panneau de détails
+            if job_data['company'] == "N/A":
+                company, _ = self.plan.first(
+                    self.driver, 'company_panel',
+                    lambda text: len(text) < 100 and text != title
+                )
+                if company:
+                    job_data['company'] = company
+            
+            # Localisation absente de la carte : panneau de détails (en excluant les dates)
+            if job_data['location'] == "N/A":
+                location, _ = self.plan.first(
+                    self.driver, 'location_panel',
+                    lambda text: len(text) > 2 and "il y a" not in text.lower() and "ago" not in text.lower()
+                    and not any(char.isdigit() for char in text[:3])
+                )
+                if location:
+                    job_data['location'] = location
             
             # Description (depuis le panneau de droite après clic)
-            desc_selectors = [
-                "div.show-more-less-html__markup",
-                "div.description__text",
-                "div.jobs-description__text"
-            ]
-            for selector in desc_selectors:
+            for selector in self.plan.fields['description']:
                 try:
                     description_elem = WebDriverWait(self.driver, 3).until(
                         EC.presence_of_element_located((By.CSS_SELECTOR, selector))
@@ -587,10 +301,6 @@ class LinkedInJobScraper:
                     break
                 except:
                     continue
-            if 'description' not in job_data:
-                job_data['description'] = ""
-            
-            job_data['scraped_at'] = get_timestamp()
             
             return job_data
             
@@ -602,27 +312,16 @@ class LinkedInJobScraper:
         """Récupère les détails complets d'une offre"""
         try:
             self.driver.get(job_url)
-            time.sleep(2)
+            wait_for_page_ready(self.driver)
             
-            details = {}
-            
-            # Description complète
+            # Description complète et critères (expérience, type de contrat, etc.)
             try:
-                desc_elem = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.show-more-less-html__markup"))
+                WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, ", ".join(self.plan.fields['full_description'])))
                 )
-                details['full_description'] = desc_elem.text.strip()
-            except:
-                details['full_description'] = ""
-            
-            # Critères (expérience, type de contrat, etc.)
-            try:
-                criteria = self.driver.find_elements(By.CSS_SELECTOR, "span.description__job-criteria-text")
-                details['criteria'] = [c.text for c in criteria]
             except:
-                details['criteria'] = []
-            
-            return details
+                pass
+            return self.plan.extract_details(self.driver)
             
         except Exception as e:
             print_error(f"Erreur lors de la récupération des détails: {str(e)}")
@@ -2,58 +2,40 @@
 Module de scraping pour l'APEC
 """
 import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from utils import print_success, print_error, print_info, print_warning, get_timestamp
+from waits import wait_for_page_ready, wait_for_stable_count, wait_for_network_idle
+from http_fetcher import fetch_cards, parse_page_source
+from metrics import timed
+from extraction_plan import get_extraction_plan
+from seen_index import should_stop_paging
+import config
+
+BASE_URL = "https://www.apec.fr"
 
 class ApecScraper:
     def __init__(self, headless=False):
         self.driver = None
         self.headless = headless
         self.jobs = []
+        self.seen_index = None  # SeenIndex en mode incrémental
+        self.offer_ids = set()  # Identifiants des offres déjà extraites (doublons ignorés)
+        self.pages_loaded = 0  # Pages de résultats chargées dans le navigateur (recyclage du pool)
+        self.plan = get_extraction_plan('apec')
         
-    def setup_driver(self):
-        """Configure le driver Selenium"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.maximize_window()
-        print_success("Driver Chrome initialisé pour l'APEC")
-        
+    @timed("search_jobs")
     def search_jobs(self, keywords, location="Toulouse", max_pages=3):
         """Recherche des offres d'emploi"""
         try:
             print_info(f"Recherche APEC: {keywords} - {location}")
             
-            # URL de recherche APEC - format direct
-            # L'APEC utilise un format d'URL spécifique
-            base_url = "https://www.apec.fr/candidat/recherche-emploi.html/emploi.html"
-            
-            # Construire l'URL avec les paramètres
-            params = {
-                "motsCles": keywords.replace(' ', '+'),
-                "lieux": location.replace(' ', '+'),
-                "page": 1
-            }
-            
-            query_string = "&".join([f"{k}={v}" for k, v in params.items()])
-            url = f"{base_url}?{query_string}"
-            
+            url = self._build_search_url(keywords, location)
             print_info(f"URL APEC: {url}")
             self.driver.get(url)
-            time.sleep(5)
+            wait_for_page_ready(self.driver)
             
             # Accepter les cookies si nécessaire
             try:
@@ -70,51 +52,28 @@ class ApecScraper:
                             EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                         )
                         accept_button.click()
-                        time.sleep(1)
                         break
                     except:
                         continue
             except:
                 pass
             
-            # Attendre que les résultats se chargent
-            time.sleep(3)
-            
             jobs = []
             for page in range(max_pages):
                 print_info(f"Page {page + 1}/{max_pages}...")
                 
-                time.sleep(3)
+                self.pages_loaded += 1
+                # Attendre que les résultats se chargent (nombre de cartes stable)
+                wait_for_stable_count(self.driver, self.plan.cards_selector, no_results=self.plan.no_results_selector)
                 
-                # Essayer plusieurs sélecteurs pour trouver les offres APEC
-                job_cards = []
-                selectors = [
-                    "article[class*='offer']",
-                    "div[class*='offer']",
-                    "li[class*='offer']",
-                    "a[href*='/offres-emploi/']",
-                    "div[class*='result']",
-                    "div[class*='job']",
-                    "div[data-offre-id]",
-                    "article[data-offre-id]",
-                    "div[class*='card']",
-                    "li[class*='result']",
-                    "div[class*='listing'] > div",
-                    "ul[class*='results'] > li"
-                ]
-                
-                for selector in selectors:
-                    try:
-                        job_cards = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        if job_cards:
-                            print_info(f"Trouvé {len(job_cards)} éléments avec le sélecteur: {selector}")
-                            # Filtrer pour ne garder que ceux qui ressemblent à des offres
-                            job_cards = [c for c in job_cards if c.text.strip() and len(c.text.strip()) > 20]
-                            if job_cards:
-                                print_info(f"Après filtrage: {len(job_cards)} offres valides")
-                                break
-                    except:
-                        continue
+                # Cartes avec du contenu, premier sélecteur qui en trouve (le dernier gagnant d'abord)
+                if config.SCRAPING_CONFIG["batch_extraction"]:
+                    # Une seule lecture du DOM pour toute la page au lieu d'un aller-retour WebDriver par champ
+                    job_cards = self.plan.select_cards(parse_page_source(self.driver))
+                else:
+                    job_cards = self.plan.select_cards(self.driver)
+                if job_cards:
+                    print_info(f"Trouvé {len(job_cards)} offres avec le sélecteur: {self.plan.last_matched('cards')}")
                 
                 if not job_cards:
                     print_warning("Aucune offre trouvée. Vérification de la page...")
@@ -131,15 +90,20 @@ class ApecScraper:
                 
                 print_info(f"Extraction de {len(job_cards)} offres sur la page {page + 1}")
                 
+                page_start = len(jobs)
                 for i, card in enumerate(job_cards[:30]):  # Limiter à 30 par page
                     try:
-                        job_data = self._extract_job_details(card, i)
+                        job_data = self.plan.extract(card, self.offer_ids)
                         if job_data and job_data.get('title') and job_data.get('title') != 'N/A':
                             jobs.append(job_data)
                             print_info(f"  ✓ {job_data.get('title', 'N/A')[:50]}...")
                     except Exception as e:
                         continue
                 
+                # Mode incrémental : page déjà connue, inutile de charger les suivantes
+                if should_stop_paging(self.seen_index, jobs[page_start:], "APEC"):
+                    break
+                
                 # Passer à la page suivante
                 if page < max_pages - 1:
                     try:
@@ -156,7 +120,7 @@ class ApecScraper:
                                 next_button = self.driver.find_element(By.CSS_SELECTOR, selector)
                                 if next_button and next_button.is_enabled():
                                     next_button.click()
-                                    time.sleep(3)
+                                    wait_for_network_idle(self.driver)
                                     break
                             except:
                                 continue
@@ -174,162 +138,51 @@ class ApecScraper:
             print_error(f"Erreur lors de la recherche: {str(e)}")
             return []
     
-    def _extract_job_details(self, card, index=0):
-        """Extrait les détails d'une offre"""
-        try:
-            job_data = {'source': 'APEC'}
-            
-            # Titre - plusieurs sélecteurs possibles
-            title_selectors = [
-                "h2 a", "h3 a", "h4 a",
-                "a[class*='title']",
-                "span[class*='title']",
-                "div[class*='title']",
-                "h2", "h3", "h4",
-                "a[href*='/offres-emploi/']",
-                "a[href*='/offre']"
-            ]
-            
-            for selector in title_selectors:
-                try:
-                    title_elem = card.find_element(By.CSS_SELECTOR, selector)
-                    title_text = title_elem.text.strip()
-                    if title_text and len(title_text) > 5:  # Vérifier que c'est un vrai titre
-                        job_data['title'] = title_text
-                        if title_elem.tag_name == 'a':
-                            job_data['url'] = title_elem.get_attribute('href')
-                        break
-                except:
-                    continue
-            
-            # Si pas de titre trouvé, essayer de prendre le texte principal
-            if 'title' not in job_data:
-                try:
-                    # Prendre le premier lien ou le texte principal
-                    all_links = card.find_elements(By.CSS_SELECTOR, "a")
-                    for link in all_links:
-                        link_text = link.text.strip()
-                        if link_text and len(link_text) > 10 and len(link_text) < 200:
-                            job_data['title'] = link_text
-                            job_data['url'] = link.get_attribute('href')
-                            break
-                except:
-                    pass
-            
-            if 'title' not in job_data or not job_data.get('title'):
-                return None
-            
-            # URL si pas déjà trouvée
-            if 'url' not in job_data or not job_data['url']:
-                try:
-                    link_elem = card.find_element(By.CSS_SELECTOR, "a")
-                    job_data['url'] = link_elem.get_attribute('href')
-                    if job_data['url'] and not job_data['url'].startswith('http'):
-                        job_data['url'] = f"https://www.apec.fr{job_data['url']}"
-                except:
-                    job_data['url'] = ""
-            
-            # Entreprise - sélecteurs améliorés pour APEC avec fallback
-            company_selectors = [
-                "span.card-offer__company",
-                "div.card-offer__company",
-                "a.card-offer__company",
-                "span[class*='company']",
-                "div[class*='company']",
-                "a[class*='company']",
-                "span[data-cy='company-name']",
-                "div[data-cy='company-name']",
-                "h3.card-offer__company-name",
-                "span.offre-emploi__company",
-                "p[class*='company']"
-            ]
-            company_found = False
-            for selector in company_selectors:
-                try:
-                    company_elems = card.find_elements(By.CSS_SELECTOR, selector)
-                    for company_elem in company_elems:
-                        company_text = company_elem.text.strip()
-                        if company_text and company_text != "" and len(company_text) > 1 and len(company_text) < 100:
-                            if company_text != job_data.get('title', ''):
-                                job_data['company'] = company_text
-                                company_found = True
-                                break
-                    if company_found:
-                        break
-                except:
-                    continue
-            
-            # Fallback : chercher dans tous les éléments texte
-            if not company_found:
-                try:
-                    all_elements = card.find_elements(By.CSS_SELECTOR, "span, div, p, a")
-                    for elem in all_elements:
-                        text = elem.text.strip()
-                        if text and 2 < len(text) < 50:
-                            if not any(word in text.lower() for word in ['il y a', 'ago', 'jour', 'day', '€', 'k€', 'france', 'toulouse', 'paris']):
-                                if text != job_data.get('title', '') and text != job_data.get('location', ''):
-                                    job_data['company'] = text
-                                    company_found = True
-                                    break
-                except:
-                    pass
-            
-            if not company_found:
-                job_data['company'] = "N/A"
-            
-            # Localisation - sélecteurs améliorés pour APEC
-            location_selectors = [
-                "span.card-offer__location",
-                "div.card-offer__location",
-                "span[class*='location']",
-                "div[class*='location']",
-                "span[data-cy='location']",
-                "div[data-cy='location']",
-                "span.offre-emploi__location",
-                "div.offre-emploi__location",
-                "span[aria-label*='localisation']"
-            ]
-            location_found = False
-            for selector in location_selectors:
-                try:
-                    location_elems = card.find_elements(By.CSS_SELECTOR, selector)
-                    for loc_elem in location_elems:
-                        loc_text = loc_elem.text.strip()
-                        # Filtrer les éléments vides et les dates
-                        if loc_text and len(loc_text) > 1 and "il y a" not in loc_text.lower() and "ago" not in loc_text.lower():
-                            job_data['location'] = loc_text
-                            location_found = True
-                            break
-                    if location_found:
-                        break
-                except:
-                    continue
-            if not location_found:
-                job_data['location'] = "N/A"
-            
-            # Date de publication
-            date_selectors = [
-                "time", "span[class*='date'], div[class*='date'], span[class*='published']"
-            ]
-            for selector in date_selectors:
+    def _build_search_url(self, keywords, location, page=1):
+        """Construit l'URL de recherche APEC (format direct)"""
+        params = {
+            "motsCles": keywords.replace(' ', '+'),
+            "lieux": location.replace(' ', '+'),
+            "page": page
+        }
+        query_string = "&".join([f"{k}={v}" for k, v in params.items()])
+        return f"{BASE_URL}/candidat/recherche-emploi.html/emploi.html?{query_string}"
+    
+    @timed("search_jobs_http")
+    def search_jobs_http(self, keywords, location="Toulouse", max_pages=3):
+        """
+        Recherche via HTTP simple, sans navigateur
+        
+        Returns:
+            Liste des offres, ou None si la page nécessite JavaScript (repli sur Selenium)
+        """
+        print_info(f"Recherche APEC (HTTP): {keywords} - {location}")
+        
+        jobs = []
+        for page in range(1, max_pages + 1):
+            job_cards = fetch_cards(self._build_search_url(keywords, location, page), self.plan)
+            if job_cards is None:
+                break
+            
+            print_info(f"Extraction de {len(job_cards)} offres sur la page {page}")
+            page_start = len(jobs)
+            for card in job_cards[:30]:
                 try:
-                    date_elem = card.find_element(By.CSS_SELECTOR, selector)
-                    date_text = date_elem.get_attribute('datetime') or date_elem.text.strip()
-                    if date_text:
-                        job_data['date'] = date_text
-                        break
-                except:
+                    job_data = self.plan.extract(card, self.offer_ids)
+                except Exception:
                     continue
-            if 'date' not in job_data:
-                job_data['date'] = "N/A"
-            
-            job_data['description'] = ""
-            job_data['scraped_at'] = get_timestamp()
-            
-            return job_data
-            
-        except Exception as e:
+                if job_data:
+                    jobs.append(job_data)
+            if should_stop_paging(self.seen_index, jobs[page_start:], "APEC"):
+                break
+        
+        if not jobs:
+            print_info("Aucune offre dans le HTML statique, passage à Selenium")
             return None
+        
+        self.jobs.extend(jobs)
+        print_success(f"{len(jobs)} offres trouvées sur l'APEC (HTTP)")
+        return jobs
     
     def close(self):
         """Ferme le driver"""
@@ -2,78 +2,70 @@
 Module de scraping pour La Bonne Alternance (Pôle Emploi)
 """
 import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from utils import print_success, print_error, print_info, print_warning, get_timestamp
+from waits import wait_for_page_ready, wait_for_stable_count, wait_for_network_idle
+from http_fetcher import fetch_cards, parse_page_source
+from metrics import timed
+from extraction_plan import get_extraction_plan
+from seen_index import should_stop_paging
+import config
+
+BASE_URL = "https://labonnealternance.apprentissage.beta.gouv.fr"
 
 class BonneAlternanceScraper:
     def __init__(self, headless=False):
         self.driver = None
         self.headless = headless
         self.jobs = []
+        self.seen_index = None  # SeenIndex en mode incrémental
+        self.offer_ids = set()  # Identifiants des offres déjà extraites (doublons ignorés)
+        self.pages_loaded = 0  # Pages de résultats chargées dans le navigateur (recyclage du pool)
+        self.plan = get_extraction_plan('bonnealternance')
         
-    def setup_driver(self):
-        """Configure le driver Selenium"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.maximize_window()
-        print_success("Driver Chrome initialisé pour La Bonne Alternance")
-        
+    @timed("search_jobs")
     def search_jobs(self, keywords, location="Haute-Garonne", max_pages=3):
         """Recherche des offres d'emploi"""
         try:
             print_info(f"Recherche La Bonne Alternance: {keywords} - {location}")
             
-            # URL de recherche La Bonne Alternance
-            base_url = "https://labonnealternance.apprentissage.beta.gouv.fr"
-            # Format: /recherche-apprentissage?romes=M1805&location=31000
-            
-            # Essayer avec le code postal de Toulouse (31000) ou le nom
-            location_code = "31000" if "toulouse" in location.lower() or "haute-garonne" in location.lower() else location
-            
-            url = f"{base_url}/recherche-apprentissage?romes=M1805&location={location_code}"
-            
+            url = self._build_search_url(location)
             self.driver.get(url)
-            time.sleep(4)
+            wait_for_page_ready(self.driver)
             
             jobs = []
             for page in range(max_pages):
                 print_info(f"Page {page + 1}/{max_pages}...")
                 
-                time.sleep(2)
+                self.pages_loaded += 1
                 
-                # Trouver les offres
-                job_cards = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    "article[class*='offer'], div[class*='offer'], li[class*='offer']"
-                )
+                wait_for_stable_count(self.driver, self.plan.cards_selector, no_results=self.plan.no_results_selector)
                 
-                if not job_cards:
-                    job_cards = self.driver.find_elements(By.CSS_SELECTOR, "div[class*='result'], div[class*='job']")
+                # Trouver les offres
+                if config.SCRAPING_CONFIG["batch_extraction"]:
+                    # Une seule lecture du DOM pour toute la page au lieu d'un aller-retour WebDriver par champ
+                    job_cards = self.plan.select_cards(parse_page_source(self.driver))
+                else:
+                    job_cards = self.plan.select_cards(self.driver)
                 
                 print_info(f"Trouvé {len(job_cards)} offres sur la page {page + 1}")
                 
+                page_start = len(jobs)
                 for card in job_cards:
                     try:
-                        job_data = self._extract_job_details(card)
+                        job_data = self.plan.extract(card, self.offer_ids)
                         if job_data:
                             jobs.append(job_data)
                     except Exception as e:
                         continue
                 
+                # Mode incrémental : page déjà connue, inutile de charger les suivantes
+                if should_stop_paging(self.seen_index, jobs[page_start:], "La Bonne Alternance"):
+                    break
+                
                 # Passer à la page suivante
                 if page < max_pages - 1:
                     try:
@@ -82,7 +74,7 @@ class BonneAlternanceScraper:
                             "a[aria-label='Suivant'], a[class*='next']"
                         )
                         next_button.click()
-                        time.sleep(3)
+                        wait_for_network_idle(self.driver)
                     except:
                         break
             
@@ -94,113 +86,40 @@ class BonneAlternanceScraper:
             print_error(f"Erreur lors de la recherche: {str(e)}")
             return []
     
-    def _extract_job_details(self, card):
-        """Extrait les détails d'une offre"""
-        try:
-            job_data = {'source': 'La Bonne Alternance'}
-            
-            # Titre
-            title_selectors = ["h2", "h3", "a[class*='title']", "span[class*='title']"]
-            for selector in title_selectors:
-                try:
-                    title_elem = card.find_element(By.CSS_SELECTOR, selector)
-                    job_data['title'] = title_elem.text.strip()
-                    break
-                except:
-                    continue
-            
-            if 'title' not in job_data:
-                return None
-            
-            # URL
+    def _build_search_url(self, location):
+        """Construit l'URL de recherche La Bonne Alternance"""
+        # Format: /recherche-apprentissage?romes=M1805&location=31000
+        # Essayer avec le code postal de Toulouse (31000) ou le nom
+        location_code = "31000" if "toulouse" in location.lower() or "haute-garonne" in location.lower() else location
+        return f"{BASE_URL}/recherche-apprentissage?romes=M1805&location={location_code}"
+    
+    @timed("search_jobs_http")
+    def search_jobs_http(self, keywords, location="Haute-Garonne", max_pages=3):
+        """
+        Recherche via HTTP simple, sans navigateur (les résultats tiennent sur une page)
+        
+        Returns:
+            Liste des offres, ou None si la page nécessite JavaScript (repli sur Selenium)
+        """
+        print_info(f"Recherche La Bonne Alternance (HTTP): {keywords} - {location}")
+        
+        jobs = []
+        cards = fetch_cards(self._build_search_url(location), self.plan) or []
+        for card in cards:
             try:
-                link_elem = card.find_element(By.CSS_SELECTOR, "a")
-                job_data['url'] = link_elem.get_attribute('href')
-            except:
-                job_data['url'] = ""
-            
-            # Entreprise - sélecteurs améliorés pour La Bonne Alternance avec fallback
-            company_selectors = [
-                "span[class*='company']",
-                "div[class*='company']",
-                "a[class*='company']",
-                "span[data-company]",
-                "div[data-company]",
-                "span.entreprise",
-                "div.entreprise",
-                "p[class*='company']",
-                "p[data-testid='company-name']"
-            ]
-            company_found = False
-            for selector in company_selectors:
-                try:
-                    company_elems = card.find_elements(By.CSS_SELECTOR, selector)
-                    for company_elem in company_elems:
-                        company_text = company_elem.text.strip()
-                        if company_text and company_text != "" and len(company_text) > 1 and len(company_text) < 100:
-                            if company_text != job_data.get('title', ''):
-                                job_data['company'] = company_text
-                                company_found = True
-                                break
-                    if company_found:
-                        break
-                except:
-                    continue
-            
-            # Fallback : chercher dans tous les éléments texte
-            if not company_found:
-                try:
-                    all_elements = card.find_elements(By.CSS_SELECTOR, "span, div, p, a")
-                    for elem in all_elements:
-                        text = elem.text.strip()
-                        if text and 2 < len(text) < 50:
-                            if not any(word in text.lower() for word in ['il y a', 'ago', 'jour', 'day', '€', 'k€', 'france', 'toulouse', 'paris']):
-                                if text != job_data.get('title', '') and text != job_data.get('location', ''):
-                                    job_data['company'] = text
-                                    company_found = True
-                                    break
-                except:
-                    pass
-            
-            if not company_found:
-                job_data['company'] = "N/A"
-            
-            # Localisation - sélecteurs améliorés pour La Bonne Alternance
-            location_selectors = [
-                "span[class*='location']",
-                "div[class*='location']",
-                "span[data-location]",
-                "div[data-location]",
-                "span.localisation",
-                "div.localisation",
-                "span[aria-label*='localisation']"
-            ]
-            location_found = False
-            for selector in location_selectors:
-                try:
-                    location_elems = card.find_elements(By.CSS_SELECTOR, selector)
-                    for loc_elem in location_elems:
-                        loc_text = loc_elem.text.strip()
-                        # Filtrer les éléments vides et les dates
-                        if loc_text and len(loc_text) > 1 and "il y a" not in loc_text.lower() and "ago" not in loc_text.lower():
-                            job_data['location'] = loc_text
-                            location_found = True
-                            break
-                    if location_found:
-                        break
-                except:
-                    continue
-            if not location_found:
-                job_data['location'] = "N/A"
-            
-            job_data['date'] = "N/A"
-            job_data['description'] = ""
-            job_data['scraped_at'] = get_timestamp()
-            
-            return job_data
-            
-        except Exception as e:
+                job_data = self.plan.extract(card, self.offer_ids)
+            except Exception:
+                continue
+            if job_data:
+                jobs.append(job_data)
+        
+        if not jobs:
+            print_info("Aucune offre dans le HTML statique, passage à Selenium")
             return None
+        
+        self.jobs.extend(jobs)
+        print_success(f"{len(jobs)} offres trouvées sur La Bonne Alternance (HTTP)")
+        return jobs
     
     def close(self):
         """Ferme le driver"""
@@ -2,80 +2,70 @@
 Module de scraping pour Free-Work
 """
 import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from utils import print_success, print_error, print_info, print_warning, get_timestamp
+from waits import wait_for_page_ready, wait_for_stable_count, wait_for_network_idle
+from http_fetcher import fetch_cards, parse_page_source
+from metrics import timed
+from extraction_plan import get_extraction_plan
+from seen_index import should_stop_paging
+import config
+
+BASE_URL = "https://www.free-work.com"
 
 class FreeWorkScraper:
     def __init__(self, headless=False):
         self.driver = None
         self.headless = headless
         self.jobs = []
+        self.seen_index = None  # SeenIndex en mode incrémental
+        self.offer_ids = set()  # Identifiants des offres déjà extraites (doublons ignorés)
+        self.pages_loaded = 0  # Pages de résultats chargées dans le navigateur (recyclage du pool)
+        self.plan = get_extraction_plan('freework')
         
-    def setup_driver(self):
-        """Configure le driver Selenium"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.maximize_window()
-        print_success("Driver Chrome initialisé pour Free-Work")
-        
+    @timed("search_jobs")
     def search_jobs(self, keywords, location="Haute-Garonne", max_pages=3):
         """Recherche des offres d'emploi"""
         try:
             print_info(f"Recherche Free-Work: {keywords} - {location}")
             
-            # URL de recherche Free-Work
-            base_url = "https://www.free-work.com/fr/jobs"
-            params = {
-                "q": keywords,
-                "location": location,
-                "page": 1
-            }
-            
-            query_string = "&".join([f"{k}={v}" for k, v in params.items() if v])
-            url = f"{base_url}?{query_string}"
-            
+            url = self._build_search_url(keywords, location)
             self.driver.get(url)
-            time.sleep(3)
+            wait_for_page_ready(self.driver)
             
             jobs = []
             for page in range(max_pages):
                 print_info(f"Page {page + 1}/{max_pages}...")
                 
-                time.sleep(2)
+                self.pages_loaded += 1
                 
-                # Trouver les offres
-                job_cards = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    "article[class*='job'], div[class*='job-card'], a[href*='/jobs/']"
-                )
+                wait_for_stable_count(self.driver, self.plan.cards_selector, no_results=self.plan.no_results_selector)
                 
-                if not job_cards:
-                    job_cards = self.driver.find_elements(By.CSS_SELECTOR, "div[class*='result'], li[class*='job']")
+                # Trouver les offres
+                if config.SCRAPING_CONFIG["batch_extraction"]:
+                    # Une seule lecture du DOM pour toute la page au lieu d'un aller-retour WebDriver par champ
+                    job_cards = self.plan.select_cards(parse_page_source(self.driver))
+                else:
+                    job_cards = self.plan.select_cards(self.driver)
                 
                 print_info(f"Trouvé {len(job_cards)} offres sur la page {page + 1}")
                 
+                page_start = len(jobs)
                 for card in job_cards:
                     try:
-                        job_data = self._extract_job_details(card)
+                        job_data = self.plan.extract(card, self.offer_ids)
                         if job_data:
                             jobs.append(job_data)
                     except Exception as e:
                         continue
                 
+                # Mode incrémental : page déjà connue, inutile de charger les suivantes
+                if should_stop_paging(self.seen_index, jobs[page_start:], "Free-Work"):
+                    break
+                
                 # Passer à la page suivante
                 if page < max_pages - 1:
                     try:
@@ -84,7 +74,7 @@ class FreeWorkScraper:
                             "a[aria-label='Suivant'], a[class*='next'], button[class*='next']"
                         )
                         next_button.click()
-                        time.sleep(3)
+                        wait_for_network_idle(self.driver)
                     except:
                         break
             
@@ -96,118 +86,50 @@ class FreeWorkScraper:
             print_error(f"Erreur lors de la recherche: {str(e)}")
             return []
     
-    def _extract_job_details(self, card):
-        """Extrait les détails d'une offre"""
-        try:
-            job_data = {'source': 'Free-Work'}
-            
-            # Titre
-            title_selectors = ["h2 a", "h3 a", "a[class*='title']", "h2", "h3"]
-            for selector in title_selectors:
-                try:
-                    title_elem = card.find_element(By.CSS_SELECTOR, selector)
-                    job_data['title'] = title_elem.text.strip()
-                    if title_elem.tag_name == 'a':
-                        job_data['url'] = title_elem.get_attribute('href')
-                    break
-                except:
-                    continue
-            
-            if 'title' not in job_data:
-                return None
-            
-            # URL
-            if 'url' not in job_data or not job_data['url']:
-                try:
-                    link_elem = card.find_element(By.CSS_SELECTOR, "a")
-                    job_data['url'] = link_elem.get_attribute('href')
-                except:
-                    job_data['url'] = ""
-            
-            # Entreprise - sélecteurs améliorés pour Free-Work avec fallback
-            company_selectors = [
-                "span[class*='company']",
-                "div[class*='company']",
-                "a[class*='company']",
-                "span.offre-emploi__company",
-                "div.offre-emploi__company",
-                "span[data-cy='job-card-company-link']",
-                "a[data-cy='job-card-company-link']",
-                "p[class*='company']"
-            ]
-            company_found = False
-            for selector in company_selectors:
-                try:
-                    company_elems = card.find_elements(By.CSS_SELECTOR, selector)
-                    for company_elem in company_elems:
-                        company_text = company_elem.text.strip()
-                        if company_text and company_text != "" and len(company_text) > 1 and len(company_text) < 100:
-                            if company_text != job_data.get('title', ''):
-                                job_data['company'] = company_text
-                                company_found = True
-                                break
-                    if company_found:
-                        break
-                except:
-                    continue
-            
-            # Fallback : chercher dans tous les éléments texte
-            if not company_found:
-                try:
-                    all_elements = card.find_elements(By.CSS_SELECTOR, "span, div, p, a")
-                    for elem in all_elements:
-                        text = elem.text.strip()
-                        if text and 2 < len(text) < 50:
-                            if not any(word in text.lower() for word in ['il y a', 'ago', 'jour', 'day', '€', 'k€', 'france', 'toulouse', 'paris']):
-                                if text != job_data.get('title', '') and text != job_data.get('location', ''):
-                                    job_data['company'] = text
-                                    company_found = True
-                                    break
-                except:
-                    pass
-            
-            if not company_found:
-                job_data['company'] = "N/A"
-            
-            # Localisation - sélecteurs améliorés pour Free-Work
-            location_selectors = [
-                "span[class*='location']",
-                "div[class*='location']",
-                "span.offre-emploi__location",
-                "div.offre-emploi__location"
-            ]
-            location_found = False
-            for selector in location_selectors:
+    def _build_search_url(self, keywords, location, page=1):
+        """Construit l'URL de recherche Free-Work"""
+        params = {
+            "q": keywords,
+            "location": location,
+            "page": page
+        }
+        query_string = "&".join([f"{k}={v}" for k, v in params.items() if v])
+        return f"{BASE_URL}/fr/jobs?{query_string}"
+    
+    @timed("search_jobs_http")
+    def search_jobs_http(self, keywords, location="Haute-Garonne", max_pages=3):
+        """
+        Recherche via HTTP simple, sans navigateur
+        
+        Returns:
+            Liste des offres, ou None si la page nécessite JavaScript (repli sur Selenium)
+        """
+        print_info(f"Recherche Free-Work (HTTP): {keywords} - {location}")
+        
+        jobs = []
+        for page in range(1, max_pages + 1):
+            cards = fetch_cards(self._build_search_url(keywords, location, page), self.plan)
+            if cards is None:
+                break
+            print_info(f"Trouvé {len(cards)} offres sur la page {page}")
+            page_start = len(jobs)
+            for card in cards:
                 try:
-                    location_elems = card.find_elements(By.CSS_SELECTOR, selector)
-                    for loc_elem in location_elems:
-                        loc_text = loc_elem.text.strip()
-                        # Filtrer les éléments vides et les dates
-                        if loc_text and len(loc_text) > 1 and "il y a" not in loc_text.lower() and "ago" not in loc_text.lower():
-                            job_data['location'] = loc_text
-                            location_found = True
-                            break
-                    if location_found:
-                        break
-                except:
+                    job_data = self.plan.extract(card, self.offer_ids)
+                except Exception:
                     continue
-            if not location_found:
-                job_data['location'] = "N/A"
-            
-            # Date
-            try:
-                date_elem = card.find_element(By.CSS_SELECTOR, "time, span[class*='date']")
-                job_data['date'] = date_elem.get_attribute('datetime') or date_elem.text.strip()
-            except:
-                job_data['date'] = "N/A"
-            
-            job_data['description'] = ""
-            job_data['scraped_at'] = get_timestamp()
-            
-            return job_data
-            
-        except Exception as e:
+                if job_data:
+                    jobs.append(job_data)
+            if should_stop_paging(self.seen_index, jobs[page_start:], "Free-Work"):
+                break
+        
+        if not jobs:
+            print_info("Aucune offre dans le HTML statique, passage à Selenium")
             return None
+        
+        self.jobs.extend(jobs)
+        print_success(f"{len(jobs)} offres trouvées sur Free-Work (HTTP)")
+        return jobs
     
     def close(self):
         """Ferme le driver"""
@@ -2,54 +2,39 @@
 Module de scraping pour Indeed
 """
 import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from utils import print_success, print_error, print_info, get_timestamp
+from waits import wait_for_page_ready, wait_for_stable_count, wait_for_network_idle
+from http_fetcher import fetch_cards, parse_page_source
+from metrics import timed
+from extraction_plan import get_extraction_plan
+from seen_index import should_stop_paging
+import config
+
+BASE_URL = "https://fr.indeed.com"
 
 class IndeedScraper:
     def __init__(self, headless=False):
         self.driver = None
         self.headless = headless
         self.jobs = []
+        self.seen_index = None  # SeenIndex en mode incrémental
+        self.offer_ids = set()  # Identifiants des offres déjà extraites (doublons ignorés)
+        self.pages_loaded = 0  # Pages de résultats chargées dans le navigateur (recyclage du pool)
+        self.plan = get_extraction_plan('indeed')
         
-    def setup_driver(self):
-        """Configure le driver Selenium"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36")
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.maximize_window()
-        print_success("Driver Chrome initialisé pour Indeed")
-        
+    @timed("search_jobs")
     def search_jobs(self, keywords, location="Toulouse", max_pages=3):
         """Recherche des offres d'emploi"""
         try:
             print_info(f"Recherche Indeed: {keywords} - {location}")
             
-            # URL de recherche Indeed
-            base_url = "https://fr.indeed.com/jobs"
-            params = {
-                "q": keywords,
-                "l": location,
-                "start": 0
-            }
-            
-            query_string = "&".join([f"{k}={v}" for k, v in params.items() if v])
-            url = f"{base_url}?{query_string}"
-            
+            url = self._build_search_url(keywords, location)
             self.driver.get(url)
-            time.sleep(3)
+            wait_for_page_ready(self.driver)
             
             # Accepter les cookies si nécessaire
             try:
@@ -57,7 +42,6 @@ class IndeedScraper:
                     EC.element_to_be_clickable((By.ID, "onetrust-accept-btn-handler"))
                 )
                 accept_button.click()
-                time.sleep(1)
             except:
                 pass
             
@@ -65,24 +49,32 @@ class IndeedScraper:
             for page in range(max_pages):
                 print_info(f"Page {page + 1}/{max_pages}...")
                 
-                time.sleep(2)
+                self.pages_loaded += 1
+                
+                wait_for_stable_count(self.driver, self.plan.cards_selector, no_results=self.plan.no_results_selector)
                 
                 # Trouver les offres
-                job_cards = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    "div[data-jk], div[class*='job_seen_beacon'], td[class*='resultContent']"
-                )
+                if config.SCRAPING_CONFIG["batch_extraction"]:
+                    # Une seule lecture du DOM pour toute la page au lieu d'un aller-retour WebDriver par champ
+                    job_cards = self.plan.select_cards(parse_page_source(self.driver))
+                else:
+                    job_cards = self.plan.select_cards(self.driver)
                 
                 print_info(f"Trouvé {len(job_cards)} offres sur la page {page + 1}")
                 
+                page_start = len(jobs)
                 for card in job_cards:
                     try:
-                        job_data = self._extract_job_details(card)
+                        job_data = self.plan.extract(card, self.offer_ids)
                         if job_data:
                             jobs.append(job_data)
                     except Exception as e:
                         continue
                 
+                # Mode incrémental : page déjà connue, inutile de charger les suivantes
+                if should_stop_paging(self.seen_index, jobs[page_start:], "Indeed"):
+                    break
+                
                 # Passer à la page suivante
                 if page < max_pages - 1:
                     try:
@@ -91,7 +83,7 @@ class IndeedScraper:
                             "a[aria-label='Suivant'], a[data-testid='pagination-page-next']"
                         )
                         next_button.click()
-                        time.sleep(3)
+                        wait_for_network_idle(self.driver)
                     except:
                         break
             
@@ -103,127 +95,50 @@ class IndeedScraper:
             print_error(f"Erreur lors de la recherche: {str(e)}")
             return []
     
-    def _extract_job_details(self, card):
-        """Extrait les détails d'une offre"""
-        try:
-            job_data = {'source': 'Indeed'}
-            
-            # Titre
-            try:
-                title_elem = card.find_element(By.CSS_SELECTOR, "h2 a, a[class*='jobTitle']")
-                job_data['title'] = title_elem.text.strip()
-                job_data['url'] = title_elem.get_attribute('href')
-                if job_data['url'] and not job_data['url'].startswith('http'):
-                    job_data['url'] = f"https://fr.indeed.com{job_data['url']}"
-            except:
-                try:
-                    title_elem = card.find_element(By.CSS_SELECTOR, "h2, span[title]")
-                    job_data['title'] = title_elem.text.strip()
-                    job_data['url'] = ""
-                except:
-                    return None
-            
-            # Entreprise - sélecteurs améliorés avec fallback
-            company_selectors = [
-                "span[class*='companyName']",
-                "span[data-testid='company-name']",
-                "a[data-testid='company-name']",
-                "span.companyName",
-                "a.companyName",
-                "span[class*='company']",
-                "div[class*='companyName']",
-                "span[data-testid='company']",
-                "a[data-testid='company']"
-            ]
-            company_found = False
-            for selector in company_selectors:
-                try:
-                    company_elems = card.find_elements(By.CSS_SELECTOR, selector)
-                    for company_elem in company_elems:
-                        company_text = company_elem.text.strip()
-                        if company_text and company_text != "" and len(company_text) < 100:
-                            if company_text != job_data.get('title', ''):
-                                job_data['company'] = company_text
-                                company_found = True
-                                break
-                    if company_found:
-                        break
-                except:
-                    continue
-            
-            # Fallback : chercher dans tous les spans et divs
-            if not company_found:
-                try:
-                    # Chercher tous les éléments texte qui pourraient être l'entreprise
-                    all_spans = card.find_elements(By.CSS_SELECTOR, "span, div, a")
-                    for elem in all_spans:
-                        text = elem.text.strip()
-                        # Filtrer : doit être court, pas une date, pas le titre
-                        if text and 2 < len(text) < 50:
-                            if not any(word in text.lower() for word in ['il y a', 'ago', 'jour', 'day', '€', 'k€']):
-                                if text != job_data.get('title', ''):
-                                    # Vérifier si c'est probablement une entreprise (pas une localisation typique)
-                                    if not any(word in text.lower() for word in ['france', 'toulouse', 'paris', 'lyon', 'remote', 'télétravail']):
-                                        job_data['company'] = text
-                                        company_found = True
-                                        break
-                except:
-                    pass
-            
-            if not company_found:
-                job_data['company'] = "N/A"
-            
-            # Localisation - sélecteurs améliorés
-            location_selectors = [
-                "div[class*='companyLocation']",
-                "div[data-testid='text-location']",
-                "span[data-testid='text-location']",
-                "div.companyLocation",
-                "span.companyLocation",
-                "div[class*='location']",
-                "span[class*='location']"
-            ]
-            location_found = False
-            for selector in location_selectors:
-                try:
-                    location_elems = card.find_elements(By.CSS_SELECTOR, selector)
-                    for loc_elem in location_elems:
-                        loc_text = loc_elem.text.strip()
-                        # Filtrer les éléments vides et les dates
-                        if loc_text and len(loc_text) > 1 and "il y a" not in loc_text.lower() and "ago" not in loc_text.lower():
-                            job_data['location'] = loc_text
-                            location_found = True
-                            break
-                    if location_found:
-                        break
-                except:
-                    continue
-            if not location_found:
-                job_data['location'] = "N/A"
-            
-            # Date de publication
-            date_selectors = [
-                "span[class*='date']", "time", "span[class*='posted']", "span[data-testid='myJobsStateDate']"
-            ]
-            for selector in date_selectors:
+    def _build_search_url(self, keywords, location, page=0):
+        """Construit l'URL de recherche Indeed (10 offres par page)"""
+        params = {
+            "q": keywords,
+            "l": location,
+            "start": page * 10
+        }
+        query_string = "&".join([f"{k}={v}" for k, v in params.items() if v])
+        return f"{BASE_URL}/jobs?{query_string}"
+    
+    @timed("search_jobs_http")
+    def search_jobs_http(self, keywords, location="Toulouse", max_pages=3):
+        """
+        Recherche via HTTP simple, sans navigateur
+        
+        Returns:
+            Liste des offres, ou None si la page nécessite JavaScript (repli sur Selenium)
+        """
+        print_info(f"Recherche Indeed (HTTP): {keywords} - {location}")
+        
+        jobs = []
+        for page in range(max_pages):
+            cards = fetch_cards(self._build_search_url(keywords, location, page), self.plan)
+            if cards is None:
+                break
+            print_info(f"Trouvé {len(cards)} offres sur la page {page + 1}")
+            page_start = len(jobs)
+            for card in cards:
                 try:
-                    date_elem = card.find_element(By.CSS_SELECTOR, selector)
-                    date_text = date_elem.get_attribute('datetime') or date_elem.text.strip()
-                    if date_text:
-                        job_data['date'] = date_text
-                        break
-                except:
+                    job_data = self.plan.extract(card, self.offer_ids)
+                except Exception:
                     continue
-            if 'date' not in job_data:
-                job_data['date'] = "N/A"
-            
-            job_data['description'] = ""
-            job_data['scraped_at'] = get_timestamp()
-            
-            return job_data
-            
-        except Exception as e:
+                if job_data:
+                    jobs.append(job_data)
+            if should_stop_paging(self.seen_index, jobs[page_start:], "Indeed"):
+                break
+        
+        if not jobs:
+            print_info("Aucune offre dans le HTML statique, passage à Selenium")
             return None
+        
+        self.jobs.extend(jobs)
+        print_success(f"{len(jobs)} offres trouvées sur Indeed (HTTP)")
+        return jobs
     
     def close(self):
         """Ferme le driver"""
@@ -0,0 +1,129 @@
+"""
+Index persistant des offres déjà vues (scraping incrémental)
+Les scrapers arrêtent la pagination dès qu'une page contient surtout des offres connues
+(INCREMENTAL_SCRAPING=true) ; les sites arrêtés tôt sont notés dans stopped_sources pour que
+l'exécution soit enregistrée comme partielle
+"""
+import os
+import threading
+from datetime import datetime, timedelta
+from utils import load_json, save_json, print_info
+from compare_jobs import get_job_signature, rekey_signature
+from job_store import get_store, use_sqlite
+import config
+
+
+class SeenIndex:
+    """Signatures des offres déjà vues, avec dates de première et dernière apparition"""
+
+    def __init__(self, filename=None):
+        self.filename = filename or config.SEEN_INDEX_FILE
+        self._lock = threading.Lock()
+        self._changed = set()
+        self._removed = set()
+        self.stopped_sources = set()  # sites dont la pagination s'est arrêtée avant la fin
+        self.entries = self._load()
+
+    def _load(self):
+        """Charge l'index depuis la base (ou le fichier JSON)"""
+        if use_sqlite():
+            return get_store().get_seen_entries()
+        if not os.path.exists(self.filename):
+            return {}
+        data = load_json(self.filename)
+        if not isinstance(data, dict):
+            return {}
+        # Index écrit avant les identifiants d'offre : clés converties (réécrites au prochain save)
+        entries = {}
+        for signature, entry in data.items():
+            signature = rekey_signature(signature)
+            known = entries.get(signature)
+            if known is not None:
+                entry = {
+                    'first_seen': min(known['first_seen'], entry['first_seen']),
+                    'last_seen': max(known['last_seen'], entry['last_seen'])
+                }
+            entries[signature] = entry
+        return entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, job):
+        return get_job_signature(job) in self.entries
+
+    def known_ratio(self, jobs):
+        """Part des offres déjà connues dans une liste"""
+        if not jobs:
+            return 0.0
+        with self._lock:
+            known = sum(1 for job in jobs if get_job_signature(job) in self.entries)
+        return known / len(jobs)
+
+    def page_is_known(self, jobs):
+        """Vrai si la page est constituée majoritairement d'offres connues (arrêt de la pagination)"""
+        return bool(jobs) and self.known_ratio(jobs) >= config.INCREMENTAL_CONFIG["known_ratio"]
+
+    def add(self, jobs):
+        """
+        Enregistre des offres vues lors de l'exécution courante
+
+        Returns:
+            Liste des offres qui n'étaient pas encore dans l'index
+        """
+        now = datetime.now().isoformat()
+        new_jobs = []
+        with self._lock:
+            for job in jobs:
+                signature = get_job_signature(job)
+                entry = self.entries.get(signature)
+                if entry is None:
+                    self.entries[signature] = {'first_seen': now, 'last_seen': now}
+                    new_jobs.append(job)
+                else:
+                    entry['last_seen'] = now
+                self._changed.add(signature)
+                self._removed.discard(signature)
+        return new_jobs
+
+    def prune(self, days=None):
+        """Oublie les offres non revues depuis `days` jours"""
+        days = days if days is not None else config.INCREMENTAL_CONFIG["retention_days"]
+        limit = (datetime.now() - timedelta(days=days)).isoformat()
+        with self._lock:
+            expired = [sig for sig, entry in self.entries.items() if entry['last_seen'] < limit]
+            for signature in expired:
+                del self.entries[signature]
+                self._changed.discard(signature)
+                self._removed.add(signature)
+        return len(expired)
+
+    def save(self):
+        """Sauvegarde l'index (en SQLite, seules les entrées modifiées sont écrites)"""
+        with self._lock:
+            if use_sqlite():
+                get_store().save_seen_entries(
+                    {sig: self.entries[sig] for sig in self._changed}, self._removed
+                )
+            else:
+                save_json(self.entries, self.filename)
+            self._changed.clear()
+            self._removed.clear()
+
+
+def should_stop_paging(seen_index, page_jobs, source=""):
+    """
+    Décide si un scraper peut arrêter la pagination (mode incrémental)
+
+    Args:
+        seen_index: SeenIndex, ou None si le mode incrémental est désactivé
+        page_jobs: Offres extraites de la page courante
+        source: Nom du site (pour le message)
+    """
+    if seen_index is None or not seen_index.page_is_known(page_jobs):
+        return False
+    ratio = seen_index.known_ratio(page_jobs)
+    print_info(f"{source}: {ratio:.0%} d'offres déjà connues sur cette page, arrêt de la pagination")
+    with seen_index._lock:
+        seen_index.stopped_sources.add(source)
+    return True
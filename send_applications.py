@@ -7,7 +7,8 @@ import json
 import os
 from application_manager import ApplicationManager
 from auto_applicant import AutoApplicant
-from utils import load_json, print_success, print_info, print_warning
+from utils import load_json, print_success, print_info, print_warning, print_error
+from job_store import load_current_jobs
 import config
 
 def main():
@@ -17,6 +18,11 @@ def main():
                        help='Mode: prepare (prépare), assist (assiste), links (crée page HTML)')
     parser.add_argument('--job-url', type=str, help='URL de l\'offre spécifique')
     parser.add_argument('--all-prepared', action='store_true', help='Traiter toutes les candidatures préparées')
+    parser.add_argument('--limit', type=int, default=30, help='Mode prepare: nombre maximal de lettres à générer')
+    parser.add_argument('--keyword', type=str, help='Mode prepare: mot-clé à trouver dans le titre des offres')
+    parser.add_argument('--workers', type=int, help='Mode prepare: lettres générées en même temps '
+                                                    '(défaut: limite du fournisseur LLM)')
+    parser.add_argument('--regenerate', action='store_true', help='Mode prepare: régénérer les lettres existantes')
     
     args = parser.parse_args()
     
@@ -27,7 +33,7 @@ def main():
         print_info("Création d'une page HTML avec tous les liens de candidature...")
         
         # Charger les offres
-        jobs = load_json(config.JOBS_FILE) if os.path.exists(config.JOBS_FILE) else []
+        jobs = load_current_jobs()
         
         # Filtrer celles qui ont des candidatures préparées
         prepared_apps = manager.get_applications_by_status('prepared')
@@ -93,8 +99,35 @@ def main():
         applicant.close()
     
     elif args.mode == 'prepare':
-        print_info("Utilisez l'application Streamlit pour préparer les candidatures")
-        print_info("Double-cliquez sur '📝 Candidatures.command'")
+        # Lettres de motivation des offres pas encore candidatées, générées par lots
+        personal_info = {}
+        if os.path.exists("personal_info.json"):
+            personal_info = json.load(open("personal_info.json"))
+        
+        jobs = load_current_jobs()
+        if args.job_url:
+            jobs = [j for j in jobs if j.get('url') == args.job_url]
+        if args.keyword:
+            jobs = [j for j in jobs if args.keyword.lower() in j.get('title', '').lower()]
+        if not args.regenerate:
+            jobs = [j for j in jobs if not manager.has_applied(j.get('url', ''))]
+        jobs = jobs[:args.limit]
+        
+        if not jobs:
+            print_warning("Aucune offre à préparer")
+            return
+        
+        def progress(done, total, job, application):
+            status = "✓" if application else "✗"
+            print_info(f"[{done}/{total}] {status} {job.get('title', 'N/A')[:60]} - {job.get('company', 'N/A')}")
+        
+        manager.prepare_applications(
+            jobs, personal_info,
+            cv_path=personal_info.get('cv_path'),
+            workers=args.workers,
+            progress=progress,
+            regenerate=args.regenerate
+        )
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,375 @@
+"""
+Registre des sélecteurs CSS de chaque site d'emploi
+Chargé une seule fois ; chaque site est compilé en plan d'extraction (voir extraction_plan.py)
+
+Champs d'un site :
+    source: valeur du champ 'source' des offres (None pour ne pas le renseigner)
+    base_url: base des liens relatifs
+    cards: sélecteurs des cartes d'offres, essayés dans l'ordre
+    no_results: sélecteurs du message affiché quand la recherche ne trouve rien (fin des attentes)
+    cards_min_text: longueur minimale du texte d'une carte valide
+    title_min_len: longueur minimale d'un titre
+    url_from_card: si le titre n'est pas un lien, prendre le premier lien de la carte
+    company_exclude: mots qui disqualifient un texte d'entreprise
+    company_fallback: 'text' (texte court quelconque) ou 'links' (lien vers une page entreprise)
+    company_fallback_exclude: mots exclus du fallback 'text'
+    company_fallback_href: motifs d'URL du fallback 'links'
+    offer_id_patterns: regex dont le premier groupe est l'identifiant stable de l'offre dans son URL
+    offer_id_attr: attribut de la carte portant directement l'identifiant
+    canonical_url: URL canonique d'une offre ({id}) ; sans modèle, l'URL est seulement nettoyée
+    fields: sélecteurs par champ (title, title_fallback, company, location, date, ...) ;
+        full_description et criteria sont lus sur la page de détail de l'offre (voir enrichment.py)
+"""
+
+DATE_WORDS = ['il y a', 'ago', 'jour', 'day', 'semaine', 'week']
+FALLBACK_EXCLUDE_WORDS = ['il y a', 'ago', 'jour', 'day', '€', 'k€', 'france', 'toulouse', 'paris']
+GENERIC_DESCRIPTION_SELECTORS = ["div[class*='description']", "section[class*='description']"]
+GENERIC_DATE_SELECTORS = [
+    "time", "span[class*='date'], div[class*='date'], span[class*='published']"
+]
+
+SITE_SELECTORS = {
+    'linkedin': {
+        'source': None,
+        'base_url': "https://www.linkedin.com",
+        'offer_id_patterns': [r"/jobs/view/(?:[^/?#]*-)?(\d+)", r"[?&]currentJobId=(\d+)"],
+        'canonical_url': "https://www.linkedin.com/jobs/view/{id}/",
+        'cards': [
+            "ul.jobs-search__results-list > li",
+            "div.jobs-search-results-list > ul > li",
+            "li.jobs-search-results__list-item",
+            "div[data-job-id]",
+            "li[data-occludable-job-id]",
+            "div.job-card-container",
+            "li.job-card-list__entity-lockup"
+        ],
+        'no_results': ["div.jobs-search-no-results-banner", "section.jobs-search-no-results"],
+        'url_from_card': False,
+        'company_exclude': DATE_WORDS,
+        'company_fallback': 'links',
+        'company_fallback_href': ['/company/', '/companies/'],
+        'fields': {
+            'title': [
+                "a.job-card-list__title",
+                "a.base-card__full-link",
+                "h3.base-search-card__title a",
+                "span.job-search-card__title",
+                "a[data-control-name='job_card_title']",
+                "a[href*='/jobs/view/']",
+                "h3 a"
+            ],
+            'company': [
+                "h4.base-search-card__subtitle",
+                "h4.job-card-container__company-name",
+                "span.job-card-container__primary-description",
+                "a.job-card-container__company-name",
+                "h4 a",
+                "a.base-card__full-link",
+                "span.job-card-container__company-name",
+                "div.job-card-container__company-name",
+                "h4[class*='company']",
+                "span[class*='company']",
+                "a[class*='company']",
+                # Sélecteurs génériques
+                "h4",
+                "span[aria-label*='company']",
+                "div[aria-label*='company']"
+            ],
+            'location': [
+                "span.job-card-container__metadata-item",
+                "span.job-search-card__location",
+                "li.job-search-card__location",
+                "span.job-card-container__metadata-wrapper",
+                "div.job-card-container__metadata-item",
+                "span[class*='location']"
+            ],
+            'date': [
+                "time.job-card-container__metadata-item",
+                "time.job-search-card__listdate",
+                "span.job-card-container__listed-time",
+                "time[datetime]",
+                "span[class*='date']",
+                "time"
+            ],
+            # Panneau de détails (après clic sur la carte)
+            'company_panel': [
+                "div.jobs-details-top-card__company-name a",
+                "a.jobs-details-top-card__company-name",
+                "span.jobs-details-top-card__company-name",
+                "h3.topcard__org-name",
+                "a.topcard__org-name-link",
+                "a[href*='/company/']",
+                "a[href*='/companies/']"
+            ],
+            'location_panel': [
+                "span.jobs-details-top-card__bullet",
+                "div.jobs-details-top-card__primary-description-without-tagline",
+                "span.topcard__flavor--black-link",
+                "div.topcard__flavor"
+            ],
+            'description': [
+                "div.show-more-less-html__markup",
+                "div.description__text",
+                "div.jobs-description__text"
+            ],
+            'full_description': ["div.show-more-less-html__markup", "div.description__text", "div.jobs-description__text"],
+            'criteria': ["span.description__job-criteria-text", "li.description__job-criteria-item span"]
+        }
+    },
+    'indeed': {
+        'source': 'Indeed',
+        'base_url': "https://fr.indeed.com",
+        'offer_id_patterns': [r"[?&]v?jk=([0-9a-f]+)"],
+        'offer_id_attr': 'data-jk',
+        'canonical_url': "https://fr.indeed.com/viewjob?jk={id}",
+        'cards': ["div[data-jk], div[class*='job_seen_beacon'], td[class*='resultContent']"],
+        'no_results': ["div.jobsearch-NoResult-messageContainer"],
+        'url_from_card': False,
+        'company_fallback': 'text',
+        'company_fallback_exclude': [
+            'il y a', 'ago', 'jour', 'day', '€', 'k€',
+            'france', 'toulouse', 'paris', 'lyon', 'remote', 'télétravail'
+        ],
+        'fields': {
+            'title': ["h2 a, a[class*='jobTitle']", "h2, span[title]"],
+            'company': [
+                "span[class*='companyName']",
+                "span[data-testid='company-name']",
+                "a[data-testid='company-name']",
+                "span.companyName",
+                "a.companyName",
+                "span[class*='company']",
+                "div[class*='companyName']",
+                "span[data-testid='company']",
+                "a[data-testid='company']"
+            ],
+            'location': [
+                "div[class*='companyLocation']",
+                "div[data-testid='text-location']",
+                "span[data-testid='text-location']",
+                "div.companyLocation",
+                "span.companyLocation",
+                "div[class*='location']",
+                "span[class*='location']"
+            ],
+            'date': [
+                "span[class*='date']", "time", "span[class*='posted']", "span[data-testid='myJobsStateDate']"
+            ],
+            'full_description': ["div#jobDescriptionText", "div.jobsearch-JobComponent-description"] + GENERIC_DESCRIPTION_SELECTORS,
+            'criteria': ["div#jobDetailsSection div[data-testid] li", "div.jobsearch-JobDescriptionSection-sectionItem"]
+        }
+    },
+    'wttj': {
+        'source': 'Welcome to the Jungle',
+        'base_url': "https://www.welcometothejungle.com",
+        'offer_id_patterns': [r"/companies/([^/?#]+/jobs/[^/?#]+)"],
+        'canonical_url': "https://www.welcometothejungle.com/fr/companies/{id}",
+        'cards': [
+            "div[data-testid='job-card'], article[class*='job-card'], div[class*='job-card']",
+            "a[href*='/jobs/']"
+        ],
+        'company_fallback': 'links',
+        'company_fallback_href': ['/companies/', '/c/'],
+        'fields': {
+            'title': ["h3", "h2", "a[class*='title']", "span[class*='title']"],
+            'company': [
+                "span[class*='company']",
+                "div[class*='company']",
+                "a[class*='company']",
+                "[data-testid='company-name']",
+                "span[data-testid='company']",
+                "div[data-testid='company']",
+                "a[href*='/companies/']",
+                "a[href*='/c/']",  # WTTJ utilise /c/ pour les companies
+                "span.ais-Highlight",
+                "div.sc-1pe7b5t-0",
+                "p[class*='company']"
+            ],
+            'location': [
+                "span[class*='location']",
+                "div[class*='location']",
+                "[data-testid='location']",
+                "span[data-testid='location']",
+                "div[data-testid='location']",
+                "span.sc-1pe7b5t-0",
+                "div.sc-1pe7b5t-0",
+                "span[aria-label*='location']",
+                "div[aria-label*='location']"
+            ],
+            'date': GENERIC_DATE_SELECTORS,
+            'full_description': ["div[data-testid='job-section-description']", "section#the-position-section"] + GENERIC_DESCRIPTION_SELECTORS,
+            'criteria': ["div[data-testid='job-metadata-block'] li", "div[data-testid='job-header-metas'] li"]
+        }
+    },
+    'apec': {
+        'source': 'APEC',
+        'base_url': "https://www.apec.fr",
+        'offer_id_patterns': [r"/detail-offre/([0-9A-Za-z]+)"],
+        'canonical_url': "https://www.apec.fr/candidat/recherche-emploi.html/emploi/detail-offre/{id}",
+        'cards': [
+            "article[class*='offer']",
+            "div[class*='offer']",
+            "li[class*='offer']",
+            "a[href*='/offres-emploi/']",
+            "div[class*='result']",
+            "div[class*='job']",
+            "div[data-offre-id]",
+            "article[data-offre-id]",
+            "div[class*='card']",
+            "li[class*='result']",
+            "div[class*='listing'] > div",
+            "ul[class*='results'] > li"
+        ],
+        'cards_min_text': 20,
+        'title_min_len': 5,
+        'company_fallback': 'text',
+        'company_fallback_exclude': FALLBACK_EXCLUDE_WORDS,
+        'fields': {
+            'title': [
+                "h2 a", "h3 a", "h4 a",
+                "a[class*='title']",
+                "span[class*='title']",
+                "div[class*='title']",
+                "h2", "h3", "h4",
+                "a[href*='/offres-emploi/']",
+                "a[href*='/offre']"
+            ],
+            # Si aucun titre, premier lien avec un texte significatif
+            'title_fallback': ["a"],
+            'company': [
+                "span.card-offer__company",
+                "div.card-offer__company",
+                "a.card-offer__company",
+                "span[class*='company']",
+                "div[class*='company']",
+                "a[class*='company']",
+                "span[data-cy='company-name']",
+                "div[data-cy='company-name']",
+                "h3.card-offer__company-name",
+                "span.offre-emploi__company",
+                "p[class*='company']"
+            ],
+            'location': [
+                "span.card-offer__location",
+                "div.card-offer__location",
+                "span[class*='location']",
+                "div[class*='location']",
+                "span[data-cy='location']",
+                "div[data-cy='location']",
+                "span.offre-emploi__location",
+                "div.offre-emploi__location",
+                "span[aria-label*='localisation']"
+            ],
+            'date': GENERIC_DATE_SELECTORS,
+            'full_description': ["div.details-post", "div.details-offer"] + GENERIC_DESCRIPTION_SELECTORS,
+            'criteria': ["ul.details-offer-list li", "div.details-post-list li"]
+        }
+    },
+    'helloworks': {
+        'source': 'Helloworks',
+        'base_url': "https://www.hellowork.com",
+        'offer_id_patterns': [r"/emplois/(\d+)\.html"],
+        'canonical_url': "https://www.hellowork.com/fr-fr/emplois/{id}.html",
+        'cards': [
+            "article[class*='job'], div[class*='job-card'], a[href*='/offres-emploi/']",
+            "div[class*='result'], li[class*='job']"
+        ],
+        'company_fallback': 'text',
+        'company_fallback_exclude': FALLBACK_EXCLUDE_WORDS,
+        'fields': {
+            'title': ["h2 a", "h3 a", "a[class*='title']", "span[class*='title']", "h2", "h3"],
+            'company': [
+                "span[class*='company']",
+                "div[class*='company']",
+                "a[class*='company']",
+                "span.offre-emploi__company",
+                "div.offre-emploi__company",
+                "span[data-company]",
+                "div[data-company]",
+                "span.tw-text-body-base-medium",
+                "div.tw-text-body-base-medium",
+                "p[class*='company']"
+            ],
+            'location': [
+                "span[class*='location']",
+                "div[class*='location']",
+                "span.offre-emploi__location",
+                "div.offre-emploi__location",
+                "span[data-location]",
+                "div[data-location]"
+            ],
+            'date': GENERIC_DATE_SELECTORS,
+            'full_description': ["section[data-truncate-text-target='content']", "div[class*='job-description']"] + GENERIC_DESCRIPTION_SELECTORS,
+            'criteria': ["ul[class*='tags'] li", "div[class*='tags'] span"]
+        }
+    },
+    'freework': {
+        'source': 'Free-Work',
+        'base_url': "https://www.free-work.com",
+        'offer_id_patterns': [r"/job-mission/([^/?#]+)"],
+        'cards': [
+            "article[class*='job'], div[class*='job-card'], a[href*='/jobs/']",
+            "div[class*='result'], li[class*='job']"
+        ],
+        'company_fallback': 'text',
+        'company_fallback_exclude': FALLBACK_EXCLUDE_WORDS,
+        'fields': {
+            'title': ["h2 a", "h3 a", "a[class*='title']", "h2", "h3"],
+            'company': [
+                "span[class*='company']",
+                "div[class*='company']",
+                "a[class*='company']",
+                "span.offre-emploi__company",
+                "div.offre-emploi__company",
+                "span[data-cy='job-card-company-link']",
+                "a[data-cy='job-card-company-link']",
+                "p[class*='company']"
+            ],
+            'location': [
+                "span[class*='location']",
+                "div[class*='location']",
+                "span.offre-emploi__location",
+                "div.offre-emploi__location"
+            ],
+            'date': ["time, span[class*='date']"],
+            'full_description': ["div[class*='html-renderer']"] + GENERIC_DESCRIPTION_SELECTORS,
+            'criteria': ["div[class*='tags'] span", "ul[class*='criteria'] li"]
+        }
+    },
+    'bonnealternance': {
+        'source': 'La Bonne Alternance',
+        'base_url': "https://labonnealternance.apprentissage.beta.gouv.fr",
+        'cards': [
+            "article[class*='offer'], div[class*='offer'], li[class*='offer']",
+            "div[class*='result'], div[class*='job']"
+        ],
+        'company_fallback': 'text',
+        'company_fallback_exclude': FALLBACK_EXCLUDE_WORDS,
+        'fields': {
+            'title': ["h2", "h3", "a[class*='title']", "span[class*='title']"],
+            'company': [
+                "span[class*='company']",
+                "div[class*='company']",
+                "a[class*='company']",
+                "span[data-company]",
+                "div[data-company]",
+                "span.entreprise",
+                "div.entreprise",
+                "p[class*='company']",
+                "p[data-testid='company-name']"
+            ],
+            'location': [
+                "span[class*='location']",
+                "div[class*='location']",
+                "span[data-location]",
+                "div[data-location]",
+                "span.localisation",
+                "div.localisation",
+                "span[aria-label*='localisation']"
+            ],
+            'date': [],
+            'full_description': GENERIC_DESCRIPTION_SELECTORS,
+            'criteria': ["ul[class*='criteria'] li"]
+        }
+    }
+}
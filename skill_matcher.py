@@ -0,0 +1,149 @@
+"""
+Détection des compétences dans les offres par une expression régulière unique
+L'expression réunit tous les termes de config.TECHNICAL_SKILLS et config.SKILL_SYNONYMS sous forme
+d'arbre de préfixes ; elle est compilée une seule fois et chaque offre n'est parcourue qu'une fois.
+"""
+import re
+import threading
+from collections import Counter
+import config
+
+
+def _job_text(job):
+    """Texte d'une offre analysé pour les compétences (titre, descriptions, critères)"""
+    return " ".join([
+        job.get('title', '') or '',
+        job.get('description', '') or '',
+        job.get('full_description', '') or '',
+        " ".join(job.get('criteria', []) or [])
+    ]).lower()
+
+
+def _trie_pattern(terms):
+    """
+    Alternative regex factorisée en arbre de préfixes : "sql|spark|scala" devient "s(?:cala|park|ql)",
+    ce qui évite de retenter chaque terme à chaque position du texte
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch != '']
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if '' in node:
+            # Terme complet ici : la suite est optionnelle (la plus longue est tentée d'abord)
+            return f"(?:{pattern})?"
+        return pattern
+
+    return build(trie)
+
+
+class SkillMatrix:
+    """
+    Matrice creuse offres × compétences (format CSR : indptr / indices)
+    La ligne i contient les indices des compétences trouvées dans la i-ème offre.
+    """
+
+    def __init__(self, skills, indptr, indices):
+        self.skills = skills
+        self.indptr = indptr
+        self.indices = indices
+
+    @property
+    def shape(self):
+        return len(self.indptr) - 1, len(self.skills)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def row(self, i):
+        """Compétences trouvées dans la i-ème offre"""
+        return [self.skills[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def counts(self):
+        """Nombre d'offres mentionnant chaque compétence"""
+        per_index = Counter(self.indices)
+        return Counter({self.skills[j]: n for j, n in per_index.items()})
+
+    def jobs_with(self, skill):
+        """Indices des offres mentionnant une compétence"""
+        j = self.skills.index(skill)
+        return [
+            i for i in range(len(self))
+            if j in self.indices[self.indptr[i]:self.indptr[i + 1]]
+        ]
+
+    def to_dataframe(self, index=None):
+        """DataFrame pandas creux (0/1) offres × compétences"""
+        import pandas as pd
+        rows, cols = self.shape
+        dense = [[0] * cols for _ in range(rows)]
+        for i in range(rows):
+            for j in self.indices[self.indptr[i]:self.indptr[i + 1]]:
+                dense[i][j] = 1
+        df = pd.DataFrame(dense, columns=self.skills, index=index)
+        return df.astype(pd.SparseDtype("int8", 0))
+
+
+class SkillMatcher:
+    """Expression compilée qui associe chaque terme trouvé aux compétences correspondantes"""
+
+    def __init__(self, skills=None, synonyms=None):
+        skills = config.TECHNICAL_SKILLS if skills is None else skills
+        synonyms = config.SKILL_SYNONYMS if synonyms is None else synonyms
+
+        self.skills = list(skills) + [s for s in synonyms if s not in skills]
+        term_to_skills = {}
+        for j, skill in enumerate(self.skills):
+            for term in [skill] + list(synonyms.get(skill, [])):
+                term = term.lower()
+                # Mêmes variantes que l'ancienne recherche : espaces, tirets ou soulignés
+                for variant in {term, term.replace(" ", "-"), term.replace(" ", "_")}:
+                    term_to_skills.setdefault(variant, set()).add(j)
+        # Un terme trouvé compte aussi pour les termes qu'il contient ("apache airflow" -> "airflow"),
+        # la recherche ne renvoyant pas de correspondances qui se chevauchent
+        for term, js in term_to_skills.items():
+            for other, other_js in term_to_skills.items():
+                if other != term and re.search(rf"(?<!\w){re.escape(other)}(?!\w)", term):
+                    js.update(other_js)
+        self._term_to_skills = {term: sorted(js) for term, js in term_to_skills.items()}
+        self._pattern = re.compile(rf"\b({_trie_pattern(self._term_to_skills)})(?!\w)")
+
+    def match_text(self, text):
+        """Indices des compétences présentes dans un texte (déjà en minuscules)"""
+        found = set()
+        for term in set(self._pattern.findall(text)):
+            found.update(self._term_to_skills[term])
+        return found
+
+    def match_job(self, job):
+        """Compétences présentes dans une offre"""
+        return [self.skills[j] for j in sorted(self.match_text(_job_text(job)))]
+
+    def build_matrix(self, jobs):
+        """Matrice offres × compétences pour un lot d'offres"""
+        indptr = [0]
+        indices = []
+        for job in jobs:
+            indices.extend(sorted(self.match_text(_job_text(job))))
+            indptr.append(len(indices))
+        return SkillMatrix(self.skills, indptr, indices)
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher():
+    """Matcher construit depuis la configuration (compilé une seule fois par processus)"""
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            _matcher = SkillMatcher()
+        return _matcher
@@ -0,0 +1,126 @@
+"""
+Générateur d'offres d'emploi synthétiques (benchmarks de montée en charge)
+Les offres ont la même forme que celles des scrapers : titres français/anglais, entreprises,
+villes, sources, URL au format de chaque site, dates ISO ou relatives, descriptions
+mentionnant des compétences.
+"""
+import random
+from datetime import datetime, timedelta
+import config
+
+TITLES = [
+    "Data Scientist", "Data Analyst", "Data Engineer", "Machine Learning Engineer",
+    "Ingénieur Data", "Analyste de données", "Ingénieur Big Data", "Consultant BI",
+    "Business Analyst", "Analytics Engineer", "Ingénieur MLOps", "Chef de projet Data",
+    "Développeur Python", "Architecte Data", "Statisticien", "Data Product Manager"
+]
+SENIORITY = ["", "", "Junior ", "Senior ", "Lead ", "Stagiaire ", "Alternant "]
+SUFFIXES = ["", "", " H/F", " (F/H)", " - CDI", " - Stage 6 mois", " - Alternance"]
+COMPANY_PREFIXES = [
+    "Airbus", "Thales", "Capgemini", "Sopra Steria", "Orange", "BNP Paribas", "Decathlon",
+    "Dassault", "Safran", "Ubisoft", "Doctolib", "BlaBlaCar", "Criteo", "Datadog", "Alan",
+    "Qonto", "Contentsquare", "Mirakl", "Back Market", "Veepee", "Société Générale", "EDF"
+]
+COMPANY_SUFFIXES = ["", "", " France", " Group", " Technologies", " Digital", " Services", " Labs"]
+CITIES = [
+    "Toulouse", "Paris", "Lyon", "Bordeaux", "Nantes", "Lille", "Marseille", "Montpellier",
+    "Rennes", "Grenoble", "Nice", "Strasbourg", "Remote", "Télétravail"
+]
+SOURCES = {
+    'LinkedIn': "https://www.linkedin.com/jobs/view/{n}/?trk=public_jobs",
+    'Indeed': "https://fr.indeed.com/viewjob?jk={n:016x}&from=serp",
+    'Welcome to the Jungle': "https://www.welcometothejungle.com/fr/companies/c{c}/jobs/offre-{n}",
+    'APEC': "https://www.apec.fr/candidat/recherche-emploi.html/emploi/detail-offre/{n}W",
+    'Helloworks': "https://www.hellowork.com/fr-fr/emplois/{n}.html",
+    'Free-Work': "https://www.free-work.com/fr/tech-it/data/job-mission/mission-{n}",
+    'La Bonne Alternance': "https://labonnealternance.apprentissage.beta.gouv.fr/offre/{n}"
+}
+SENTENCES = [
+    "Nous recherchons un profil {title} pour rejoindre notre équipe à {city}.",
+    "Vous maîtrisez {skill} et {skill2}, et avez une première expérience en {skill3}.",
+    "You will design data pipelines with {skill} and {skill2} on a modern cloud stack.",
+    "Rattaché(e) au responsable data, vous participerez à des projets de {skill}.",
+    "Experience with {skill}, {skill2} and agile methodologies is a plus.",
+    "Télétravail partiel possible, mutuelle, tickets restaurant et RTT.",
+    "Le poste est basé à {city} avec des déplacements ponctuels.",
+    "Vous êtes diplômé(e) d'une école d'ingénieur ou d'un master en statistiques."
+]
+RELATIVE_DATES = ["Il y a {d} jours", "il y a {d} jour", "{d} days ago", "Publié il y a {d} jours"]
+
+
+class SyntheticJobGenerator:
+    """Offres synthétiques reproductibles (même graine, mêmes offres)"""
+
+    def __init__(self, seed=42, now=None):
+        self.rng = random.Random(seed)
+        self.now = now or datetime.now()
+        self.skills = list(config.TECHNICAL_SKILLS) + [
+            term for terms in config.SKILL_SYNONYMS.values() for term in terms
+        ]
+        self._counter = 0
+
+    def _date(self):
+        days = self.rng.randint(0, 60)
+        if self.rng.random() < 0.6:
+            return (self.now - timedelta(days=days)).strftime("%Y-%m-%d")
+        return self.rng.choice(RELATIVE_DATES).format(d=days)
+
+    def _description(self, title, city):
+        sentences = self.rng.sample(SENTENCES, self.rng.randint(3, 6))
+        return " ".join(
+            s.format(
+                title=title, city=city,
+                skill=self.rng.choice(self.skills), skill2=self.rng.choice(self.skills),
+                skill3=self.rng.choice(self.skills)
+            )
+            for s in sentences
+        )
+
+    def job(self):
+        """Une offre synthétique"""
+        self._counter += 1
+        n = 3_000_000_000 + self._counter
+        base_title = self.rng.choice(TITLES)
+        title = f"{self.rng.choice(SENIORITY)}{base_title}{self.rng.choice(SUFFIXES)}"
+        company = f"{self.rng.choice(COMPANY_PREFIXES)}{self.rng.choice(COMPANY_SUFFIXES)}"
+        city = self.rng.choice(CITIES)
+        source = self.rng.choice(list(SOURCES))
+        return {
+            'source': source,
+            'title': title,
+            'company': company if self.rng.random() > 0.05 else "N/A",
+            'location': f"{city}, France" if self.rng.random() < 0.5 else city,
+            'url': SOURCES[source].format(n=n, c=self.rng.randint(1, 5000)),
+            'date': self._date(),
+            'description': self._description(base_title, city) if self.rng.random() < 0.8 else "",
+            'scraped_at': self.now.strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    def jobs(self, count):
+        """Liste de `count` offres"""
+        return [self.job() for _ in range(count)]
+
+    def next_day(self, jobs, churn=0.1):
+        """
+        Offres du lendemain : une part `churn` des offres disparaît et autant de nouvelles apparaissent
+        """
+        kept = [job for job in jobs if self.rng.random() >= churn]
+        return kept + self.jobs(len(jobs) - len(kept))
+
+    def applications(self, jobs, ratio=0.05):
+        """Candidatures sur une part des offres"""
+        statuses = ['prepared', 'sent', 'rejected', 'accepted']
+        return [
+            {
+                'job_title': job['title'],
+                'company': job['company'],
+                'location': job['location'],
+                'job_url': job['url'],
+                'source': job['source'],
+                'status': self.rng.choice(statuses),
+                'prepared_at': job['scraped_at'],
+                'sent_at': None,
+                'notes': ''
+            }
+            for job in jobs if self.rng.random() < ratio
+        ]
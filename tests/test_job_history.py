@@ -0,0 +1,99 @@
+"""
+Journal de l'historique des offres (stockage JSON)
+"""
+import json
+import pytest
+import config
+import job_history
+
+
+def _job(i):
+    return {'title': f'Dev {i}', 'company': 'Acme', 'source': 'indeed',
+            'url': f'https://fr.indeed.com/viewjob?jk=job{i}'}
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(config.STORAGE_CONFIG, 'backend', 'json')
+    monkeypatch.setitem(config.HISTORY_CONFIG, 'snapshot_every', 3)
+    monkeypatch.setitem(config.HISTORY_CONFIG, 'retention_days', 365)
+    monkeypatch.setattr(config, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(job_history, 'HISTORY_FILE', str(tmp_path / 'jobs_history.jsonl'))
+    monkeypatch.setattr(job_history, 'HISTORY_STATE_FILE', str(tmp_path / 'jobs_history_state.json'))
+    monkeypatch.setattr(job_history, 'LEGACY_HISTORY_FILE', str(tmp_path / 'jobs_history.json'))
+    return tmp_path
+
+
+def _record_runs(runs):
+    previous = None
+    for day, jobs in runs:
+        job_history.append_history(previous, jobs, timestamp=f'{day}T08:00:00')
+        previous = jobs
+
+
+def _signatures(jobs):
+    return sorted(job['url'] for job in jobs)
+
+
+def test_replay_rebuilds_each_day(history):
+    runs = [
+        ('2026-10-01', [_job(1), _job(2)]),
+        ('2026-10-02', [_job(2), _job(3)]),
+        ('2026-10-03', [_job(3)]),
+        ('2026-10-04', [_job(3), _job(4), _job(5)]),
+        ('2026-10-05', [_job(5)]),
+    ]
+    _record_runs(runs)
+    for day, jobs in runs:
+        assert _signatures(job_history.get_jobs_at(day)) == _signatures(jobs)
+    assert job_history.get_jobs_at('2026-09-30') == []
+
+
+def test_snapshots_are_written_periodically(history):
+    _record_runs([(f'2026-10-0{d}', [_job(d)]) for d in range(1, 8)])
+    entries = [json.loads(line) for line in open(job_history.HISTORY_FILE, encoding='utf-8')]
+    assert ['snapshot' in entry for entry in entries] == [True, False, False, True, False, False, True]
+    state = job_history._read_state()
+    assert [timestamp[:10] for timestamp, _ in state['snapshots']] == ['2026-10-01', '2026-10-04', '2026-10-07']
+
+
+def test_first_and_last_seen(history):
+    _record_runs([
+        ('2026-10-01', [_job(1)]),
+        ('2026-10-02', [_job(1), _job(2)]),
+        ('2026-10-03', [_job(2)]),
+        ('2026-10-04', [_job(1), _job(2)]),
+    ])
+    assert job_history.get_job_presence(_job(1)) == {
+        'first_seen': '2026-10-01T08:00:00', 'last_seen': '2026-10-04T08:00:00', 'present': True
+    }
+    assert job_history.get_job_presence(_job(2))['first_seen'] == '2026-10-02T08:00:00'
+    assert job_history.get_job_presence(_job(9)) is None
+
+
+def test_presence_accepts_old_url_signatures(history):
+    _record_runs([('2026-10-01', [_job(1)]), ('2026-10-02', [])])
+    presence = job_history.get_job_presence('https://fr.indeed.com/viewjob?jk=job1&from=serp')
+    assert presence == {'first_seen': '2026-10-01T08:00:00', 'last_seen': '2026-10-01T08:00:00', 'present': False}
+
+
+def test_legacy_history_is_imported(history):
+    legacy = [
+        {'timestamp': '2024-01-01T10:00:00', 'total_jobs': 1, 'jobs': [_job(1)]},
+        {'timestamp': '2024-01-02T10:00:00', 'total_jobs': 2, 'jobs': [_job(1), _job(2)]},
+    ]
+    with open(job_history.LEGACY_HISTORY_FILE, 'w', encoding='utf-8') as f:
+        json.dump(legacy, f)
+    assert _signatures(job_history.get_jobs_at('2024-01-02')) == _signatures(legacy[1]['jobs'])
+    assert not (history / 'jobs_history.json').exists()
+    assert (history / 'jobs_history.json.bak').exists()
+
+
+def test_expired_entries_are_compacted(history):
+    _record_runs([(f'2020-01-0{d}', [_job(d)]) for d in range(1, 6)])
+    job_history.append_history([_job(5)], [_job(6)])
+    state = job_history._read_state()
+    assert state['snapshots'][0] == ['2020-01-04T08:00:00', 0]
+    assert job_history.get_jobs_at('2020-01-01') == []
+    assert _signatures(job_history.get_jobs_at('2020-01-05')) == _signatures([_job(5)])
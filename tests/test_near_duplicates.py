@@ -0,0 +1,42 @@
+"""
+Regroupement des offres publiées sur plusieurs sites
+"""
+from near_duplicates import group_near_duplicates
+
+DESCRIPTION = (
+    "Nous recherchons un data engineer pour construire nos pipelines Spark et Airflow, "
+    "industrialiser les modèles de machine learning et animer la plateforme de données."
+)
+
+
+def _job(source, url, company='Acme', title='Data Engineer H/F'):
+    return {'title': title, 'company': company, 'location': 'Paris', 'source': source,
+            'url': url, 'description': DESCRIPTION}
+
+
+def test_same_offer_on_two_sites_is_grouped():
+    jobs = [
+        _job('indeed', 'https://fr.indeed.com/viewjob?jk=abc'),
+        _job('apec', 'https://www.apec.fr/candidat/recherche-emploi.html/emploi/detail-offre/176543W'),
+    ]
+    grouped = group_near_duplicates(jobs)
+    assert len(grouped) == 1
+    assert grouped[0]['source'] == 'indeed'
+    assert grouped[0]['also_on'] == [{'source': 'apec', 'url': jobs[1]['url']}]
+
+
+def test_different_companies_are_not_grouped():
+    jobs = [
+        _job('indeed', 'https://fr.indeed.com/viewjob?jk=abc'),
+        _job('apec', 'https://www.apec.fr/candidat/recherche-emploi.html/emploi/detail-offre/176543W',
+             company='Globex'),
+    ]
+    assert len(group_near_duplicates(jobs)) == 2
+
+
+def test_two_offers_of_one_site_are_not_grouped():
+    jobs = [
+        _job('indeed', 'https://fr.indeed.com/viewjob?jk=abc'),
+        _job('indeed', 'https://fr.indeed.com/viewjob?jk=def'),
+    ]
+    assert len(group_near_duplicates(jobs)) == 2
@@ -0,0 +1,42 @@
+"""
+Signatures des offres : identifiants stables et URL canoniques
+"""
+from compare_jobs import get_job_signature, rekey_signature
+from offer_ids import canonicalize
+
+
+def test_tracking_parameters_do_not_change_the_signature():
+    first = {'url': 'https://fr.linkedin.com/jobs/view/data-engineer-at-acme-3912345678?trk=abc&refId=x'}
+    second = {'url': 'https://www.linkedin.com/jobs/view/3912345678/?trackingId=y'}
+    assert get_job_signature(first) == get_job_signature(second) == 'linkedin:3912345678'
+
+
+def test_indeed_click_and_view_urls_share_the_offer_id():
+    assert canonicalize('https://fr.indeed.com/rc/clk?jk=abc123&tk=1') == \
+        canonicalize('https://fr.indeed.com/viewjob?jk=abc123&from=serp') == \
+        ('indeed:abc123', 'https://fr.indeed.com/viewjob?jk=abc123')
+
+
+def test_unknown_site_keeps_the_url_without_tracking():
+    assert canonicalize('https://example.com/job/1?utm_source=a&ref=2#top') == \
+        (None, 'https://example.com/job/1?ref=2')
+    assert get_job_signature({'url': 'https://example.com/job/1?utm_source=a'}) == 'https://example.com/job/1'
+
+
+def test_offer_id_takes_precedence_over_url():
+    job = {'offer_id': 'apec:176543W', 'url': 'https://fr.indeed.com/viewjob?jk=abc123'}
+    assert get_job_signature(job) == 'apec:176543W'
+
+
+def test_signature_without_url():
+    assert get_job_signature({'title': 'Dev', 'company': 'Acme', 'source': 'indeed'}) == 'Dev_Acme_indeed'
+
+
+def test_rekey_signature_converts_raw_urls():
+    assert rekey_signature('https://fr.indeed.com/viewjob?jk=abc123&from=serp') == 'indeed:abc123'
+    assert rekey_signature('https://example.com/job/1?utm_medium=x') == 'https://example.com/job/1'
+
+
+def test_rekey_signature_keeps_current_signatures():
+    assert rekey_signature('indeed:abc123') == 'indeed:abc123'
+    assert rekey_signature('Dev_Acme_indeed') == 'Dev_Acme_indeed'
@@ -0,0 +1,32 @@
+"""
+Détection des compétences par l'expression unique de SkillMatcher
+"""
+from skill_matcher import SkillMatcher, get_skill_matcher
+
+
+def test_synonyms_and_separator_variants():
+    matcher = SkillMatcher(['Python', 'Machine Learning'], {'Scikit-learn': ['sklearn']})
+    job = {'title': 'Data Scientist', 'description': 'machine-learning avec sklearn et python'}
+    assert matcher.match_job(job) == ['Python', 'Machine Learning', 'Scikit-learn']
+    assert matcher.skills == ['Python', 'Machine Learning', 'Scikit-learn']
+
+
+def test_longer_term_also_counts_the_terms_it_contains():
+    matcher = SkillMatcher(['Airflow', 'Apache Airflow', 'Spark'], {})
+    assert matcher.match_job({'title': 'Apache Airflow'}) == ['Airflow', 'Apache Airflow']
+    assert matcher.match_job({'title': 'Airflow'}) == ['Airflow']
+
+
+def test_whole_words_only():
+    matcher = SkillMatcher(['R', 'Spark', 'SQL'], {})
+    assert matcher.match_job({'title': 'Développeur PySpark NoSQL'}) == []
+    assert matcher.match_job({'title': 'Stats en R, SQL'}) == ['R', 'SQL']
+
+
+def test_match_text_returns_indices_into_skills():
+    matcher = SkillMatcher(['Python', 'SQL'], {})
+    assert {matcher.skills[j] for j in matcher.match_text('sql et python')} == {'Python', 'SQL'}
+
+
+def test_shared_matcher_is_built_once():
+    assert get_skill_matcher() is get_skill_matcher()
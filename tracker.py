@@ -5,12 +5,16 @@ import json
 from datetime import datetime
 from scraper import LinkedInJobScraper
 from utils import load_json, save_json, print_success, print_info, print_warning
+from job_store import get_store, use_sqlite
 import config
 
 class JobTracker:
     def __init__(self):
         self.tracked_jobs_file = config.TRACKED_JOBS_FILE
-        self.tracked_jobs = load_json(self.tracked_jobs_file)
+        if use_sqlite():
+            self.tracked_jobs = get_store().get_tracked_jobs()
+        else:
+            self.tracked_jobs = load_json(self.tracked_jobs_file)
         
     def track_new_jobs(self, keywords, location="", max_pages=3):
         """Suit les nouvelles offres correspondant aux critères"""
@@ -36,7 +40,10 @@ class JobTracker:
         if truly_new_jobs:
             print_success(f"{len(truly_new_jobs)} nouvelles offres trouvées !")
             self.tracked_jobs.extend(truly_new_jobs)
-            self._save_tracked_jobs()
+            if use_sqlite():
+                get_store().add_tracked_jobs(truly_new_jobs)
+            else:
+                self._save_tracked_jobs()
         else:
             print_info("Aucune nouvelle offre trouvée")
         
@@ -84,15 +91,18 @@ class JobTracker:
         from datetime import timedelta
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        initial_count = len(self.tracked_jobs)
+        old_jobs = [job for job in self.tracked_jobs if not self._is_job_recent(job, cutoff_date)]
         self.tracked_jobs = [
             job for job in self.tracked_jobs
             if self._is_job_recent(job, cutoff_date)
         ]
         
-        removed = initial_count - len(self.tracked_jobs)
+        removed = len(old_jobs)
         if removed > 0:
-            self._save_tracked_jobs()
+            if use_sqlite():
+                get_store().delete_tracked_jobs(old_jobs)
+            else:
+                self._save_tracked_jobs()
             print_success(f"{removed} offres anciennes supprimées")
         
         return removed
@@ -0,0 +1,165 @@
+"""
+Attentes basées sur l'état de la page (remplacent les time.sleep fixes)
+Chaque attente a une borne maximale configurable et sa durée réelle est mesurée
+"""
+import time
+import threading
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from utils import print_info
+from metrics import observe
+import config
+
+POLL_FREQUENCY = 0.2
+
+_timings = {}
+_timings_lock = threading.Lock()
+
+
+def _record(name, elapsed, ok):
+    """Enregistre la durée d'une attente"""
+    observe(f"wait_{name}", elapsed, error=not ok)
+    with _timings_lock:
+        stats = _timings.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0, 'timeouts': 0})
+        stats['count'] += 1
+        stats['total'] += elapsed
+        stats['max'] = max(stats['max'], elapsed)
+        if not ok:
+            stats['timeouts'] += 1
+
+
+def _timeout(name, timeout):
+    """Borne maximale d'une attente (paramètre explicite ou config.WAIT_CONFIG)"""
+    return timeout if timeout is not None else config.WAIT_CONFIG[name]
+
+
+def wait_until(driver, condition, timeout, name="condition"):
+    """
+    Attend qu'une condition soit vraie, sans dépasser timeout secondes
+
+    Returns:
+        True si la condition a été remplie, False en cas de timeout
+    """
+    start = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY,
+                      ignored_exceptions=(StaleElementReferenceException,)).until(condition)
+        ok = True
+    except TimeoutException:
+        ok = False
+    _record(name, time.monotonic() - start, ok)
+    return ok
+
+
+def wait_for_page_ready(driver, timeout=None):
+    """Attend que le document soit complètement chargé"""
+    return wait_until(
+        driver,
+        lambda d: d.execute_script("return document.readyState") == "complete",
+        _timeout('page_load', timeout),
+        name='page_load'
+    )
+
+
+def wait_for_selector(driver, selector, timeout=None):
+    """Attend qu'au moins un élément correspondant au sélecteur CSS soit présent"""
+    return wait_until(
+        driver,
+        lambda d: len(d.find_elements(By.CSS_SELECTOR, selector)) > 0,
+        _timeout('selector', timeout),
+        name='selector'
+    )
+
+
+def wait_for_stable_count(driver, selector, timeout=None, settle=None, no_results=None):
+    """
+    Attend que le nombre d'éléments (cartes d'offres) soit stable pendant `settle` secondes
+
+    Une page sans carte n'est considérée comme vide que si le message « aucun résultat »
+    (sélecteur no_results) apparaît ; sinon l'attente de la première carte va jusqu'à la borne.
+
+    Returns:
+        Nombre d'éléments trouvés à la fin de l'attente
+    """
+    settle = settle if settle is not None else config.WAIT_CONFIG['settle']
+    state = {'count': -1, 'since': time.monotonic()}
+
+    def _is_stable(d):
+        count = len(d.find_elements(By.CSS_SELECTOR, selector))
+        now = time.monotonic()
+        if count != state['count']:
+            state['count'] = count
+            state['since'] = now
+            return False
+        if count == 0:
+            return bool(no_results and d.find_elements(By.CSS_SELECTOR, no_results))
+        return now - state['since'] >= settle
+
+    wait_until(driver, _is_stable, _timeout('cards', timeout), name='cards')
+    return max(state['count'], 0)
+
+
+def wait_for_network_idle(driver, timeout=None, idle=None):
+    """
+    Attend qu'aucune nouvelle ressource réseau ne soit chargée pendant `idle` secondes
+    (basé sur l'API Performance du navigateur)
+    """
+    idle = idle if idle is not None else config.WAIT_CONFIG['settle']
+    state = {'count': -1, 'since': time.monotonic()}
+
+    def _is_idle(d):
+        count = d.execute_script("return performance.getEntriesByType('resource').length")
+        now = time.monotonic()
+        if count != state['count']:
+            state['count'] = count
+            state['since'] = now
+            return False
+        return now - state['since'] >= idle
+
+    return wait_until(driver, _is_idle, _timeout('network_idle', timeout), name='network_idle')
+
+
+def wait_for_url(driver, predicate, timeout=None):
+    """Attend que l'URL courante vérifie le prédicat"""
+    return wait_until(
+        driver,
+        lambda d: predicate(d.current_url),
+        _timeout('url', timeout),
+        name='url'
+    )
+
+
+def get_wait_timings():
+    """Retourne les statistiques des attentes (nombre, total, max, timeouts par type)"""
+    with _timings_lock:
+        return {
+            name: {
+                'count': stats['count'],
+                'total': round(stats['total'], 2),
+                'avg': round(stats['total'] / stats['count'], 2) if stats['count'] else 0,
+                'max': round(stats['max'], 2),
+                'timeouts': stats['timeouts']
+            }
+            for name, stats in _timings.items()
+        }
+
+
+def reset_wait_timings():
+    """Remet à zéro les statistiques des attentes"""
+    with _timings_lock:
+        _timings.clear()
+
+
+def print_wait_summary():
+    """Affiche le temps réellement passé à attendre, par type d'attente"""
+    timings = get_wait_timings()
+    if not timings:
+        return
+    total = sum(stats['total'] for stats in timings.values())
+    print_info(f"Temps d'attente total: {total:.1f}s")
+    for name, stats in sorted(timings.items(), key=lambda x: x[1]['total'], reverse=True):
+        print_info(
+            f"  - {name}: {stats['count']} attente(s), {stats['total']}s "
+            f"(moy. {stats['avg']}s, max {stats['max']}s, {stats['timeouts']} timeout(s))"
+        )